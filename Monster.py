@@ -1,5 +1,13 @@
-from pico2d import load_image
-import time
+import collision_mask
+import combat_system
+import game_framework
+import monster_system
+import pathfinding
+import render_queue
+import resource_manager
+from resource_manager import load_image
+import sprite_metadata
+import functools
 import math
 
 # 디버그 출력 기본값
@@ -10,14 +18,17 @@ DEBUG_MONSTER = False
 # 몬스터 추가할거면, Red_MS 복사해서 수정해서 사용하면 된다.
 # 그리고 play_mode.py에서 import하고 추가해주면 됨.
 
-class Animator:
-    """Animation loader and frame manager.
+class AnimationAsset:
+    """Animation data shared by every monster of the same type.
     Supports per-state images (horizontal) and single-sheet modes:
       - vertical: frames stacked vertically (states in order idle,attack,damaged,death)
       - grid: states are rows (frames_map order), each row has given columns
-    Computes per-frame bboxes using PIL when available.
+    Per-frame bboxes and detected frame heights come from sprite_metadata.json (see sprite_metadata.py).
+    Built once per parameter set by get_animation_asset(); Animator instances only keep state/frame/acc.
     """
     def __init__(self, folder, frames_map, frame_time, layout='horizontal', single_image_path=None, single_frame_height=None):
+        self.single_image_path = single_image_path
+        self.scope = None  # 이미지를 마지막으로 잡아 둔 resource_manager scope
         self.folder = folder
         self.frames_map = dict(frames_map)
         self.frame_time_map = dict(frame_time)
@@ -28,11 +39,17 @@ class Animator:
         self.sheet_state_offsets = {}
         self._sheet_grid_mode = False
         self._grid_info = {}
+        # Animator.draw / get_world_hit_bbox 계산 결과 (프레임 크기는 이미지가 정해지면 바뀌지 않으므로 한 번만 계산)
+        self.draw_rects = {}  # (state, frame, scale) -> (소스 left, bottom, w, h, 그릴 w, h)
+        self.hit_offsets = {}  # (state, frame, scale) -> (프레임 반폭, 반높이, 히트박스 left, bottom, right, top) 또는 None
+        self.frame_masks = {}  # (state, frame, scale) -> collision_mask.Mask 또는 None
 
         if single_image_path:
             try:
                 sheet = load_image(single_image_path)
                 self.sheet_image = sheet
+                self.scope = resource_manager.current_scope
+                size = (sheet.w, sheet.h)
                 if layout == 'grid':
                     # rows = frames_map keys order
                     items = list(self.frames_map.items())
@@ -40,104 +57,26 @@ class Animator:
                     max_cols = max(1, max(int(v) for k, v in items))
                     fw = max(1, int(getattr(sheet, 'w', 1) // max_cols))
                     fh = max(1, int(getattr(sheet, 'h', 1) // num_rows))
-                    # try PIL for bbox extraction
-                    try:
-                        from PIL import Image
-                        pil = Image.open(single_image_path).convert('RGBA')
-                    except Exception:
-                        pil = None
+                    slicing = sprite_metadata.grid(max_cols, num_rows)
+                    meta = sprite_metadata.frames(single_image_path, slicing, size)
+                    collision_mask.load(single_image_path, slicing, size)  # 프레임 충돌 마스크 (get_frame_mask)
                     for row_idx, (state, fcount) in enumerate(items):
                         self.sheet_state_offsets[state] = (row_idx, int(fcount))
-                        bboxes = []
-                        for col in range(int(fcount)):
-                            if pil is not None:
-                                left = col * fw
-                                top = row_idx * fh
-                                frame_img = pil.crop((left, top, left + fw, top + fh))
-                                bbox = frame_img.getbbox()
-                                if bbox is None:
-                                    bboxes.append((0, 0, fw, fh))
-                                else:
-                                    l, u, r, d = bbox
-                                    bl = l
-                                    bb = fh - d
-                                    br = r
-                                    bt = fh - u
-                                    bboxes.append((bl, bb, br, bt))
-                            else:
-                                bboxes.append((0, 0, fw, fh))
-                        self.frame_bboxes[state] = bboxes
+                        if meta is not None:
+                            self.frame_bboxes[state] = [tuple(meta['bboxes'][row_idx * max_cols + col]) for col in range(int(fcount))]
+                        else:
+                            self.frame_bboxes[state] = [(0, 0, fw, fh) for _ in range(int(fcount))]
                     self._sheet_grid_mode = True
                     self._grid_info = {'fw': fw, 'fh': fh, 'rows': num_rows, 'cols': max_cols}
                 else:
-                    # vertical stacked frames: try to detect precise frame height using PIL+numpy
+                    # vertical stacked frames: frame height detected offline (sprite_metadata)
                     fw = getattr(sheet, 'w', 1)
                     H = getattr(sheet, 'h', 1)
                     # default total frames from frames_map sum
                     expected_total = max(1, sum(int(v) for v in self.frames_map.values()))
-                    frame_h = None
-                    pil = None
-                    try:
-                        from PIL import Image
-                        import numpy as np
-                        pil = Image.open(single_image_path).convert('RGBA')
-                        arr = np.array(pil)
-                        alpha = arr[:, :, 3]
-                        rows = np.where(alpha.any(axis=1))[0]
-                        # ensure starts/dists are always defined to avoid debug-time reference issues
-                        starts = []
-                        dists = []
-                        if len(rows) > 0:
-                            # collect start rows of visible blocks
-                            prev = None
-                            for r in rows:
-                                if prev is None or r != prev + 1:
-                                    starts.append(r)
-                                prev = r
-                            if len(starts) > 1:
-                                dists = [starts[i+1] - starts[i] for i in range(len(starts)-1)]
-                                # filter out tiny distances (noise like single-pixel artifacts)
-                                dists_filtered = [int(d) for d in dists if int(d) > 5]
-                                if dists_filtered:
-                                    try:
-                                        from statistics import mode
-                                        frame_h = int(mode(dists_filtered))
-                                    except Exception:
-                                        # fallback to median-like selection
-                                        dists_filtered.sort()
-                                        frame_h = int(dists_filtered[len(dists_filtered)//2])
-                                else:
-                                    # no large gaps found -> fall back to min of raw dists
-                                    frame_h = int(max(1, min(dists)))
-                            else:
-                                # single block: estimate by contiguous segment length
-                                segs = []
-                                prev = rows[0]
-                                seg_start = prev
-                                for r in rows[1:]:
-                                    if r == prev + 1:
-                                        prev = r
-                                    else:
-                                        segs.append(prev - seg_start + 1)
-                                        seg_start = r
-                                        prev = r
-                                segs.append(prev - seg_start + 1)
-                                frame_h = int(segs[0]) if segs else max(1, H // expected_total)
-                        # debug output to help diagnose incorrect frame height detection
-                        if DEBUG_MONSTER:
-                            try:
-                                s = starts if 'starts' in locals() else []
-                                d = dists if 'dists' in locals() else []
-                                print(f"Animator vertical-detect: file={single_image_path} H={H} expected_total={expected_total}")
-                                print(f"  rows_count={len(rows)} starts={s[:10]}{'...' if len(s)>10 else ''}")
-                                if d:
-                                    print(f"  dists sample={d[:10]}{'...' if len(d)>10 else ''} -> frame_h(candidate)={frame_h}")
-                                else:
-                                    print(f"  single-block segs sample, chosen frame_h={frame_h}")
-                            except Exception:
-                                pass
-                    except Exception:
-                        pil = None
+                    frame_h = sprite_metadata.detected_frame_height(single_image_path, expected_total, size)
+                    if DEBUG_MONSTER:
+                        print(f"Animator vertical-detect: file={single_image_path} H={H} expected_total={expected_total} -> frame_h={frame_h}")
                     forced_fh = int(single_frame_height) if single_frame_height is not None else None
                     if forced_fh is not None and forced_fh > 0:
                         frame_h = forced_fh
@@ -151,6 +90,8 @@ class Animator:
                     if total_frames < expected_total:
                         frame_h = max(1, int(H // expected_total))
                         total_frames = expected_total
+                    meta = sprite_metadata.frames(single_image_path, sprite_metadata.rows(frame_h), size)
+                    collision_mask.load(single_image_path, sprite_metadata.rows(frame_h), size)
                     # build bboxes per state using ordered frames_map keys
                     idx = 0
                     for state, fcount in list(self.frames_map.items()):
@@ -158,19 +99,8 @@ class Animator:
                         self.sheet_state_offsets[state] = (idx, fcount)
                         bboxes = []
                         for i in range(fcount):
-                            if pil is not None:
-                                top = (idx + i) * frame_h
-                                frame_img = pil.crop((0, top, fw, top + frame_h))
-                                bbox = frame_img.getbbox()
-                                if bbox is None:
-                                    bboxes.append((0, 0, fw, frame_h))
-                                else:
-                                    l, u, r, d = bbox
-                                    bl = l
-                                    bb = frame_h - d
-                                    br = r
-                                    bt = frame_h - u
-                                    bboxes.append((bl, bb, br, bt))
+                            if meta is not None and idx + i < len(meta['bboxes']):
+                                bboxes.append(tuple(meta['bboxes'][idx + i]))
                             else:
                                 bboxes.append((0, 0, fw, frame_h))
                         self.frame_bboxes[state] = bboxes
@@ -183,10 +113,6 @@ class Animator:
                 for state in self.frames_map:
                     self.images[state] = None
                     self.frame_bboxes[state] = []
-            self.state = 'idle'
-            self.frame = 0
-            self.acc = 0.0
-            self._death_done = False
             return
 
         # folder-based per-state images
@@ -195,63 +121,101 @@ class Animator:
             try:
                 img = load_image(path)
                 self.images[state] = img
-                try:
-                    from PIL import Image
-                    pil = Image.open(path).convert('RGBA')
-                except Exception:
-                    pil = None
+                self.scope = resource_manager.current_scope
                 frames = int(self.frames_map.get(state, 1))
-                bboxes = []
-                if pil is not None:
-                    if layout == 'horizontal':
-                        fw = max(1, int(getattr(img, 'w', 1) // max(1, frames)))
-                        fh = getattr(img, 'h', 1)
-                        for i in range(frames):
-                            left = i * fw
-                            frame_img = pil.crop((left, 0, left + fw, fh))
-                            bbox = frame_img.getbbox()
-                            if bbox is None:
-                                bboxes.append((0, 0, fw, fh))
-                            else:
-                                l, u, r, d = bbox
-                                bl = l
-                                bb = fh - d
-                                br = r
-                                bt = fh - u
-                                bboxes.append((bl, bb, br, bt))
-                    else:
-                        fh = max(1, int(getattr(img, 'h', 1) // max(1, frames)))
-                        fw = getattr(img, 'w', 1)
-                        for i in range(frames):
-                            top = i * fh
-                            frame_img = pil.crop((0, top, fw, top + fh))
-                            bbox = frame_img.getbbox()
-                            if bbox is None:
-                                bboxes.append((0, 0, fw, fh))
-                            else:
-                                l, u, r, d = bbox
-                                bl = l
-                                bb = fh - d
-                                br = r
-                                bt = fh - u
-                                bboxes.append((bl, bb, br, bt))
+                if layout == 'horizontal':
+                    fw = max(1, int(getattr(img, 'w', 1) // max(1, frames)))
+                    fh = getattr(img, 'h', 1)
+                    slicing = sprite_metadata.horizontal(max(1, frames))
                 else:
-                    if layout == 'horizontal':
-                        fw = max(1, int(getattr(img, 'w', 1) // frames))
-                        fh = getattr(img, 'h', 1)
-                    else:
-                        fw = getattr(img, 'w', 1)
-                        fh = max(1, int(getattr(img, 'h', 1) // frames))
-                    bboxes = [(0, 0, fw, fh) for _ in range(frames)]
-                self.frame_bboxes[state] = bboxes
+                    fw = getattr(img, 'w', 1)
+                    fh = max(1, int(getattr(img, 'h', 1) // max(1, frames)))
+                    slicing = sprite_metadata.vertical(max(1, frames))
+                meta = sprite_metadata.frames(path, slicing, (img.w, img.h))
+                collision_mask.load(path, slicing, (img.w, img.h))
+                if meta is not None:
+                    self.frame_bboxes[state] = [tuple(bbox) for bbox in meta['bboxes']]
+                else:
+                    self.frame_bboxes[state] = [(0, 0, fw, fh) for _ in range(frames)]
             except Exception:
                 self.images[state] = None
                 self.frame_bboxes[state] = []
 
+    def acquire(self):
+        """현재 모드(scope)에서 처음 쓰일 때 이미지 참조를 다시 등록 (모드가 바뀌어도 캐시에서 그대로 재사용)"""
+        if self.scope == resource_manager.current_scope:
+            return
+        self.scope = resource_manager.current_scope
+        if self.sheet_image is not None:
+            self.sheet_image = load_image(self.single_image_path)
+        for state, img in self.images.items():
+            if img is not None:
+                self.images[state] = load_image(f"{self.folder}/{state}.png")
+
+
+# (folder, frames_map, frame_time, layout, 시트 경로, 프레임 높이) -> AnimationAsset
+_animation_assets = {}
+
+
+def get_animation_asset(folder, frames_map, frame_time, layout='horizontal', single_image_path=None, single_frame_height=None):
+    """같은 설정의 AnimationAsset은 한 번만 만들어서 공유"""
+    key = (folder, tuple(frames_map.items()), tuple(frame_time.items()), layout, single_image_path, single_frame_height)
+    asset = _animation_assets.get(key)
+    if asset is None:
+        asset = AnimationAsset(folder, frames_map, frame_time, layout, single_image_path, single_frame_height)
+        _animation_assets[key] = asset
+    else:
+        asset.acquire()
+    return asset
+
+
+class Animator:
+    """Per-instance animation state (state/frame/acc) on top of a shared AnimationAsset.
+    Once a Monster owns it (monster_system.bind), state/frame/acc live in that monster's monster_system slot."""
+    batch_slot = None  # monster_system 배열 slot (몬스터에 붙어 있을 때만 설정)
+    frame = monster_system.field('frame', int, 'batch_slot')
+    acc = monster_system.field('acc', float, 'batch_slot')
+    death_done = monster_system.field('death_done', bool, 'batch_slot')
+
+    def __init__(self, folder, frames_map, frame_time, layout='horizontal', single_image_path=None, single_frame_height=None):
+        asset = get_animation_asset(folder, frames_map, frame_time, layout, single_image_path, single_frame_height)
+        self.asset = asset
+        # 공유 데이터는 복사하지 않고 참조만 둠 (읽기 전용)
+        self.frames_map = asset.frames_map
+        self.frame_time_map = asset.frame_time_map
+        self.images = asset.images
+        self.frame_bboxes = asset.frame_bboxes
+        self.layout = asset.layout
+        self.sheet_state_offsets = asset.sheet_state_offsets
+        self._sheet_grid_mode = asset._sheet_grid_mode
+        self._grid_info = asset._grid_info
+        if hasattr(asset, '_sheet_frame_h'):
+            self._sheet_frame_h = asset._sheet_frame_h
+
         self.state = 'idle'
         self.frame = 0
         self.acc = 0.0
-        self._death_done = False
+        self.death_done = False
+
+    @property
+    def sheet_image(self):
+        return self.asset.sheet_image
+
+    @property
+    def state(self):
+        slot = self.batch_slot
+        if slot is None:
+            return self._state
+        return monster_system.state_name(slot)
+
+    @state.setter
+    def state(self, state):
+        slot = self.batch_slot
+        if slot is None:
+            self._state = state
+        else:
+            monster_system.set_state(slot, state, int(self.frames_map.get(state, 1)),
+                                     float(self.frame_time_map.get(state, 0.1)))
 
     def set_state(self, state):
         if state == self.state:
@@ -260,174 +224,147 @@ class Animator:
         self.frame = 0
         self.acc = 0.0
         if state == 'death':
-            self._death_done = False
+            self.death_done = False
 
     def update(self, dt):
-        if self.state == 'death' and self._death_done:
-            return
-        frames = int(self.frames_map.get(self.state, 1))
-        ft = float(self.frame_time_map.get(self.state, 0.1))
-        self.acc += dt
-        while self.acc >= ft:
-            self.acc -= ft
-            self.frame += 1
-            if self.state == 'death':
-                if self.frame >= frames:
-                    self.frame = frames - 1
-                    self._death_done = True
-                    break
-            elif self.state == 'damaged':
-                # damaged 애니메이션이 끝나면 idle로 돌아감
-                if self.frame >= frames:
-                    self.frame = 0
-                    self.state = 'idle'
-                    break
-            elif self.state == 'attack':
-                # attack 애니메이션이 끝나면 idle로 돌아감
-                if self.frame >= frames:
-                    self.frame = 0
-                    self.state = 'idle'
-                    break
-            else:
-                self.frame %= frames
+        # 프레임 진행 규칙은 monster_system에만 있음 (몬스터에 붙은 애니메이터만 진행)
+        if self.batch_slot is not None:
+            monster_system.advance(self.batch_slot, dt)
 
     # 'death' 애니메이션 끝나야지만, 죽음 처리되게
     def is_animation_finished(self):
-        return self.state == 'death' and self._death_done
+        return self.state == 'death' and self.death_done
 
     def draw(self, x, y, scale=1.0):
-        frames = int(self.frames_map.get(self.state, 1))
+        image = self.sheet_image
+        if image is None:
+            image = self.images.get(self.state)
+            if not image:
+                return
+        key = (self.state, self.frame, scale)
+        rect = self.asset.draw_rects.get(key)
+        if rect is None:
+            rect = self.asset.draw_rects[key] = self._draw_rect(image, self.state, int(self.frame), scale)
+        left, bottom, fw, fh, dw, dh = rect
+        render_queue.clip_draw(image, left, bottom, fw, fh, x, y, dw, dh)
+
+    def _draw_rect(self, image, state, frame, scale):
+        """draw용 소스 사각형과 그릴 크기 (AnimationAsset.draw_rects에 캐시)"""
         if self.sheet_image is not None:
-            sheet = self.sheet_image
-            if getattr(self, '_sheet_grid_mode', False):
-                gi = getattr(self, '_grid_info', {})
-                fw = int(gi.get('fw', max(1, getattr(sheet, 'w', 1))))
-                fh = int(gi.get('fh', max(1, getattr(sheet, 'h', 1))))
-                start_row, cnt = self.sheet_state_offsets.get(self.state, (0, 1))
-                col = int(self.frame) % int(cnt)
-                left = col * fw
-                bottom = max(0, getattr(sheet, 'h', 1) - (start_row + 1) * fh)
-                dw = int(fw * scale)
-                dh = int(fh * scale)
-                try:
-                    sheet.clip_draw(left, bottom, fw, fh, x, y, dw, dh)
-                except Exception:
-                    sheet.clip_draw(left, bottom, fw, fh, x, y)
+            if self._sheet_grid_mode:
+                gi = self._grid_info
+                fw = int(gi.get('fw', max(1, getattr(image, 'w', 1))))
+                fh = int(gi.get('fh', max(1, getattr(image, 'h', 1))))
+                start_row, cnt = self.sheet_state_offsets.get(state, (0, 1))
+                left = (frame % int(cnt)) * fw
+                bottom = max(0, getattr(image, 'h', 1) - (start_row + 1) * fh)
             else:
-                fw = getattr(sheet, 'w', 1)
-                start, cnt = self.sheet_state_offsets.get(self.state, (0, 1))
-                idx = start + (int(self.frame) % cnt)
-                # use computed/forced frame height if available
-                fh = int(getattr(self, '_sheet_frame_h', max(1, int(getattr(sheet, 'h', 1) // max(1, sum(int(v) for v in self.frames_map.values()))))))
-                bottom = max(0, getattr(sheet, 'h', 1) - (idx + 1) * fh)
-                dw = int(fw * scale)
-                dh = int(fh * scale)
-                try:
-                    sheet.clip_draw(0, bottom, fw, fh, x, y, dw, dh)
-                except Exception:
-                    sheet.clip_draw(0, bottom, fw, fh, x, y)
-            return
-
-        img = self.images.get(self.state)
-        if not img:
-            return
-        if self.layout == 'horizontal':
-            fw = max(1, int(img.w // frames))
-            fh = img.h
-            idx = int(self.frame) % frames
-            x_offset = idx * fw
-            try:
-                dw = int(fw * scale)
-                dh = int(fh * scale)
-                img.clip_draw(x_offset, 0, fw, fh, x, y, dw, dh)
-            except Exception:
-                img.clip_draw(x_offset, 0, fw, fh, x, y)
+                fw = getattr(image, 'w', 1)
+                start, cnt = self.sheet_state_offsets.get(state, (0, 1))
+                idx = start + (frame % cnt)
+                fh = self._sheet_frame_height()
+                left = 0
+                bottom = max(0, getattr(image, 'h', 1) - (idx + 1) * fh)
         else:
-            fh = max(1, int(img.h // frames))
-            fw = img.w
-            idx = int(self.frame) % frames
-            top = idx * fh
-            try:
-                dw = int(fw * scale)
-                dh = int(fh * scale)
-                img.clip_draw(0, top, fw, fh, x, y, dw, dh)
-            except Exception:
-                img.clip_draw(0, top, fw, fh, x, y)
+            frames = int(self.frames_map.get(state, 1))
+            idx = frame % frames
+            if self.layout == 'horizontal':
+                fw = max(1, int(image.w // frames))
+                fh = image.h
+                left, bottom = idx * fw, 0
+            else:
+                fh = max(1, int(image.h // frames))
+                fw = image.w
+                left, bottom = 0, idx * fh
+        return left, bottom, fw, fh, int(fw * scale), int(fh * scale)
+
+    def _sheet_frame_height(self):
+        # 세로 시트: 계산/지정된 프레임 높이, 없으면 전체 프레임 수로 균등 분할
+        sheet = self.sheet_image
+        return int(getattr(self, '_sheet_frame_h', max(1, int(getattr(sheet, 'h', 1) // max(1, sum(int(v) for v in self.frames_map.values()))))))
+
+    def get_frame_mask(self, state, frame, scale=1.0):
+        """(state, frame)을 draw와 같은 크기로 그렸을 때의 픽셀 충돌 마스크 (collision_mask.Mask, 없으면 None)
+        원본 마스크는 에셋을 로드할 때 collision_mask.load로 읽어 둔 것, 배율을 적용한 결과만 여기서 캐시"""
+        key = (state, frame, scale)
+        cache = self.asset.frame_masks
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        image = self.sheet_image
+        path = self.asset.single_image_path
+        if image is None:
+            image = self.images.get(state)
+            path = f"{self.asset.folder}/{state}.png"
+        mask = None
+        if image:
+            left, bottom, fw, fh, _, _ = self._draw_rect(image, state, int(frame), scale)
+            source = collision_mask.frame_mask(path, left, bottom, fw, fh)
+            if source is not None:
+                mask = source.scaled(scale)
+        cache[key] = mask
+        return mask
 
     def current_frame_index(self):
         return int(self.frame)
 
     def get_world_hit_bbox(self, state, frame_idx, cx, cy, scale=1.0):
         # returns (left,bottom,right,top) in world coords or None
+        # 프레임 기준 오프셋은 (state, frame, scale)마다 한 번만 계산하고 여기서는 중심 좌표만 더함
+        key = (state, frame_idx, scale)
+        cache = self.asset.hit_offsets
+        try:
+            offsets = cache[key]
+        except KeyError:
+            offsets = cache[key] = self._hit_offsets(state, frame_idx, scale)
+        if offsets is None:
+            return None
+        half_w, half_h, left, bottom, right, top = offsets
+        x0 = cx - half_w
+        y0 = cy - half_h
+        return (x0 + left, y0 + bottom, x0 + right, y0 + top)
+
+    def _hit_offsets(self, state, frame_idx, scale):
+        """프레임 중심 기준 히트박스 (반폭, 반높이, left, bottom, right, top), 히트박스가 없으면 None"""
+        bboxes = self.frame_bboxes.get(state, [])
         if self.sheet_image is not None:
             sheet = self.sheet_image
-            if getattr(self, '_sheet_grid_mode', False):
-                gi = getattr(self, '_grid_info', {})
+            if self._sheet_grid_mode:
+                gi = self._grid_info
                 fw = int(gi.get('fw', getattr(sheet, 'w', 1)))
                 fh = int(gi.get('fh', getattr(sheet, 'h', 1)))
-                row, cnt = self.sheet_state_offsets.get(state, (0, 1))
-                if frame_idx < 0 or frame_idx >= cnt:
-                    return None
-                bboxes = self.frame_bboxes.get(state, [])
-                if not bboxes:
-                    minx, miny, maxx, maxy = 0, 0, fw, fh
-                else:
-                    minx, miny, maxx, maxy = bboxes[frame_idx]
-                    if minx == maxx == 0 and miny == maxy == 0:
-                        return None
-                fw_s = fw * scale
-                fh_s = fh * scale
-                world_left = cx - fw_s / 2 + minx * scale
-                world_bottom = cy - fh_s / 2 + miny * scale
-                world_right = cx - fw_s / 2 + maxx * scale
-                world_top = cy - fh_s / 2 + maxy * scale
-                return (world_left, world_bottom, world_right, world_top)
-
-            # vertical stacked fallback: use computed/forced frame height when available
-            fw = getattr(sheet, 'w', 1)
-            fh = int(getattr(self, '_sheet_frame_h', max(1, int(getattr(sheet, 'h', 1) // max(1, sum(int(v) for v in self.frames_map.values()))))))
-            start, cnt = self.sheet_state_offsets.get(state, (0, 1))
+            else:
+                fw = getattr(sheet, 'w', 1)
+                fh = self._sheet_frame_height()
+            _, cnt = self.sheet_state_offsets.get(state, (0, 1))
             if frame_idx < 0 or frame_idx >= cnt:
                 return None
-            bboxes = self.frame_bboxes.get(state, [])
             if not bboxes:
                 minx, miny, maxx, maxy = 0, 0, fw, fh
             else:
                 minx, miny, maxx, maxy = bboxes[frame_idx]
                 if minx == maxx == 0 and miny == maxy == 0:
                     return None
-            fw_s = fw * scale
-            fh_s = fh * scale
-            world_left = cx - fw_s / 2 + minx * scale
-            world_bottom = cy - fh_s / 2 + miny * scale
-            world_right = cx - fw_s / 2 + maxx * scale
-            world_top = cy - fh_s / 2 + maxy * scale
-            return (world_left, world_bottom, world_right, world_top)
-
-        img = self.images.get(state)
-        if img is None:
-            return None
-        frames = int(self.frames_map.get(state, 1))
-        if self.layout == 'horizontal':
-            fw = max(1, int(img.w // frames))
-            fh = img.h
-        else:
-            fh = max(1, int(img.h // frames))
-            fw = img.w
-        bboxes = self.frame_bboxes.get(state, [])
-        if not bboxes or frame_idx < 0 or frame_idx >= len(bboxes):
-            minx, miny, maxx, maxy = 0, 0, fw, fh
         else:
-            minx, miny, maxx, maxy = bboxes[frame_idx]
-            if minx == maxx == 0 and miny == maxy == 0:
+            img = self.images.get(state)
+            if img is None:
                 return None
-        fw_s = fw * scale
-        fh_s = fh * scale
-        world_left = cx - fw_s / 2 + minx * scale
-        world_bottom = cy - fh_s / 2 + miny * scale
-        world_right = cx - fw_s / 2 + maxx * scale
-        world_top = cy - fh_s / 2 + maxy * scale
-        return (world_left, world_bottom, world_right, world_top)
+            frames = int(self.frames_map.get(state, 1))
+            if self.layout == 'horizontal':
+                fw = max(1, int(img.w // frames))
+                fh = img.h
+            else:
+                fh = max(1, int(img.h // frames))
+                fw = img.w
+            if not bboxes or frame_idx < 0 or frame_idx >= len(bboxes):
+                minx, miny, maxx, maxy = 0, 0, fw, fh
+            else:
+                minx, miny, maxx, maxy = bboxes[frame_idx]
+                if minx == maxx == 0 and miny == maxy == 0:
+                    return None
+        return (fw * scale / 2, fh * scale / 2,
+                minx * scale, miny * scale, maxx * scale, maxy * scale)
 
 
 class Combat:
@@ -435,21 +372,12 @@ class Combat:
         self.attack_power = attack_power
         self.attack_range = attack_range
         self.cooldown = cooldown
-        self.last_attack_time = 0.0
+        self.last_attack_time = -math.inf  # monster_system.now 기준 (처음에는 바로 공격 가능)
         self.attack_target = None
         self.attack_frames = attack_frames
         self.hit_frame = hit_frame if hit_frame is not None else max(0, attack_frames // 2)
         self.hit_done = False
 
-    def try_attack(self, target):
-        now = time.time()
-        if now - self.last_attack_time < self.cooldown:
-            return False
-        self.last_attack_time = now
-        self.attack_target = target
-        self.hit_done = False
-        return True
-
     def apply_hit_if_needed(self, prev_frame, new_frame, monster):
         if self.attack_target is None or self.hit_done:
             return False
@@ -457,25 +385,24 @@ class Combat:
         if not (prev_frame <= hf < new_frame + 1):
             return False
         target = self.attack_target
+        if getattr(target, 'x', None) is None or getattr(target, 'y', None) is None:
+            return False
         try:
             bbox = monster.animator.get_world_hit_bbox('attack', hf, monster.x, monster.y, getattr(monster, 'scale', 1.0))
-            if bbox is None:
-                return False
-            lx, by, rx, ty = bbox
-            tx = getattr(target, 'x', None)
-            ty_pos = getattr(target, 'y', None)
-            if tx is None or ty_pos is None:
-                return False
-            if lx <= tx <= rx and by <= ty_pos <= ty:
-                if hasattr(target, 'take_damage'):
-                    target.take_damage(self.attack_power)
-                    if DEBUG_MONSTER:
-                        print(f"Combat applied {self.attack_power} dmg to target via pixel bbox")
-                self.hit_done = True
-                return True
         except Exception:
-            pass
-        return False
+            bbox = None
+        if bbox is None:
+            return False
+        # 판정은 combat_system에서 (대상의 (x, y)가 공격 프레임 히트박스 안이고, 그 픽셀이 공격 프레임의 불투명 픽셀이면 맞음)
+        scale = getattr(monster, 'scale', 1.0)
+        mask = collision_mask.place(monster.animator.get_frame_mask('attack', hf, scale), monster.x, monster.y)
+        combat_system.submit(monster, bbox, self.attack_power, 'player', target=target, on_hit=self._on_hit, mask=mask)
+        return True
+
+    def _on_hit(self, hit):
+        self.hit_done = True
+        if DEBUG_MONSTER:
+            print(f"Combat applied {self.attack_power} dmg to target via pixel bbox")
 
     def clear(self):
         self.attack_target = None
@@ -487,36 +414,61 @@ class SimpleAI:
         self.patrol_origin_x = patrol_origin_x
         self.patrol_width = patrol_width
         self.sight_range = sight_range
-
-    def update(self, monster, dt, player=None):
-        if player is None or not monster.alive:
-            return False
-        dx = player.x - monster.x
-        dy = player.y - monster.y
-        dist2 = dx * dx + dy * dy
-        if dist2 <= (monster.combat.attack_range * monster.combat.attack_range):
-            fired = monster.combat.try_attack(player)
-            if fired:
-                monster.animator.set_state('attack')
-                monster.dir = 1 if dx >= 0 else -1
-                return True
-        elif dist2 <= (self.sight_range * self.sight_range):
-            dist = math.sqrt(dist2) if dist2 > 0 else 1.0
-            vx = (dx / dist) * monster.speed
-            vy = (dy / dist) * monster.speed
-            monster.x += vx * dt
-            monster.y += vy * dt
-            monster.dir = 1 if vx >= 0 else -1
-            monster.animator.set_state('idle')
-            return True
-        return False
+        # 길찾기 웨이포인트 (pathfinding): 목표 칸이 바뀌면 다시 받음
+        self.path = None
+        self.path_goal = None
+        self.path_wait = 0  # 경로 계산을 기다리는 동안 다시 묻지 않을 남은 호출 수
+
+    def chase_target(self, monster, player, goal=None):
+        """추적할 때 향할 좌표: 길찾기 경로의 다음 웨이포인트, 경로가 없거나 아직 계산 전이면 플레이어 위치
+        goal: 플레이어가 있는 칸 (여러 몬스터를 한꺼번에 처리할 때 한 번만 계산해서 넘김)"""
+        nav = pathfinding.nav
+        if nav is None:
+            return player.x, player.y
+        if goal is None:
+            goal = nav.cell_of(player.x, player.y)
+        if self.path is None or self.path_goal != goal:
+            self.path = None
+            if self.path_wait > 0:
+                self.path_wait -= 1
+                return player.x, player.y
+            start = nav.cell_of(monster.x, monster.y)
+            if start == goal:
+                return player.x, player.y
+            path = pathfinding.get_path(start, goal)
+            if path is None:
+                # 계산 대기 중: 일단 직선으로, 몇 프레임 뒤에 다시 물어봄
+                self.path_wait = pathfinding.RETRY_FRAMES
+                return player.x, player.y
+            self.path = list(path)
+            self.path_goal = goal
+        # 도착한 웨이포인트는 버림 (반 칸 안)
+        reach2 = nav.cell_size * nav.cell_size * 0.25
+        path = self.path
+        while path and (path[0][0] - monster.x) ** 2 + (path[0][1] - monster.y) ** 2 <= reach2:
+            path.pop(0)
+        if not path:
+            return player.x, player.y  # 목표 칸에 도착 (또는 경로 없음): 플레이어에게 직접
+        return path[0]
 
 
 class Monster:
+    world_kind = 'monster'  # game_world 종류 인덱스 (game_world.objects_of('monster'))
+    queued_draw = True  # draw()가 render_queue로 그리기 명령을 기록함 (game_world.render 참고)
+    # 위치/방향/속도/생존 여부는 monster_system 배열의 자기 slot에 있음 (일괄 업데이트가 그대로 읽고 씀)
+    x = monster_system.field('x')
+    y = monster_system.field('y')
+    prev_x = monster_system.field('prev_x')  # 직전 고정 간격 update의 위치 (draw 보간용)
+    prev_y = monster_system.field('prev_y')
+    dir = monster_system.field('dir', int)
+    speed = monster_system.field('speed')
+    alive = monster_system.field('alive', bool)
+
     def __init__(self, name='monster', x=100, y=100, hp=10, speed=0):
+        self.slot = monster_system.allocate(self)
         self.name = name
-        self.x = x
-        self.y = y
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.hp = hp
         self.max_hp = hp
         self.speed = speed
@@ -526,55 +478,60 @@ class Monster:
         self.animator = Animator('', {'idle': 1}, {'idle': 0.1})
         self.combat = Combat()
         self.ai = SimpleAI()
-        self.state = self.animator.state
 
         # 공격 범위 표시 플래그
         self.show_attack_range = True
 
-    def update(self, dt=0.01, frozen=False, player=None):
-        # death 애니메이션 중일 때는 계속 업데이트
-        if frozen and self.alive:
-            return
+    @property
+    def animator(self):
+        return self._animator
+
+    @animator.setter
+    def animator(self, animator):
+        # 애니메이션 상태도 이 몬스터의 slot으로 옮김 (이전 애니메이터는 자기 값으로 돌려놓음)
+        previous = self.__dict__.get('_animator')
+        if previous is not None:
+            monster_system.unbind(previous)
+        self._animator = animator
+        monster_system.bind(self.slot, animator)
+
+    @property
+    def state(self):
+        return self._animator.state
+
+    @functools.cached_property
+    def depth_offset(self):
+        # 그리기 순서(game_world.sort_depth)용 y -> 발 위치: idle 첫 프레임 히트박스의 아래쪽
+        # 하위 클래스가 animator를 정한 뒤 처음 쓸 때 한 번만 계산 (이후에는 일반 속성)
+        bb = self.animator.get_world_hit_bbox('idle', 0, 0.0, 0.0, getattr(self, 'scale', 1.0))
+        return bb[1] if bb is not None else 0.0
 
-        # alive 상태일 때만 AI 업데이트
-        if self.alive:
-            chased = False
-            # 공격 중이 아닐 때만 AI로 이동
-            if self.animator.state != 'attack':
-                try:
-                    chased = self.ai.update(self, dt, player)
-                except Exception:
-                    chased = False
-                if not chased and getattr(self.ai, 'patrol_width', 0) > 0 and self.speed != 0:
-                    self.x += self.speed * self.dir * dt
-                    left = self.ai.patrol_origin_x - self.ai.patrol_width / 2
-                    right = self.ai.patrol_origin_x + self.ai.patrol_width / 2
-                    if self.x < left:
-                        self.x = left
-                        self.dir = 1
-                    elif self.x > right:
-                        self.x = right
-                        self.dir = -1
-
-        # 항상 애니메이터 업데이트 (death 애니메이션도 진행되어야 함)
-        self.animator.update(dt)
-        self.state = self.animator.state
-        frames = int(self.animator.frames_map.get(self.animator.state, 1))
-        prev = int(self.animator.frame - 1)
-        if prev < 0:
-            prev = 0
-        new = int(self.animator.frame)
-        if self.animator.state == 'attack':
-            self.combat.apply_hit_if_needed(prev, new, self)
+    def update(self, dt=0.01, frozen=False, player=None):
+        # 이동/공격/애니메이션 규칙은 monster_system에만 있음 (이 몬스터 하나만 진행)
+        monster_system.step([self.slot], dt, player, frozen)
 
+    def post_update(self):
+        # 하위 클래스용: 매 update 끝에 호출 (monster_system으로 일괄 처리할 때도 호출됨)
+        pass
 
     def draw(self):
         # death 애니메이션이 완전히 끝난 후에만 화면에서 제거
-        if not self.alive and self.animator._death_done:
+        if not self.alive and self.animator.death_done:
             return
 
-        # alive이거나, death 애니메이션 진행 중이면 계속 그리기
-        self.animator.draw(self.x, self.y, getattr(self, 'scale', 1.0))
+        # alive이거나, death 애니메이션 진행 중이면 계속 그리기 (고정 간격 update 사이는 보간한 위치)
+        self.animator.draw(game_framework.lerp(self.prev_x, self.x), game_framework.lerp(self.prev_y, self.y),
+                           getattr(self, 'scale', 1.0))
+
+    def get_hurt_bb(self):
+        # 플레이어 공격을 맞는 범위 (combat_system)
+        size = getattr(self, 'scale', 1.0) * 25  # 반지름
+        return self.x - size, self.y - size, self.x + size, self.y + size
+
+    def get_hurt_mask(self):
+        # 피격 범위 안에서 실제로 맞는 픽셀: 지금 그려지는 프레임의 마스크 (combat_system)
+        scale = getattr(self, 'scale', 1.0)
+        return collision_mask.place(self.animator.get_frame_mask(self.animator.state, self.animator.frame, scale), self.x, self.y)
 
     def take_damage(self, dmg):
         if not self.alive:
@@ -622,7 +579,6 @@ class Green_MS(Monster):
         self.animator = Animator('MS/green_ms', frames_map, frame_time)
         self.combat = Combat(attack_power=15, attack_range=120, cooldown=1.0, attack_frames=frames_map['attack'], hit_frame=frames_map['attack']//2)
         self.ai = SimpleAI(patrol_origin_x=x, patrol_width=120, sight_range=400)
-        self.state = self.animator.state
 
 
 class Trash_Monster(Monster):
@@ -644,7 +600,6 @@ class Trash_Monster(Monster):
         self.ai = SimpleAI(patrol_origin_x=x, patrol_width=0, sight_range=300)
         # start sleeping until player detected
         self.animator.set_state('sleep')
-        self.state = self.animator.state
 
     def take_damage(self, dmg):
         if not self.alive:
@@ -659,8 +614,8 @@ class Trash_Monster(Monster):
             # start damaged sequence: damaged1 -> damaged2 -> idle
             self.animator.set_state('damaged1')
 
-    def update(self, dt=0.01, frozen=False, player=None):
-        super().update(dt, frozen=frozen, player=player)
+    def post_update(self):
+        # 피격 연쇄 전환: damaged1 -> damaged2 -> idle
         try:
             cur = self.animator.state
             if cur == 'damaged1':
@@ -687,6 +642,5 @@ class Red_MS(Monster):
         self.combat = Combat(attack_power=15, attack_range=90, cooldown=1.0, attack_frames=frames_map['attack'], hit_frame=frames_map['attack']//2)
         # give it a patrol so it moves a bit
         self.ai = SimpleAI(patrol_origin_x=x, patrol_width=150, sight_range=450)
-        self.state = self.animator.state
 
 # EOF
\ No newline at end of file
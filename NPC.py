@@ -1,6 +1,12 @@
-from pico2d import load_image, draw_rectangle
+import functools
+import render_queue
+from render_queue import draw_rectangle
+from resource_manager import load_image
 
 class NPC:
+    world_kind = 'npc'  # game_world 종류 인덱스 (game_world.objects_of('npc'))
+    queued_draw = True  # draw()가 render_queue로 그리기 명령을 기록함 (game_world.render 참고)
+
     def __init__(self, x, y, npc_type='default', name='NPC'):
         self.x = x
         self.y = y
@@ -64,10 +70,15 @@ class NPC:
     def handle_event(self, event):
         pass
 
+    @functools.cached_property
+    def depth_offset(self):
+        # 그리기 순서(game_world.sort_depth)용 y -> 발 위치 (처음 그릴 때 한 번 계산)
+        return -self.height * self.draw_scale / 2
+
     def draw(self):
         if self.image and not self.composite:
             # NPC 이미지 그리기 (프레임 애니메이션)
-            self.image.clip_draw(
+            render_queue.clip_draw(self.image,
                 self.frame * self.width, 0,  # 소스 x, y
                 self.width, self.height,      # 소스 width, height
                 self.x, self.y,               # 목표 x, y
@@ -75,7 +86,7 @@ class NPC:
             )
         elif self.image and self.composite:
             # composite이 True면 좌우 반전으로 그리기
-            self.image.clip_composite_draw(
+            render_queue.clip_composite_draw(self.image,
                 self.frame * self.width, 0,  # 소스 x, y
                 self.width, self.height,      # 소스 width, height
                 0, 'h',                       # 회전 각도, 'h'는 수평 반전
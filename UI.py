@@ -1,5 +1,6 @@
 # UI.py
-from pico2d import load_font, load_image, draw_rectangle
+from pico2d import draw_rectangle
+from resource_manager import load_font, load_image
 import main_chracter
 
 
@@ -0,0 +1,144 @@
+# atlas.py
+# 텍스처 아틀라스 런타임 로더
+# atlas_packer.py가 만든 atlas/atlas.json이 있으면, resource_manager.load_image가 아틀라스에 들어 있는 PNG를
+# 큰 아틀라스 텍스처의 일부 영역(AtlasImage)으로 돌려준다. 사용법은 pico2d Image와 같다.
+# 아틀라스가 없거나 원본 PNG가 아틀라스를 만든 뒤에 바뀌었으면 원래대로 개별 PNG를 로드한다.
+import json
+import os
+
+MANIFEST_PATH = 'atlas/atlas.json'
+VERSION = 1
+
+enabled = True  # False면 아틀라스가 있어도 개별 PNG 사용
+
+_manifest = None
+_lookups = {}  # path -> lookup() 결과 (원본 파일 stat은 경로당 한 번만)
+_warned = False
+
+
+def _load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, encoding='utf-8') as f:
+                _manifest = json.load(f)
+            if _manifest.get('version') != VERSION:
+                _manifest = {}
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def reload():
+    """아틀라스를 다시 만든 뒤 매니페스트를 다시 읽음"""
+    global _manifest, _warned
+    _manifest = None
+    _lookups.clear()
+    _warned = False
+
+
+def lookup(path):
+    """path가 아틀라스에 있으면 (페이지 경로, left, bottom, w, h), 없으면 None
+    left/bottom은 페이지 안에서 Pico2D 기준(아래쪽 원점) 좌표"""
+    if not enabled:
+        return None
+    if path not in _lookups:
+        _lookups[path] = _lookup(path)
+    return _lookups[path]
+
+
+def _lookup(path):
+    global _warned
+    manifest = _load_manifest()
+    sprite = manifest.get('sprites', {}).get(path.replace('\\', '/'))
+    if sprite is None:
+        return None
+
+    # 원본이 아틀라스를 만든 뒤에 바뀌었으면 원본을 그대로 사용
+    try:
+        stat = os.stat(path)
+        stale = stat.st_size != sprite['bytes'] or stat.st_mtime_ns != sprite['mtime_ns']
+    except OSError:
+        stale = False  # 원본 없이 아틀라스만 배포한 경우
+    if stale:
+        if not _warned:
+            _warned = True
+            print(f"atlas: {path}가 아틀라스보다 새로움 -> 'python atlas_packer.py'로 다시 만드세요. (개별 PNG 사용)")
+        return None
+
+    page = manifest['pages'][sprite['page']]
+    bottom = page['h'] - sprite['y'] - sprite['h']
+    return page['path'], sprite['x'], bottom, sprite['w'], sprite['h']
+
+
+class AtlasImage:
+    """아틀라스 페이지의 일부 영역을 pico2d Image처럼 쓰기 위한 래퍼"""
+
+    def __init__(self, page, left, bottom, w, h):
+        self.page = page
+        self.left = left
+        self.bottom = bottom
+        self.w = w
+        self.h = h
+
+    def _clip(self, left, bottom, width, height):
+        """이 이미지 범위로 잘라낸 페이지 좌표의 소스 사각형 (SDL이 텍스처 밖 소스 영역을 잘라내는 것과 같게)"""
+        right = min(left + width, self.w)
+        top = min(bottom + height, self.h)
+        left = max(left, 0)
+        bottom = max(bottom, 0)
+        if right <= left or top <= bottom:
+            return None
+        return self.left + left, self.bottom + bottom, right - left, top - bottom
+
+    def draw(self, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = self.w, self.h
+        self.page.clip_draw(self.left, self.bottom, self.w, self.h, x, y, w, h)
+
+    def clip_draw(self, left, bottom, width, height, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = width, height
+        src = self._clip(left, bottom, width, height)
+        if src is not None:
+            self.page.clip_draw(*src, x, y, w, h)
+
+    def composite_draw(self, rad, flip, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = self.w, self.h
+        self.page.clip_composite_draw(self.left, self.bottom, self.w, self.h, rad, flip, x, y, w, h)
+
+    def clip_composite_draw(self, left, bottom, width, height, rad, flip, x, y, w=None, h=None):
+        # pico2d와 같이 w, h를 생략하면 이미지 전체 크기로 그림
+        if w is None and h is None:
+            w, h = self.w, self.h
+        src = self._clip(left, bottom, width, height)
+        if src is not None:
+            self.page.clip_composite_draw(*src, rad, flip, x, y, w, h)
+
+    def draw_to_origin(self, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = self.w, self.h
+        self.page.clip_draw_to_origin(self.left, self.bottom, self.w, self.h, x, y, w, h)
+
+    def clip_draw_to_origin(self, left, bottom, width, height, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = width, height
+        src = self._clip(left, bottom, width, height)
+        if src is not None:
+            self.page.clip_draw_to_origin(*src, x, y, w, h)
+
+    def rotate_draw(self, rad, x, y, w=None, h=None):
+        if w is None and h is None:
+            w, h = self.w, self.h
+        self.page.clip_composite_draw(self.left, self.bottom, self.w, self.h, rad, '', x, y, w, h)
+
+    def clip_image(self, left, bottom, width, height):
+        src = self._clip(left, bottom, width, height)
+        if src is None:
+            return None
+        return AtlasImage(self.page, *src)
+
+    def opacify(self, o):
+        # 텍스처 단위 설정이라 같은 페이지의 다른 스프라이트에도 적용됨
+        self.page.opacify(o)
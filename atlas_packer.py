@@ -0,0 +1,136 @@
+# atlas_packer.py
+# 캐릭터/몬스터/전리품/UI 스프라이트를 몇 장의 큰 아틀라스 텍스처로 합치는 빌드 도구 (PIL 필요)
+#   python atlas_packer.py             -> atlas/<그룹>_<번호>.png 와 atlas/atlas.json 생성
+#   python atlas_packer.py --clean     -> 생성된 아틀라스 삭제 (개별 PNG로 돌아감)
+# 생성된 파일은 커밋하지 않는다 (.gitignore). 실행 중에는 atlas.py가 atlas.json을 읽어서 사용한다.
+# 같은 장면에서 함께 쓰는 스프라이트끼리 같은 그룹으로 묶어서, 그룹마다 별도의 페이지를 만든다.
+import json
+import os
+import shutil
+import sys
+
+import atlas
+
+OUTPUT_DIR = os.path.dirname(atlas.MANIFEST_PATH)
+MAX_SIZE = 4096  # 페이지 한 장의 최대 폭/높이 (GPU 텍스처 크기 제한)
+PADDING = 2  # 스프라이트 사이 투명 여백 (스케일링 시 옆 스프라이트가 번지지 않도록)
+
+# 그룹 이름 -> 포함할 디렉터리/파일
+GROUPS = {
+    'character': ['or_character'],
+    'monster': ['MS'],
+    'hud': ['LOOT', 'UI/hp_image', 'UI/have_money.png', 'UI/back_base.png',
+            'UI/or_character_head.png', 'UI/tr_character_head.png'],
+}
+
+
+def collect(sources):
+    """sources 안의 PNG 경로 목록 (정렬, '/' 구분자)"""
+    paths = []
+    for source in sources:
+        if os.path.isfile(source):
+            paths.append(source)
+            continue
+        for root, _, files in os.walk(source):
+            paths.extend(os.path.join(root, name) for name in files if name.lower().endswith('.png'))
+    return sorted(path.replace(os.sep, '/') for path in paths)
+
+
+def pack(sizes, max_size=MAX_SIZE, padding=PADDING):
+    """shelf 방식 배치: 높이가 큰 것부터 한 줄(shelf)에 채우고, 줄이 넘치면 아래 줄, 페이지가 넘치면 다음 페이지
+    sizes: {key: (w, h)} -> ({key: (page, x, y)}, [(page_w, page_h), ...]) (x, y는 위쪽 원점)"""
+    order = sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k))
+    total_area = sum((w + padding) * (h + padding) for w, h in sizes.values())
+    widest = max((w + padding for w, h in sizes.values()), default=1)
+    # 정사각형에 가까운 2의 거듭제곱 폭 (가장 넓은 스프라이트보다는 넓게)
+    page_w = 1
+    while page_w < min(max_size, max(widest, int(total_area ** 0.5))):
+        page_w *= 2
+    page_w = min(page_w, max_size)
+
+    placements = {}
+    pages = []
+    page, x, y, shelf_h = 0, 0, 0, 0
+    used_w = 0
+    for key in order:
+        w, h = sizes[key]
+        if x + w > page_w:  # 다음 줄
+            x, y = 0, y + shelf_h + padding
+            shelf_h = 0
+        if y + h > max_size:  # 다음 페이지
+            pages.append((used_w, y))
+            page, x, y, shelf_h, used_w = page + 1, 0, 0, 0, 0
+        placements[key] = (page, x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - padding)
+    pages.append((used_w, y + shelf_h))
+    return placements, pages
+
+
+def build(max_size=MAX_SIZE, padding=PADDING):
+    from PIL import Image
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest = {'version': atlas.VERSION, 'pages': [], 'sprites': {}}
+    for group, sources in GROUPS.items():
+        images = {}
+        for path in collect(sources):
+            image = Image.open(path).convert('RGBA')
+            if image.width + padding > max_size or image.height > max_size:
+                print(f"  건너뜀 (페이지보다 큼): {path} {image.size}")
+                continue
+            images[path] = image
+        if not images:
+            continue
+
+        placements, pages = pack({path: image.size for path, image in images.items()}, max_size, padding)
+        first_page = len(manifest['pages'])
+        for index, (page_w, page_h) in enumerate(pages):
+            page_path = f"{OUTPUT_DIR}/{group}_{index}.png"
+            sheet = Image.new('RGBA', (max(1, page_w), max(1, page_h)), (0, 0, 0, 0))
+            for path, (page, x, y) in placements.items():
+                if page == index:
+                    sheet.paste(images[path], (x, y))
+            sheet.save(page_path)
+            manifest['pages'].append({'path': page_path, 'w': sheet.width, 'h': sheet.height})
+            print(f"  {page_path}: {sheet.width}x{sheet.height}, "
+                  f"스프라이트 {sum(1 for p, _, _ in placements.values() if p == index)}개")
+
+        for path, (page, x, y) in placements.items():
+            stat = os.stat(path)
+            manifest['sprites'][path] = {
+                'page': first_page + page, 'x': x, 'y': y, 'w': images[path].width, 'h': images[path].height,
+                'bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            }
+
+    with open(atlas.MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    atlas.reload()
+    print(f"저장: {atlas.MANIFEST_PATH} (페이지 {len(manifest['pages'])}장, 스프라이트 {len(manifest['sprites'])}개)")
+    return manifest
+
+
+def clean():
+    if os.path.isdir(OUTPUT_DIR):
+        shutil.rmtree(OUTPUT_DIR)
+        print(f"삭제: {OUTPUT_DIR}/")
+    atlas.reload()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='스프라이트 아틀라스 생성')
+    parser.add_argument('--clean', action='store_true', help='생성된 아틀라스 삭제')
+    parser.add_argument('--max-size', type=int, default=MAX_SIZE)
+    parser.add_argument('--padding', type=int, default=PADDING)
+    args = parser.parse_args(argv)
+    if args.clean:
+        clean()
+    else:
+        build(args.max_size, args.padding)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import os
-from pico2d import load_image
+from resource_manager import load_image
 import main_chracter
 
 class Background:
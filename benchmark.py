@@ -0,0 +1,288 @@
+# benchmark.py
+# 게임 루프 핫패스 벤치마크 (headless 백엔드에서 실행, 창/GPU 불필요)
+#   python benchmark.py                     -> 측정 후 benchmark_results.json 저장, 기준값이 있으면 비교
+#   python benchmark.py --save-baseline     -> 이번 결과를 기준값(benchmark_baseline.json)으로 저장
+#   python benchmark.py --only dungeon      -> 이름에 'dungeon'이 들어간 항목만 측정
+# 기준값보다 tolerance 이상 느려진 항목이 있으면 종료 코드 1
+import headless
+headless.install()  # 게임 모듈이 pico2d를 import 하기 전에 교체해야 함
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import types
+
+SEED = 2024
+RESULTS_PATH = 'benchmark_results.json'
+BASELINE_PATH = 'benchmark_baseline.json'
+TOLERANCE = 0.15  # 기준값 대비 15% 넘게 느려지면 회귀로 판단
+MONSTER_TYPES = ('Green_MS', 'Red_MS', 'Trash_Monster')
+DUNGEON_MONSTER_COUNTS = (10, 50, 200)
+DT = 1.0 / 60
+SAMPLE_SECONDS = 0.05  # 측정 한 번의 최소 길이 (너무 짧으면 타이머/스케줄러 잡음이 커짐)
+
+repeat = 7  # 항목마다 반복 측정 횟수 (중앙값 표시, 기준값 비교는 최솟값)
+
+
+def _quiet():
+    """게임 코드의 print 출력이 측정 시간에 섞이지 않도록 버림"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _measure(fn, number):
+    """fn 호출 1회당 시간(ms) 통계 반환 (측정 한 번이 SAMPLE_SECONDS 이상이 되도록 호출 횟수를 늘려서 repeat번 측정)"""
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()  # 캐시 등이 안정되도록 먼저 한 번 돌리면서 호출 1회 시간을 어림
+    once = (time.perf_counter() - start) / number
+    if once > 0:
+        number = max(number, int(SAMPLE_SECONDS / once))
+
+    samples = []
+    draws = headless.draw_calls
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+    draw_calls = (headless.draw_calls - draws) / (repeat * number)
+    return {
+        'ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'calls': repeat * number,
+        'draw_calls': round(draw_calls, 1),
+    }
+
+
+def calibrate():
+    """기계 속도 기준값: 게임 코드와 비슷한 순수 파이썬 작업(속성/딕셔너리/실수 연산)의 시간 (ms)
+    다른 날/다른 기계에서 잰 기준값과 비교할 때 전체 속도 차이를 나눠서 없앰"""
+    class Probe:
+        def __init__(self, i):
+            self.x = float(i)
+            self.y = float(i) * 0.5
+    probes = [Probe(i) for i in range(200)]
+    table = {i: i * 2 for i in range(200)}
+
+    def work():
+        total = 0.0
+        for p in probes:
+            p.x += 0.1
+            total += (p.x * p.x + p.y * p.y) ** 0.5 + table[int(p.y) % 200]
+        return total
+
+    return _measure(work, 50)['min_ms']
+
+
+def bench_tiled_map():
+    from tiled_map import TiledMap
+    results = {}
+    for name in ('dungeon1', 'shop'):
+        tiled_map = TiledMap(f'map/{name}.json', use_camera=False)
+        results[f'tiled_map.draw[{name}]'] = _measure(tiled_map.draw, 20)
+
+    # 카메라 렌더링: 맵 전체를 고르게 훑는 카메라 위치를 순서대로 사용
+    tiled_map = TiledMap('map/dungeon1.json', use_camera=True)
+    rng = random.Random(SEED)
+    positions = [(rng.uniform(0, tiled_map.map_width_px), rng.uniform(0, tiled_map.map_height_px)) for _ in range(64)]
+    cursor = iter(positions * 1000)
+    results['tiled_map.draw_with_camera[dungeon1]'] = _measure(lambda: tiled_map.draw_with_camera(*next(cursor)), 50)
+    return results
+
+
+def bench_collision():
+    import dungeon_mode
+    from tiled_map import TiledMap
+    tiled_map = TiledMap('map/dungeon1.json', use_camera=False)
+    boxes = tiled_map.get_collision_boxes()
+    dungeon_mode.collision_grid = tiled_map.build_collision_grid(boxes)
+
+    rng = random.Random(SEED)
+    points = [(rng.uniform(0, tiled_map.screen_w), rng.uniform(0, tiled_map.screen_h)) for _ in range(1000)]
+    player = types.SimpleNamespace(is_transformed=False)
+    check = dungeon_mode.check_collision
+
+    def run_points():
+        for x, y in points:
+            check(x, y, player)
+
+    result = _measure(run_points, 10)
+    result['ms'] /= len(points)
+    result['min_ms'] /= len(points)
+    result['calls'] *= len(points)
+    result['ops_per_sec'] = round(1000 / result['ms']) if result['ms'] > 0 else 0
+    dungeon_mode.collision_grid = None
+    return {'check_collision[dungeon1]': result}
+
+
+def bench_animator():
+    import Monster
+    results = {}
+    for type_name in MONSTER_TYPES:
+        monster = getattr(Monster, type_name)(640, 360)
+        animator = monster.animator
+        results[f'animator.update[{type_name}]'] = _measure(lambda: animator.update(DT), 2000)
+        results[f'animator.draw[{type_name}]'] = _measure(lambda: animator.draw(monster.x, monster.y, monster.scale), 2000)
+    return results
+
+
+def _enter(mode):
+    """game_framework 스택을 mode 하나로 만들고 init (run() 없이 모드를 직접 구동할 때 사용)"""
+    import game_framework
+    import resource_manager
+    game_framework.stack = [mode]
+    resource_manager.set_scope(mode.__name__)
+    mode.init()
+
+
+def _leave(mode):
+    import game_framework
+    import resource_manager
+    mode.finish()
+    resource_manager.release_scope(mode.__name__)
+    game_framework.stack = []
+
+
+def bench_dungeon():
+    import dungeon_mode
+    from stress_scenario import populate_dungeon
+    results = {}
+    for count in DUNGEON_MONSTER_COUNTS:
+        random.seed(SEED)
+        _enter(dungeon_mode)
+        populate_dungeon(count)
+        # 처치 후 다음 맵으로 넘어가지 않도록 몬스터가 남아 있는 상태에서만 측정
+        results[f'dungeon_mode.update[{count}]'] = _measure(lambda: dungeon_mode.update(DT), 20)
+        results[f'dungeon_mode.draw[{count}]'] = _measure(dungeon_mode.draw, 10)
+        _leave(dungeon_mode)
+    return results
+
+
+def bench_mode_switch():
+    import game_framework
+    import dungeon_mode
+    import shop_mode
+    _enter(shop_mode)
+    timings = {'shop->dungeon': [], 'dungeon->shop': []}
+    for _ in range(repeat * 2):
+        for name, mode in (('shop->dungeon', dungeon_mode), ('dungeon->shop', shop_mode)):
+            start = time.perf_counter()
+            game_framework.change_mode(mode)
+            timings[name].append((time.perf_counter() - start) * 1000)
+    _leave(game_framework.stack[-1])
+
+    results = {}
+    for name, samples in timings.items():
+        # 첫 전환은 리소스 로드가 포함되므로 따로 기록
+        results[f'mode_switch[{name}]'] = {
+            'ms': statistics.median(samples[1:]),
+            'min_ms': min(samples[1:]),
+            'first_ms': samples[0],
+            'calls': len(samples),
+        }
+    return results
+
+
+BENCHMARKS = [
+    ('tiled_map', bench_tiled_map),
+    ('check_collision', bench_collision),
+    ('animator', bench_animator),
+    ('dungeon_mode', bench_dungeon),
+    ('mode_switch', bench_mode_switch),
+]
+
+
+def run_all(only=None):
+    import main_chracter
+    headless.open_canvas(main_chracter.SCREEN_W, main_chracter.SCREEN_H)
+    headless.reset()
+
+    results = {}
+    for group, bench in BENCHMARKS:
+        if only and not any(o in group for o in only):
+            continue
+        random.seed(SEED)
+        with _quiet():
+            group_results = bench()
+        for name, result in group_results.items():
+            results[name] = result
+            print(f"  {name:<45} {result['ms']:10.4f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE, speed_ratio=1.0):
+    """기준값과 비교해서 회귀 항목 이름 리스트 반환 (speed_ratio: 지금 기계 보정값 / 기준값 기계 보정값)"""
+    regressions = []
+    print(f"\n기준값 비교 (허용 {tolerance * 100:.0f}%, 기계 속도 보정 x{speed_ratio:.2f})")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or base['min_ms'] <= 0:
+            print(f"  {name:<45} (기준값 없음)")
+            continue
+        # 잡음(다른 프로세스, CPU 클럭 변화)은 시간을 늘리기만 하므로 최솟값끼리 비교
+        change = result['min_ms'] / speed_ratio / base['min_ms'] - 1.0
+        mark = ''
+        if change > tolerance:
+            mark = '  <-- 회귀'
+            regressions.append(name)
+        print(f"  {name:<45} {base['min_ms']:10.4f} -> {result['min_ms']:10.4f} ms ({change * 100:+.1f}%){mark}")
+    return regressions
+
+
+def main(argv=None):
+    global repeat
+    parser = argparse.ArgumentParser(description='게임 루프 핫패스 벤치마크 (headless)')
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--repeat', type=int, default=repeat)
+    parser.add_argument('--only', nargs='*', help='측정할 그룹 이름 일부 (tiled_map, check_collision, animator, dungeon_mode, mode_switch)')
+    args = parser.parse_args(argv)
+    repeat = max(1, args.repeat)
+
+    print("벤치마크 실행 중...")
+    calibration_ms = calibrate()
+    print(f"  {'calibration':<45} {calibration_ms:10.4f} ms")
+    results = run_all(args.only)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'seed': SEED,
+            'repeat': repeat,
+            'calibration_ms': calibration_ms,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        base_calibration = baseline['meta'].get('calibration_ms') or calibration_ms
+        regressions = compare(results, baseline['results'], args.tolerance, calibration_ms / base_calibration)
+        if regressions:
+            print(f"회귀 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
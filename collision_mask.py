@@ -0,0 +1,144 @@
+# collision_mask.py
+# 스프라이트 알파로 만든 픽셀 단위 충돌 마스크
+# 프레임 하나를 가로 한 줄당 정수 하나로 비트 패킹해 두고 (왼쪽 픽셀 = 가장 높은 비트, 줄은 아래쪽부터),
+# 두 마스크가 겹치는지는 겹치는 줄마다 시프트 + AND 한 번으로 판정한다. (파이썬 정수 AND는 워드 단위로 처리됨)
+# combat_system이 AABB 판정을 통과한 후보만 마스크로 다시 확인한다. 마스크가 없는 쪽(플레이어 피격 지점 등)은 박스 전체가 채워진 것으로 본다.
+# 비트마스크는 sprite_metadata.py가 빌드 단계에서 bbox와 함께 sprite_metadata.json에 저장해 두고,
+# 시트를 로드할 때(AnimationAsset, PlayerLoader) load()가 한 번 읽어서 Mask로 만들어 둔다. 전투 중에는 이미지를 열지 않는다.
+# 읽어 둔 마스크가 없는 프레임은 None이 되어 AABB 판정만 쓴다.
+#   collision_mask.load(path, sprite_metadata.horizontal(8), (image.w, image.h))   # 시트를 로드할 때
+#   mask = collision_mask.frame_mask(path, left, bottom, w, h)                     # clip_draw 인자와 같은 사각형
+#   placed = (mask, left, bottom)   # 월드 좌표에 놓인 마스크 (정수 픽셀)
+#   collision_mask.overlap(placed_a, placed_b, (left, bottom, right, top))
+import math
+
+import sprite_metadata
+
+enabled = True  # False면 combat_system이 AABB 판정만 사용
+
+_masks = {}  # (path, left, top, w, h) -> Mask (top은 시트 위쪽 원점, sprite_metadata의 rects와 같음)
+_sheet_heights = {}  # path -> 시트 높이 (frame_mask의 bottom을 top으로 바꿀 때)
+_loaded = set()  # 이미 읽은 (path, slicing)
+
+
+class Mask:
+    """w x h 프레임의 불투명 픽셀 비트마스크 (rows[0]이 맨 아래 줄)"""
+
+    def __init__(self, w, h, rows):
+        self.w = w
+        self.h = h
+        self.rows = rows
+        self._scaled = {}
+
+    @classmethod
+    def from_bytes(cls, w, h, data):
+        """PIL '1' 모드 tobytes() (위쪽 줄부터, 줄마다 바이트 경계로 채움)로 만든 마스크"""
+        stride = (w + 7) // 8
+        pad = stride * 8 - w
+        rows = [int.from_bytes(data[y * stride:(y + 1) * stride], 'big') >> pad for y in range(h)]
+        rows.reverse()
+        return cls(w, h, rows)
+
+    def scaled(self, scale):
+        """그릴 때와 같은 크기(int(w * scale) x int(h * scale))로 최근접 확대/축소한 마스크 (배율마다 한 번만 계산)"""
+        if scale == 1.0:
+            return self
+        mask = self._scaled.get(scale)
+        if mask is None:
+            w = max(1, int(self.w * scale))
+            h = max(1, int(self.h * scale))
+            cols = [min(self.w - 1, int(x / scale)) for x in range(w)]
+            rows = []
+            expanded = {}  # 원본 줄 -> 확대한 줄 (같은 줄이 여러 번 반복됨)
+            for y in range(h):
+                row = self.rows[min(self.h - 1, int(y / scale))]
+                if row not in expanded:
+                    bits = format(row, f'0{self.w}b')
+                    expanded[row] = int(''.join(bits[c] for c in cols), 2)
+                rows.append(expanded[row])
+            mask = self._scaled[scale] = Mask(w, h, rows)
+        return mask
+
+    def count(self):
+        """불투명 픽셀 수"""
+        return sum(bin(row).count('1') for row in self.rows)
+
+
+def load(path, slicing, size):
+    """시트 path를 slicing(sprite_metadata 분할 방식)으로 나눈 프레임들의 마스크를 읽어 둠 (시트마다 한 번)
+    size: 로드한 이미지 (w, h)"""
+    key = (path, slicing)
+    if key in _loaded:
+        return
+    _loaded.add(key)
+    meta = sprite_metadata.frames(path, slicing, size)
+    data = sprite_metadata.masks(path, slicing, size)
+    if meta is None or data is None:
+        return
+    _sheet_heights[path] = size[1]
+    for (left, top, w, h), frame in zip(meta['rects'], data):
+        _masks[(path, left, top, w, h)] = Mask.from_bytes(w, h, frame)
+
+
+def frame_mask(path, left, bottom, w, h):
+    """load()로 읽어 둔 시트 path의 (left, bottom, w, h) 프레임(Pico2D 좌표, clip_draw 인자와 같음) 마스크, 없으면 None"""
+    sheet_h = _sheet_heights.get(path)
+    if sheet_h is None:
+        return None
+    return _masks.get((path, left, sheet_h - bottom - h, w, h))
+
+
+def clear():
+    _masks.clear()
+    _sheet_heights.clear()
+    _loaded.clear()
+
+
+def place(mask, cx, cy):
+    """중심 (cx, cy)에 그려진 마스크 -> (mask, left, bottom) (clip_draw처럼 중심 기준, 정수 픽셀로 반올림)"""
+    if mask is None:
+        return None
+    return mask, int(math.floor(cx - mask.w / 2 + 0.5)), int(math.floor(cy - mask.h / 2 + 0.5))
+
+
+def overlap(a, b, region):
+    """월드 사각형 region 안에서 두 마스크의 불투명 픽셀이 겹치는지
+    a, b: (mask, left, bottom) 또는 None (None이면 region 전체가 채워진 것으로 봄)
+    region은 픽셀 단위로 넓혀서 판정 (폭이 0인 점 박스도 픽셀 한 칸)"""
+    left = int(math.floor(region[0]))
+    bottom = int(math.floor(region[1]))
+    right = max(left + 1, int(math.ceil(region[2])))
+    top = max(bottom + 1, int(math.ceil(region[3])))
+    for placed in (a, b):
+        if placed is not None:
+            mask, mask_left, mask_bottom = placed
+            left = max(left, mask_left)
+            bottom = max(bottom, mask_bottom)
+            right = min(right, mask_left + mask.w)
+            top = min(top, mask_bottom + mask.h)
+    if right <= left or top <= bottom:
+        return False
+
+    window = (1 << (right - left)) - 1
+    if a is None and b is None:
+        return True
+    if a is None or b is None:
+        mask, mask_left, mask_bottom = a if a is not None else b
+        shift = mask_left + mask.w - right
+        rows = mask.rows
+        for y in range(bottom - mask_bottom, top - mask_bottom):
+            if (rows[y] >> shift) & window:
+                return True
+        return False
+
+    mask_a, left_a, bottom_a = a
+    mask_b, left_b, bottom_b = b
+    shift_a = left_a + mask_a.w - right
+    shift_b = left_b + mask_b.w - right
+    rows_a = mask_a.rows
+    rows_b = mask_b.rows
+    offset = bottom_a - bottom_b
+    for y in range(bottom - bottom_a, top - bottom_a):
+        if (rows_a[y] >> shift_a) & (rows_b[y + offset] >> shift_b) & window:
+            return True
+    return False
@@ -0,0 +1,115 @@
+# combat_system.py
+# 공격 판정 단계
+# 한 틱 동안 발생한 공격 박스(플레이어 공격, 몬스터 공격 프레임)를 모아 두었다가 resolve()에서 한꺼번에 피격 박스와 비교하고,
+# 맞은 결과를 Hit 이벤트 리스트로 돌려준다. apply()가 이벤트 순서대로 데미지와 공격자 콜백(on_hit)을 적용한다.
+# 후보 찾기(broad phase)는 game_world의 영역 격자(query_rect)를 같이 쓰고, 판정은 피격 박스(get_hurt_bb)와 AABB 겹침으로 한다.
+# 대상이 정해진 공격(몬스터 공격)은 후보 찾기 없이 그 대상만 확인한다.
+# 공격이나 피격 쪽에 픽셀 마스크(collision_mask)가 있으면 AABB를 통과한 후보만 두 박스가 겹치는 영역에서 마스크로 다시 확인한다.
+# begin()을 부르지 않았을 때(던전 밖 등)는 submit()이 바로 판정/적용한다.
+#   combat_system.begin()
+#   ... combat_system.submit(player, player.get_bb(), player.attack, 'monster', on_hit=...)
+#   combat_system.apply(combat_system.resolve())
+from collections import namedtuple
+
+import collision_mask
+import game_world
+
+# 태그별 피격 박스가 (x, y)에서 최대로 벗어나는 거리: 격자 후보를 찾을 때 공격 박스를 이만큼 넓힘
+HURTBOX_REACH = {
+    'monster': 100,  # 몬스터 피격 반지름(scale * 25)의 최대치
+    'player': 0,  # 플레이어는 (x, y) 한 점
+}
+DEFAULT_REACH = 100
+
+Attack = namedtuple('Attack', 'attacker box damage tag target on_hit mask')
+Hit = namedtuple('Hit', 'attacker target damage on_hit')
+
+recording = False
+_attacks = []
+
+
+def begin():
+    """틱 시작: 이전 틱에 남은 공격은 버림"""
+    global recording
+    recording = True
+    _attacks.clear()
+
+
+def submit(attacker, box, damage, tag, target=None, on_hit=None, mask=None):
+    """공격 박스 (left, bottom, right, top) 등록
+    tag: 맞을 수 있는 객체 태그 ('monster', 'player'), target을 주면 그 객체만 맞을 수 있음 (몬스터의 공격 대상)
+    on_hit(hit): 맞았을 때 공격자 쪽 처리 (한 번만 때리기 등)
+    mask: 공격 프레임의 픽셀 마스크 (collision_mask.place 결과), None이면 박스 전체"""
+    if box is None:
+        return
+    attack = Attack(attacker, box, damage, tag, target, on_hit, mask)
+    if recording:
+        _attacks.append(attack)
+    else:
+        apply(_resolve([attack]))
+
+
+def pending():
+    return len(_attacks)
+
+
+def hurt_mask(o):
+    """피격 마스크: get_hurt_mask()가 있으면 그 값 (collision_mask.place 결과), 없으면 None (피격 박스 전체)"""
+    get_hurt_mask = getattr(o, 'get_hurt_mask', None)
+    if get_hurt_mask is not None:
+        return get_hurt_mask()
+    return None
+
+
+def hurt_bb(o):
+    """피격 박스: get_hurt_bb()가 있으면 그 값, 없으면 (x, y) 한 점"""
+    get_hurt_bb = getattr(o, 'get_hurt_bb', None)
+    if get_hurt_bb is not None:
+        return get_hurt_bb()
+    return o.x, o.y, o.x, o.y
+
+
+def resolve():
+    """등록된 공격을 모두 판정해서 Hit 리스트로 돌려주고 틱 종료"""
+    global recording
+    recording = False
+    hits = _resolve(_attacks)
+    _attacks.clear()
+    return hits
+
+
+def _resolve(attacks):
+    hits = []
+    for attack in attacks:
+        left, bottom, right, top = attack.box
+        if attack.target is not None:
+            candidates = (attack.target,)  # 대상이 정해진 공격은 후보 찾기가 필요 없음
+        else:
+            reach = HURTBOX_REACH.get(attack.tag, DEFAULT_REACH)
+            candidates = game_world.query_rect(left - reach, bottom - reach, right + reach, top + reach, attack.tag)
+        for target in candidates:
+            if not getattr(target, 'alive', True):
+                continue
+            target_left, target_bottom, target_right, target_top = hurt_bb(target)
+            if left > target_right or right < target_left or bottom > target_top or top < target_bottom:
+                continue
+            if collision_mask.enabled:
+                # 박스가 겹치는 영역에서만 픽셀 비교 (양쪽 다 마스크가 없으면 AABB 결과 그대로)
+                target_mask = hurt_mask(target)
+                if attack.mask is not None or target_mask is not None:
+                    region = (max(left, target_left), max(bottom, target_bottom),
+                              min(right, target_right), min(top, target_top))
+                    if not collision_mask.overlap(attack.mask, target_mask, region):
+                        continue
+            hits.append(Hit(attack.attacker, target, attack.damage, attack.on_hit))
+    return hits
+
+
+def apply(hits):
+    """Hit 순서대로 데미지 적용 후 공격자 콜백 호출"""
+    for hit in hits:
+        take_damage = getattr(hit.target, 'take_damage', None)
+        if take_damage is not None:
+            take_damage(hit.damage)
+        if hit.on_hit is not None:
+            hit.on_hit(hit)
@@ -1,10 +1,15 @@
 from pico2d import *
 import pico2d as _pico2d
+from resource_manager import load_font
 from sdl2 import SDL_QUIT, SDL_KEYDOWN, SDLK_ESCAPE, SDLK_u, SDLK_RETURN
 import random
 
 import game_framework
+import combat_system
 import game_world
+import monster_system
+import pathfinding
+import profiler
 
 from main_chracter import Main_character
 from tiled_map import TiledMap
@@ -22,8 +27,8 @@ player: Main_character = None
 tiled_map: TiledMap = None
 ui = None
 collision_boxes = []  # 충돌 영역
-monsters = []  # 몬스터 리스트
-loots = []  # 떨어진 전리품 리스트
+collision_grid = None  # 충돌 박스 공간 격자 (맵 로드 시 생성)
+# 몬스터/전리품 목록은 따로 들고 있지 않고 game_world 종류 인덱스를 사용 (game_world.objects_of('monster'), 'loot')
 current_dungeon = 1  # 현재 던전 레벨
 all_monsters_cleared = False  # 모든 몬스터 처치 여부
 message_font = None  # 메시지 출력용 폰트
@@ -35,25 +40,18 @@ camera_y = 0
 
 def is_position_valid(x, y, min_distance=100):
     """위치가 충돌 박스와 겹치지 않고, 다른 몬스터와도 충분히 떨어져 있는지 확인"""
-    # 충돌 박스와 겹치는지 확인
-    for box in collision_boxes:
-        left, bottom, right, top = box
-        if left - 50 < x < right + 50 and bottom - 50 < y < top + 50:
-            return False
-
-    # 다른 몬스터와 너무 가까운지 확인
-    for monster in monsters:
-        distance = ((x - monster.x) ** 2 + (y - monster.y) ** 2) ** 0.5
-        if distance < min_distance:
-            return False
+    # 충돌 박스와 겹치는지 확인 (주변 격자 칸의 박스만 검사)
+    if collision_grid is not None and collision_grid.hits_aabb(x - 50, y - 50, x + 50, y + 50):
+        return False
+
+    # 다른 몬스터와 너무 가까운지 확인 (주변 격자 칸의 몬스터만 검사)
+    if game_world.query_region(x, y, min_distance, 'monster'):
+        return False
 
     return True
 
 def spawn_random_monsters(count=5):
     """랜덤한 위치에 몬스터들을 배치"""
-    global monsters
-    monsters = []
-
     # 몬스터 타입 리스트
     monster_types = [Green_MS, Red_MS, Trash_Monster]
 
@@ -65,8 +63,9 @@ def spawn_random_monsters(count=5):
     margin = 100
     attempts = 0
     max_attempts = 100
+    spawned = 0
 
-    while len(monsters) < count and attempts < max_attempts:
+    while spawned < count and attempts < max_attempts:
         # 랜덤 위치 생성
         x = random.randint(margin, map_width - margin)
         y = random.randint(margin, map_height - margin)
@@ -81,16 +80,16 @@ def spawn_random_monsters(count=5):
             # 랜덤하게 몬스터 타입 선택
             monster_class = random.choice(monster_types)
             monster = monster_class(x, y)
-            monsters.append(monster)
             game_world.add_object(monster, 1)  # 플레이어와 같은 레이어
+            spawned += 1
             print(f"몬스터 생성: {monster.name} at ({x}, {y})")
 
         attempts += 1
 
-    print(f"총 {len(monsters)}마리의 몬스터 생성 완료!")
+    print(f"총 {spawned}마리의 몬스터 생성 완료!")
 
 def init():
-    global player, tiled_map, collision_boxes, ui, current_dungeon, all_monsters_cleared, message_font, exit_zone
+    global player, tiled_map, collision_boxes, collision_grid, ui, current_dungeon, all_monsters_cleared, message_font, exit_zone
 
     # 0. 인벤토리 초기화 (이미지 로드)
     #inventory.init()
@@ -112,9 +111,11 @@ def init():
 
     # 2. 충돌 영역 설정
     collision_boxes = tiled_map.get_collision_boxes()
+    collision_grid = tiled_map.build_collision_grid(collision_boxes)
+    pathfinding.set_nav(tiled_map.build_nav_grid(collision_boxes))  # 몬스터 길찾기 격자
 
-    # 3. 플레이어 생성 및 초기 위치 설정(맵 다 설정하면 위치 재설정 할 것임)
-    player = Main_character()
+    # 3. 세션 플레이어를 빌려와서 초기 위치 설정(맵 다 설정하면 위치 재설정 할 것임)
+    player = game_framework.borrow_player()
     if current_dungeon == 1:
         player.x = 640  # 던전1 시작 X 좌표 (중앙)
         player.y = 200  # 던전1 시작 Y 좌표
@@ -160,9 +161,10 @@ def init():
 def finish():
     # 던전 나가면 UI 포함 모든 객체 제거
     game_world.clear()
-    global collision_boxes, ui, monsters
+    global collision_boxes, collision_grid, ui
     collision_boxes = []
-    monsters = []
+    collision_grid = None
+    pathfinding.set_nav(None)
     ui = None
 
 def handle_events():
@@ -194,16 +196,13 @@ def check_collision(x, y, player):
         collision_w = CHARACTER_COLLISION_W // 2
         collision_h = CHARACTER_COLLISION_H // 2
 
-    for box in collision_boxes:
-        left, bottom, right, top = box
-        # 플레이어의 사각형 충돌 감지 (실제 캐릭터 크기 사용)
-        if left - collision_w < x < right + collision_w and \
-           bottom - collision_h < y < top + collision_h:
-            return True
-    return False
+    # 플레이어 주변 격자 칸의 박스만 검사 (실제 캐릭터 크기 사용)
+    if collision_grid is None:
+        return False
+    return collision_grid.hits_aabb(x - collision_w, y - collision_h, x + collision_w, y + collision_h)
 
 def change_to_dungeon2():
-    global player, tiled_map, collision_boxes, monsters, loots, current_dungeon, all_monsters_cleared, exit_zone
+    global player, tiled_map, collision_boxes, collision_grid, current_dungeon, all_monsters_cleared, exit_zone
 
     print("======> 던전2로 이동 ======>")
 
@@ -213,14 +212,14 @@ def change_to_dungeon2():
     # 상태 초기화
     current_dungeon = 2
     all_monsters_cleared = False
-    monsters = []
-    loots = []
 
     # 던전2 맵 로드 (카메라 미사용 - 화면에 맞게 스케일링)
     tiled_map = TiledMap('map/dungeon2.json', use_camera=False)
 
     # 충돌 박스 업데이트 (중요!)
     collision_boxes = tiled_map.get_collision_boxes()
+    collision_grid = tiled_map.build_collision_grid(collision_boxes)
+    pathfinding.set_nav(tiled_map.build_nav_grid(collision_boxes))  # 몬스터 길찾기 격자
 
     # 디버그 출력 추가
     print(f"던전2 충돌 박스 로드 완료: {len(collision_boxes)}개")
@@ -234,6 +233,7 @@ def change_to_dungeon2():
     # 플레이어 위치 설정 (던전2 시작 위치)
     player.x = 640
     player.y = 200
+    player.prev_x, player.prev_y = player.x, player.y  # 순간이동: 이전 위치와 보간하지 않음
 
     # UI 다시 생성
     global ui
@@ -251,10 +251,10 @@ def change_to_dungeon2():
     # 던전2도 상단 문 위치에 출구 설정
     exit_zone = (580, 680, 700, 736)  # (left, bottom, right, top)
 
-    print(f"던전2 로드 완료: 몬스터 {len(monsters)}마리")
+    print(f"던전2 로드 완료: 몬스터 {game_world.count('monster')}마리")
 
 def change_to_boss_room():
-    global player, tiled_map, collision_boxes, monsters, loots, current_dungeon, all_monsters_cleared, exit_zone
+    global player, tiled_map, collision_boxes, collision_grid, current_dungeon, all_monsters_cleared, exit_zone
 
     print("======> 보스방으로 이동 ======>")
 
@@ -264,8 +264,6 @@ def change_to_boss_room():
     # 상태 초기화
     current_dungeon = 3  # 보스방을 던전 3으로 표시
     all_monsters_cleared = False
-    monsters = []
-    loots = []
 
     # 보스방 맵 로드 (카메라 사용) - 파일명 확인
     tiled_map = TiledMap('map/boss_room.json', use_camera=True)
@@ -273,6 +271,8 @@ def change_to_boss_room():
 
     # 충돌 박스 업데이트
     collision_boxes = tiled_map.get_collision_boxes()
+    collision_grid = tiled_map.build_collision_grid(collision_boxes)
+    pathfinding.set_nav(tiled_map.build_nav_grid(collision_boxes))  # 몬스터 길찾기 격자
 
     # 디버그 출력
     print(f"보스방 충돌 박스 로드 완료: {len(collision_boxes)}개")
@@ -284,6 +284,7 @@ def change_to_boss_room():
     # 플레이어 위치 설정 (보스방 시작 위치)
     player.x = 640
     player.y = 200
+    player.prev_x, player.prev_y = player.x, player.y  # 순간이동: 이전 위치와 보간하지 않음
 
     # UI 다시 생성
     global ui
@@ -304,8 +305,11 @@ def change_to_boss_room():
 
     print(f"보스방 로드 완료")
 
+def _on_player_hit(hit):
+    print(f"플레이어가 {hit.target.name}에게 {hit.damage} 데미지!")
+
 def update(dt):
-    global loots, all_monsters_cleared, camera_x, camera_y
+    global all_monsters_cleared, camera_x, camera_y
 
     # 이전 위치 저장
     prev_x = player.x
@@ -314,29 +318,47 @@ def update(dt):
     # 플레이어 업데이트
     player.update(dt)
 
+    # 이번 틱의 공격 박스 모으기 시작 (몬스터 공격 프레임, 플레이어 공격)
+    combat_system.begin()
+
+    # 대기 중인 길찾기 요청을 프레임 예산만큼 계산
+    with profiler.section('pathfinding'):
+        pathfinding.process()
+
     # 몬스터 업데이트
-    for monster in monsters[:]:  # 복사본으로 순회하여 안전하게 제거
-        # 살아있거나 death 애니메이션 중이면 업데이트
-        monster.update(dt, frozen=False, player=player)
+    with profiler.section('monster update'):
+        # 살아있거나 death 애니메이션 중인 몬스터를 배열로 한꺼번에 업데이트 (monster_system)
+        monsters = game_world.objects_of('monster')
+        monster_system.update(monsters, dt, player)
 
-        # death 애니메이션이 완전히 끝난 몬스터만 제거하고 전리품 생성
-        if not monster.alive and monster.animator.is_animation_finished():
-            # 전리품 생성
-            loot = Loot(monster.x, monster.y, 'coin', random.randint(1, 5))
-            loots.append(loot)
-            game_world.add_object(loot, 1)  # 플레이어와 같은 레이어
+        for monster in monsters:
+            # death 애니메이션이 완전히 끝난 몬스터만 제거하고 전리품 생성
+            if not monster.alive and monster.animator.is_animation_finished():
+                # 전리품 생성
+                loot = Loot(monster.x, monster.y, 'coin', random.randint(1, 5))
+                game_world.add_object(loot, 1)  # 플레이어와 같은 레이어
+
+                game_world.remove_object(monster)  # 제거 예약 (프레임 끝에 game_world가 한 번에 정리)
+                print(f"{monster.name} 제거 완료 - 전리품 생성!")
+
+    # 플레이어 공격: 공격 박스를 등록하고 한 번만 데미지 주기
+    player_attack_bb = player.get_bb()
+    if player_attack_bb is not None and getattr(player, 'attack_hit_pending', False):
+        combat_system.submit(player, player_attack_bb, player.attack, 'monster', on_hit=_on_player_hit,
+                             mask=player.get_attack_mask())
+        player.attack_hit_pending = False
 
-            game_world.remove_object(monster)
-            monsters.remove(monster)
-            print(f"{monster.name} 제거 완료 - 전리품 생성!")
+    # 모은 공격을 한꺼번에 판정하고 적용
+    with profiler.section('combat'):
+        combat_system.apply(combat_system.resolve())
 
     # 모든 몬스터 처치 확인 (던전1에서만)
-    if current_dungeon == 1 and not all_monsters_cleared and len(monsters) == 0:
+    if current_dungeon == 1 and not all_monsters_cleared and game_world.count('monster') == 0:
         all_monsters_cleared = True
         print("======> 모든 몬스터 처치! 출구로 이동하세요! ======>")
 
     # 모든 몬스터 처치 확인 (던전2에서만)
-    if current_dungeon == 2 and not all_monsters_cleared and len(monsters) == 0:
+    if current_dungeon == 2 and not all_monsters_cleared and game_world.count('monster') == 0:
         all_monsters_cleared = True
         print("======> 던전2의 모든 몬스터 처치! 보스방으로 이동하세요! ======>")
 
@@ -354,33 +376,8 @@ def update(dt):
             change_to_boss_room()
             return  # update 중단
 
-    # 플레이어 공격 충돌 처리
-    player_attack_bb = player.get_bb()
-    if player_attack_bb is not None and hasattr(player, 'attack_hit_pending') and player.attack_hit_pending:
-        left, bottom, right, top = player_attack_bb
-        for monster in monsters[:]:  # 복사본으로 순회
-            if not monster.alive:
-                continue
-
-            # 몬스터의 충돌 범위 계산
-            monster_size = monster.scale * 25  # 반지름
-            monster_left = monster.x - monster_size
-            monster_right = monster.x + monster_size
-            monster_bottom = monster.y - monster_size
-            monster_top = monster.y + monster_size
-
-            # 사각형 충돌 감지
-            if not (left > monster_right or right < monster_left or
-                    bottom > monster_top or top < monster_bottom):
-                monster.take_damage(player.attack)
-                print(f"플레이어가 {monster.name}에게 {player.attack} 데미지!")
-
-        # 한 번만 데미지 주기
-        player.attack_hit_pending = False
-
     # 전리품 업데이트 및 수집 처리
-    collected_loots = []
-    for loot in loots:
+    for loot in game_world.objects_of('loot'):
         # 전리품 업데이트
         should_remove = loot.update(dt)
 
@@ -391,26 +388,19 @@ def update(dt):
             inventory.add_item(item_info['type'], item_info['quantity'])
             print(f"[COLLECT] 수집: {item_info['type']} x{item_info['quantity']}")
 
-        # 수집 완료되거나 제거 대상이면 표시
+        # 수집 완료되거나 제거 대상이면 제거 예약
         if should_remove or loot.collected:
-            collected_loots.append(loot)
-
-    # 완료된 전리품 제거
-    for loot in collected_loots:
-        try:
             game_world.remove_object(loot)
-        except Exception:
-            pass
-        loots.remove(loot)
 
     # UI 업데이트
     if ui is not None:
         ui.update(dt)
 
     # 충돌 처리: 플레이어가 충돌 박스에 닿으면 이전 위치로 복원
-    if check_collision(player.x, player.y, player):
-        player.x = prev_x
-        player.y = prev_y
+    with profiler.section('collision'):
+        if check_collision(player.x, player.y, player):
+            player.x = prev_x
+            player.y = prev_y
 
     # 보스방에서 플레이어가 맵 경계를 넘지 않도록 제한
     if current_dungeon == 3:
@@ -471,31 +461,36 @@ def draw():
         if tiled_map:
             tiled_map.draw_with_camera(camera_x, camera_y)
 
-        # 2. 게임 월드의 객체들을 분류하여 처리
-        game_objects = []  # 플레이어, 몬스터, 전리품 등
-
-        for obj in game_world.all_objects():
-            if obj == tiled_map or obj == ui:
-                continue  # 맵과 UI는 별도 처리
-            game_objects.append(obj)
+        # 2. 게임 객체(플레이어, 몬스터, 전리품 등)는 모두 layer 1에 있음 (맵은 layer 0, UI는 layer 2)
+        game_world.flush_removals()
+        game_world.sort_depth()  # 발 y 순서 (위쪽 객체를 먼저 그림)
 
         # 3. 게임 객체들을 카메라 적용하여 그리기
-        for obj in game_objects:
-            if hasattr(obj, 'draw') and hasattr(obj, 'x') and hasattr(obj, 'y'):
-                # 원본 좌표 저장
-                original_x = obj.x
-                original_y = obj.y
-
-                # 화면 좌표로 변환하여 임시 설정
-                obj.x = original_x + cam_offset_x
-                obj.y = original_y + cam_offset_y
-
-                # 그리기
-                obj.draw()
-
-                # 즉시 원래 좌표로 복원
-                obj.x = original_x
-                obj.y = original_y
+        for obj in game_world.objects_at_layer(game_world.DEPTH_SORTED_LAYER):
+            # 원본 좌표 저장
+            original_x = obj.x
+            original_y = obj.y
+            # 보간용 이전 위치도 같이 옮김 (game_framework.lerp)
+            interpolated = hasattr(obj, 'prev_x')
+            if interpolated:
+                original_prev_x = obj.prev_x
+                original_prev_y = obj.prev_y
+                obj.prev_x = original_prev_x + cam_offset_x
+                obj.prev_y = original_prev_y + cam_offset_y
+
+            # 화면 좌표로 변환하여 임시 설정
+            obj.x = original_x + cam_offset_x
+            obj.y = original_y + cam_offset_y
+
+            # 그리기
+            obj.draw()
+
+            # 즉시 원래 좌표로 복원
+            obj.x = original_x
+            obj.y = original_y
+            if interpolated:
+                obj.prev_x = original_prev_x
+                obj.prev_y = original_prev_y
 
         # 4. UI는 화면 고정 위치에 그리기 (카메라 영향 없음)
         if ui:
@@ -511,7 +506,7 @@ def draw():
             draw_rectangle(screen_left, screen_bottom, screen_right, screen_top)
 
         # 6. 몬스터들의 공격 범위 표시 (카메라 기준)
-        for monster in monsters:
+        for monster in game_world.objects_of('monster'):
             if monster.alive and monster.show_attack_range:
                 attack_bb = monster.get_attack_bb()
                 if attack_bb is not None:
@@ -531,7 +526,7 @@ def draw():
             draw_rectangle(left, bottom, right, top)
 
         # 몬스터들의 공격 범위 표시
-        for monster in monsters:
+        for monster in game_world.objects_of('monster'):
             if monster.alive and monster.show_attack_range:
                 attack_bb = monster.get_attack_bb()
                 if attack_bb is not None:
@@ -556,6 +551,7 @@ def draw():
         hint = "(상단 문으로 이동하세요)"
         message_font.draw(screen_center_x - 150, screen_center_y + 10, hint, (200, 200, 200))
 
+    profiler.draw_overlay()
     update_canvas()
 
 def pause(): pass
@@ -1,61 +1,202 @@
 # game_framework.py
 import time
+import resource_manager
+import profiler
+import game_world
+import monster_system
 
 stack = None # 모드 스택
 running = True
 frame_time = 0.0
 current_time =0.0
 
+# 고정 시간 간격(fixed timestep) 시뮬레이션 설정 (기본은 기존처럼 frame_time을 그대로 update에 전달)
+fixed_timestep = False
+tick_rate = 60  # 고정 모드에서 초당 update 횟수
+max_catch_up_steps = 5  # 느린 프레임 뒤 한 프레임에서 따라잡을 최대 update 횟수
+alpha = 1.0  # 렌더링 보간 계수 (0~1): 마지막 update 이후 다음 update까지 진행된 비율, draw()에서 lerp()로 이전 위치와 보간
+accumulator = 0.0  # 아직 update로 소비하지 않은 시간
+
+# 프레임 제한 (vsync를 못 쓰는 환경에서도 코어 하나를 100% 쓰지 않도록)
+target_fps = 0  # 0이면 제한 없음 (vsync가 속도를 맞춤). vsync 없이 창을 열 때만 설정 (main.py)
+low_power_fps = 15  # 모듈에 low_power = True 가 있는 정적인 모드(타이틀, 배낭 등)에서 쓸 FPS
+spin_threshold = 0.002  # 남은 시간이 이보다 짧아지면 sleep 대신 바쁜 대기로 정확히 맞춤
+busy_time = 0.0  # 실제로 이벤트/update/draw를 처리한 누적 시간
+idle_time = 0.0  # 프레임 제한으로 기다린 누적 시간
+frame_count = 0
+
+# 시뮬레이션 시계 (headless 실행에서는 프레임마다 일정하게 증가하는 가상 시계로 교체)
+clock = time.perf_counter
+
+# 모드 전환 사이에 유지되는 세션 플레이어 (각 모드는 새로 만들지 않고 빌려 씀)
+player = None
+SESSION_SCOPE = 'session'  # 세션 객체가 쓰는 리소스는 모드가 끝나도 해제하지 않음
+
 def run(start_mode):
-    global running, stack, frame_time, current_time
+    global running, stack, frame_time, current_time, alpha, frame_count, busy_time, idle_time
     running = True
+    frame_count = 0
+    busy_time = idle_time = 0.0
     stack = [start_mode]
+    resource_manager.set_scope(start_mode.__name__)
     start_mode.init()
 
-    current_time = time.time()
+    current_time = clock()
 
     while running:
-        now = time.time()
+        frame_start = time.perf_counter()
+        now = clock()
         frame_time = now - current_time
         current_time = now
 
         # 스택의 맨 위 모드(현재 모드)를 실행
-        stack[-1].handle_events()
-        stack[-1].update(frame_time) # dt(frame_time)를 전달
-        stack[-1].draw()
+        profiler.begin_frame()
+        with profiler.section('handle_events'):
+            stack[-1].handle_events()
+        with profiler.section('update'):
+            if fixed_timestep:
+                step_fixed(frame_time)
+            else:
+                stack[-1].update(frame_time) # dt(frame_time)를 전달
+                alpha = 1.0
+            game_world.flush_removals()  # update 중에 예약된 객체 제거를 프레임마다 한 번에 처리
+            game_world.invalidate_regions()  # 위치가 바뀌었으므로 영역 질의 격자는 다음 질의 때 다시 만듦
+        with profiler.section('draw'):
+            stack[-1].draw()
+        profiler.end_frame(time.perf_counter() - frame_start)
+
+        frame_count += 1
+        wait_for_next_frame(frame_start)
+
+    print_frame_stats()
+    if profiler.enabled:
+        profiler.dump()
 
     # 스택에 남아있는 모든 모드를 종료
     while (len(stack) > 0):
         stack[-1].finish()
+        resource_manager.release_scope(stack[-1].__name__)
         stack.pop()
 
+def step_fixed(elapsed):
+    """경과 시간을 누적해서 1/tick_rate 간격으로 update를 여러 번 호출하고 보간 계수 alpha를 갱신"""
+    global accumulator, alpha
+    step = 1.0 / tick_rate
+    accumulator += elapsed
+
+    mode = stack[-1]
+    steps = 0
+    while accumulator >= step and steps < max_catch_up_steps:
+        save_previous_positions()
+        mode.update(step)
+        accumulator -= step
+        steps += 1
+        if not running or stack[-1] is not mode:
+            return  # update 중에 종료/모드 전환이 일어나면 남은 시간은 버림 (전환 함수가 accumulator 초기화)
+
+    # 따라잡지 못한 시간은 버려서 다음 프레임에 update가 몰리지 않게 함
+    if accumulator >= step:
+        accumulator = accumulator % step
+    alpha = accumulator / step
+
+def save_previous_positions():
+    """고정 간격 update 직전 위치를 prev_x/prev_y에 저장 (플레이어, 몬스터)"""
+    monster_system.save_previous()
+    if player is not None:
+        player.prev_x = player.x
+        player.prev_y = player.y
+
+def lerp(previous, current):
+    """draw에서 쓰는 보간 좌표: 직전 update 위치와 현재 위치 사이를 alpha만큼 (가변 간격 모드에서는 현재 위치 그대로)"""
+    if alpha >= 1.0:
+        return current
+    return previous + (current - previous) * alpha
+
+def wait_for_next_frame(frame_start):
+    """목표 FPS에 맞춰 남은 시간만큼 대기 (대부분은 sleep, 마지막 spin_threshold 만큼은 spin)"""
+    global busy_time, idle_time
+    work_end = time.perf_counter()
+    busy_time += work_end - frame_start
+
+    fps = low_power_fps if stack and getattr(stack[-1], 'low_power', False) else target_fps
+    if fps <= 0:
+        return
+    deadline = frame_start + 1.0 / fps
+    remaining = deadline - work_end
+    if remaining <= 0:
+        return
+
+    if remaining > spin_threshold:
+        time.sleep(remaining - spin_threshold)
+    while time.perf_counter() < deadline:
+        pass
+    idle_time += time.perf_counter() - work_end
+
+def get_frame_stats():
+    """(프레임 수, 작업 시간, 대기 시간, 대기 비율) 반환"""
+    total = busy_time + idle_time
+    idle_ratio = idle_time / total if total > 0 else 0.0
+    return frame_count, busy_time, idle_time, idle_ratio
+
+def print_frame_stats():
+    frames, busy, idle, idle_ratio = get_frame_stats()
+    if frames == 0:
+        return
+    print(f"프레임 {frames}개: 작업 {busy:.2f}초, 대기 {idle:.2f}초 (대기 비율 {idle_ratio * 100:.1f}%, "
+          f"프레임당 작업 {busy / frames * 1000:.2f}ms)")
+
+def borrow_player():
+    """세션 플레이어를 돌려줌. 처음 한 번만 생성하고, 이후에는 위치/입력 상태만 초기화해서 재사용"""
+    global player
+    if player is None:
+        from main_chracter import Main_character  # 순환 import 방지
+        mode_scope = resource_manager.current_scope
+        resource_manager.set_scope(SESSION_SCOPE)
+        player = Main_character()
+        resource_manager.set_scope(mode_scope)
+    else:
+        player.reset_on_mode_enter()
+    return player
+
 def quit():
     global running
     running = False
 
 def change_mode(mode):
-    global stack, current_time
+    global stack, current_time, accumulator
     if (len(stack) > 0):
         stack[-1].finish()
+        # 끝난 모드의 리소스 참조 해제 (다음 모드가 같은 리소스를 쓰면 캐시에서 그대로 재사용)
+        resource_manager.release_scope(stack[-1].__name__)
         stack.pop()
     stack.append(mode)
+    resource_manager.set_scope(mode.__name__)
     mode.init()
-    current_time = time.time()
+    save_previous_positions()  # 새 모드에서 옮겨진 위치를 이전 위치와 보간하지 않도록
+    current_time = clock()
+    accumulator = 0.0
 
 def push_mode(mode):
-    global stack, current_time
+    global stack, current_time, accumulator
     if (len(stack) > 0):
         stack[-1].pause()
     stack.append(mode)
+    resource_manager.set_scope(mode.__name__)
     mode.init()
+    save_previous_positions()
 
-    current_time = time.time()
+    current_time = clock()
+    accumulator = 0.0
 
 def pop_mode():
-    global stack, current_time
+    global stack, current_time, accumulator
     if (len(stack) > 0):
         stack[-1].finish()
+        resource_manager.release_scope(stack[-1].__name__)
         stack.pop()
     if (len(stack) > 0):
+        resource_manager.set_scope(stack[-1].__name__)
         stack[-1].resume()
-    current_time = time.time()
\ No newline at end of file
+    save_previous_positions()
+    current_time = clock()
+    accumulator = 0.0
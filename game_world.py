@@ -1,40 +1,251 @@
+import profiler
+import render_queue
+
 # layer 0: 배경
 # layer 1: 중간 (Player, Monsters)
 # layer 2: UI
 world = [[], [], []]
 
-def add_object(o, depth=1):
-    world[depth].append(o)
+DEPTH_SORTED_LAYER = 1  # 발 y 기준으로 그리기 순서를 유지하는 레이어 (위쪽(y 큰) 객체를 먼저 그림)
+FULL_SORT_RATIO = 0.125  # 순서가 어긋난 객체가 이 비율보다 많으면(대량 추가 직후 등) 삽입 정렬 대신 전체 정렬
+
+# 객체 핸들: add_object가 돌려주는 정수 ID (객체가 월드에 있는 동안 유지, 재사용하지 않음)
+_next_handle = 1
+_handles = {}  # id(o) -> handle
+_entries = {}  # handle -> (o, depth, tags)
+# 제거 예약: remove_object는 표시만 하고(O(1)), 실제 리스트 정리는 flush_removals()에서 레이어당 한 번에 처리
+_pending_removal = set()  # 제거 예약된 객체의 id(o)
+_dirty_layers = set()  # 제거 예약된 객체가 있는 레이어 번호
+
+# 보조 인덱스: 종류/태그별 객체와 위치 격자
+# 객체의 종류는 클래스 속성 world_kind ('monster', 'loot', 'npc', 'player'), add_object의 tags로 태그를 더 붙일 수 있음
+# 태그가 하나라도 있는 객체만 인덱스에 들어감 (맵, UI 등은 제외)
+REGION_CELL = 128  # 영역 질의용 격자 칸 크기 (px)
+REGION_MARGIN = 16  # 격자를 만든 뒤 객체가 움직였을 수 있으므로 질의 범위를 이만큼 넓혀서 후보를 찾음
+_by_tag = {}  # tag -> {handle: o} (추가 순서 유지)
+_tagged = {}  # handle -> o (태그가 있는 모든 객체)
+_region_cells = {}  # (cx, cy) -> {handle: o}
+_region_cell_of = {}  # handle -> (cx, cy)
+_regions_valid = False  # 위치가 바뀌면(프레임마다) 무효화, 다음 영역 질의 때 한 번 다시 만듦
+
+def add_object(o, depth=1, tags=()):
+    """객체를 depth 레이어에 추가하고 핸들 반환
+    tags: world_kind 외에 붙일 태그 (objects_of / query_region에서 사용)
+    이미 월드에 있는 객체면 기존 핸들을 그대로 돌려줌 (제거 예약 중이었으면 예약을 취소하고 인덱스를 되살림)"""
+    global _next_handle
+    kind = getattr(o, 'world_kind', None)
+    tags = ((kind,) if kind else ()) + tuple(tags)
+    handle = _handles.get(id(o))
+    if handle is not None:
+        if _entries[handle][1] != depth:
+            raise ValueError('Object is already in another layer')
+        if id(o) not in _pending_removal:
+            return handle
+        # 제거 예약 취소: 레이어 리스트에는 아직 남아 있으므로 인덱스만 다시 넣음 (순회 중인 리스트는 건드리지 않음)
+        _pending_removal.discard(id(o))
+    else:
+        handle = _next_handle
+        _next_handle += 1
+        _handles[id(o)] = handle
+        world[depth].append(o)
+    _entries[handle] = (o, depth, tags)
+    if tags:
+        for tag in tags:
+            _by_tag.setdefault(tag, {})[handle] = o
+        _tagged[handle] = o
+        if _regions_valid:
+            _region_insert(handle, o)
+    return handle
+
+def add_objects(ol, depth=1, tags=()):
+    return [add_object(o, depth, tags) for o in ol]
+
+def handle_of(o):
+    """월드에 있는 객체의 핸들 (없으면 None)"""
+    return _handles.get(id(o))
 
-def add_objects(ol, depth=1):
-    world[depth] += ol
+def get_object(handle):
+    """핸들로 객체 찾기 (이미 제거됐으면 None)"""
+    entry = _entries.get(handle)
+    if entry is None or id(entry[0]) in _pending_removal:
+        return None
+    return entry[0]
+
+def contains(o):
+    return id(o) in _handles and id(o) not in _pending_removal
 
 def remove_object(o):
-    for layer in world:
-        if o in layer:
-            layer.remove(o)
-            return
-    raise ValueError('Cannot delete non existing object')
+    """제거 예약 (O(1)). 프레임 끝(game_framework가 update 직후 호출하는 flush_removals)에 한꺼번에 빠짐"""
+    handle = _handles.get(id(o))
+    if handle is None:
+        raise ValueError('Cannot delete non existing object')
+    if id(o) in _pending_removal:
+        return
+    _pending_removal.add(id(o))
+    _, depth, tags = _entries[handle]
+    _dirty_layers.add(depth)
+    # 보조 인덱스에서는 바로 뺌 (dict라 O(1))
+    if tags:
+        for tag in tags:
+            del _by_tag[tag][handle]
+        del _tagged[handle]
+        cell = _region_cell_of.pop(handle, None)
+        if cell is not None:
+            del _region_cells[cell][handle]
+
+def flush_removals():
+    """예약된 제거를 처리: 영향받은 레이어마다 한 번씩만 걸러냄 (몇 개를 지우든 레이어 길이에 비례)
+    리스트 순서(그리기 순서)는 그대로 유지"""
+    if not _pending_removal:
+        return 0
+    removed = len(_pending_removal)
+    for depth in _dirty_layers:
+        world[depth][:] = [o for o in world[depth] if id(o) not in _pending_removal]
+    for object_id in _pending_removal:
+        del _entries[_handles.pop(object_id)]
+    _pending_removal.clear()
+    _dirty_layers.clear()
+    return removed
 
 def all_objects():
     for layer in world:
         for o in layer:
-            yield o
+            if id(o) not in _pending_removal:
+                yield o
 
 def clear():
-    for o in all_objects():
-        del o
     for layer in world:
         layer.clear()
+    _handles.clear()
+    _entries.clear()
+    _pending_removal.clear()
+    _dirty_layers.clear()
+    _by_tag.clear()
+    _tagged.clear()
+    invalidate_regions()
+
+def objects_of(tag):
+    """tag(종류 포함)가 붙은 객체 리스트 (추가 순서). 순회 중에 추가/제거해도 되도록 복사본"""
+    members = _by_tag.get(tag)
+    return list(members.values()) if members else []
+
+def count(tag):
+    members = _by_tag.get(tag)
+    return len(members) if members else 0
+
+def invalidate_regions():
+    """객체 위치가 바뀐 뒤 호출 (game_framework가 update 직후, render가 그리기 전에 호출)"""
+    global _regions_valid
+    _regions_valid = False
+    _region_cells.clear()
+    _region_cell_of.clear()
+
+def _region_insert(handle, o):
+    cell = (int(o.x // REGION_CELL), int(o.y // REGION_CELL))
+    members = _region_cells.get(cell)
+    if members is None:
+        members = _region_cells[cell] = {}
+    members[handle] = o
+    _region_cell_of[handle] = cell
+
+def _rebuild_regions():
+    global _regions_valid
+    invalidate_regions()
+    for handle, o in _tagged.items():
+        _region_insert(handle, o)
+    _regions_valid = True
+
+def query_rect(left, bottom, right, top, tag=None):
+    """(x, y)가 사각형 안에 있는 객체 리스트 (tag를 주면 그 태그만)
+    격자는 프레임마다 처음 질의할 때 한 번만 만들고, 겹치는 칸만 검사함"""
+    if not _regions_valid:
+        _rebuild_regions()
+    members = None
+    if tag is not None:
+        members = _by_tag.get(tag)
+        if not members:
+            return []
+    result = []
+    cx_start = int((left - REGION_MARGIN) // REGION_CELL)
+    cx_end = int((right + REGION_MARGIN) // REGION_CELL)
+    cy_start = int((bottom - REGION_MARGIN) // REGION_CELL)
+    cy_end = int((top + REGION_MARGIN) // REGION_CELL)
+    for cx in range(cx_start, cx_end + 1):
+        for cy in range(cy_start, cy_end + 1):
+            cell = _region_cells.get((cx, cy))
+            if not cell:
+                continue
+            for handle, o in cell.items():
+                if members is not None and handle not in members:
+                    continue
+                # 후보는 격자 기준, 판정은 현재 위치 기준
+                if left <= o.x <= right and bottom <= o.y <= top:
+                    result.append(o)
+    return result
+
+def query_region(x, y, radius, tag=None):
+    """(x, y)에서 radius 안에 있는 객체 리스트 (예: query_region(player.x, player.y, 400, 'monster'))"""
+    r2 = radius * radius
+    return [o for o in query_rect(x - radius, y - radius, x + radius, y + radius, tag)
+            if (o.x - x) ** 2 + (o.y - y) ** 2 <= r2]
 
 def update(dt):
     for o in all_objects():
         o.update(dt) # 모든 객체의 update에 dt 전달
 
+def depth_y(o):
+    # 객체의 발 위치 y (depth_offset 속성이 있으면 y에 더함, 없으면 y가 발 위치)
+    return o.y + getattr(o, 'depth_offset', 0.0)
+
+def sort_depth():
+    """DEPTH_SORTED_LAYER를 발 y 내림차순으로 정렬
+    리스트는 프레임 사이에 유지되므로 거의 정렬된 상태 -> 자리를 벗어난 객체만 삽입 정렬로 옮김 (거의 선형 시간)"""
+    layer = world[DEPTH_SORTED_LAYER]
+    keys = [depth_y(o) for o in layer]
+    out_of_order = 0
+    for i in range(1, len(keys)):
+        if keys[i] > keys[i - 1]:
+            out_of_order += 1
+    if out_of_order == 0:
+        return
+    if out_of_order > len(keys) * FULL_SORT_RATIO:
+        # 안정 정렬이라 y가 같은 객체끼리는 기존 순서 유지
+        order = sorted(range(len(layer)), key=keys.__getitem__, reverse=True)
+        layer[:] = [layer[i] for i in order]
+        return
+
+    for i in range(1, len(layer)):
+        key = keys[i]
+        if key <= keys[i - 1]:
+            continue
+        o = layer[i]
+        j = i - 1
+        while j >= 0 and keys[j] < key:
+            keys[j + 1] = keys[j]
+            layer[j + 1] = layer[j]
+            j -= 1
+        keys[j + 1] = key
+        layer[j + 1] = o
+
 def render():
-    for layer in world:
-        for o in layer:
-            o.draw()
+    # 객체의 그리기 명령을 render_queue에 모았다가 레이어/정렬 키/텍스처 순서로 한꺼번에 그림
+    # 정렬 키는 레이어 안의 리스트 순서. DEPTH_SORTED_LAYER는 sort_depth 결과(발 y 순서)를 그대로 지켜야 하므로 텍스처로 묶지 않음
+    # queued_draw = True인 객체는 draw()에서 render_queue 함수로 명령을 직접 기록하고,
+    # 나머지(맵, UI 등)는 draw 호출 자체를 명령 하나로 끼워 넣음
+    flush_removals()
+    invalidate_regions()
+    with profiler.section('depth sort'):
+        sort_depth()
+    render_queue.begin()
+    for depth, layer in enumerate(world):
+        depth_sorted = depth == DEPTH_SORTED_LAYER
+        for index, o in enumerate(layer):
+            render_queue.order(depth, index, not depth_sorted)
+            if getattr(o, 'queued_draw', False):
+                o.draw()
+            else:
+                render_queue.call(o.draw)
+    render_queue.flush()
 
 # 특정 레이어의 객체들을 가져오는 함수 (예: 충돌 처리용)
 def objects_at_layer(layer_index):
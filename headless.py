@@ -0,0 +1,297 @@
+# headless.py
+# 창/GPU 없이 게임을 돌리기 위한 pico2d 대체 백엔드
+# install()을 게임 모듈을 import 하기 전에 호출하면 sys.modules['pico2d']가 이 모듈로 바뀐다.
+#   - load_image/load_font: 파일은 확인하고 이미지 크기(w, h)만 읽음 (PIL, 없으면 PNG 헤더)
+#   - 그리기 함수: 아무것도 그리지 않고 호출 횟수만 셈
+#   - get_events: 미리 등록한 스크립트 입력을 프레임 번호에 맞춰 돌려줌
+#   - get_time / game_framework.clock: 프레임마다 dt씩 증가하는 가상 시계 (dt=None이면 실제 시간)
+# 사용 예: python headless.py dungeon_mode --frames 600
+import os
+import struct
+import sys
+import time
+import types
+
+# sdl2를 못 불러오는 환경(SDL 라이브러리 없음)에서 쓸 상수 (SDL2 헤더 값과 동일)
+SDL_CONSTANTS = {
+    'SDL_QUIT': 0x100, 'SDL_KEYDOWN': 0x300, 'SDL_KEYUP': 0x301,
+    'SDL_MOUSEMOTION': 0x400, 'SDL_MOUSEBUTTONDOWN': 0x401, 'SDL_MOUSEBUTTONUP': 0x402,
+    'SDL_BUTTON_LEFT': 1, 'SDL_BUTTON_MIDDLE': 2, 'SDL_BUTTON_RIGHT': 3,
+    'SDLK_RETURN': 13, 'SDLK_ESCAPE': 27, 'SDLK_BACKSPACE': 8, 'SDLK_TAB': 9, 'SDLK_SPACE': 32,
+    'SDLK_RIGHT': 0x40000000 | 79, 'SDLK_LEFT': 0x40000000 | 80,
+    'SDLK_DOWN': 0x40000000 | 81, 'SDLK_UP': 0x40000000 | 82,
+}
+SDL_CONSTANTS.update({'SDLK_' + c: ord(c) for c in 'abcdefghijklmnopqrstuvwxyz0123456789'})
+
+installed = False
+canvas_width = 1280
+canvas_height = 736
+
+# 통계 (benchmark 등에서 읽음)
+frame = 0  # update_canvas 호출 횟수
+draw_calls = 0  # 이미지/폰트/사각형 그리기 호출 횟수
+images_loaded = 0
+
+# 스크립트 입력: 프레임 번호 -> [Event, ...]
+_script = {}
+frame_limit = None  # 이 프레임 수에 도달하면 SDL_QUIT을 보내고 game_framework를 종료
+
+# 가상 시계
+dt = None
+_start_time = time.perf_counter()
+
+
+class Event:
+    """pico2d.Event와 같은 속성"""
+    def __init__(self, evt_type, key=None, button=None, x=None, y=None):
+        self.type = evt_type
+        self.key = key
+        self.button = button
+        self.x = x
+        self.y = y
+
+
+class Image:
+    """크기만 가진 이미지. 그리기 메서드는 호출 횟수만 센다"""
+    def __init__(self, w, h):
+        self.w = w
+        self.h = h
+
+    def _draw(self, *args, **kwargs):
+        global draw_calls
+        draw_calls += 1
+
+    draw = clip_draw = composite_draw = clip_composite_draw = _draw
+    draw_to_origin = clip_draw_to_origin = rotate_draw = draw_now = _draw
+
+    def clip_image(self, left, bottom, width, height):
+        return Image(width, height)
+
+    def opacify(self, o):
+        pass
+
+
+class Font:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def draw(self, x, y, str, color=(0, 0, 0)):
+        global draw_calls
+        draw_calls += 1
+
+
+def _image_size(name):
+    try:
+        from PIL import Image as PILImage
+        with PILImage.open(name) as pil:
+            return pil.size
+    except ImportError:
+        pass
+    # PIL이 없으면 PNG 헤더(IHDR)에서 직접 읽음
+    with open(name, 'rb') as f:
+        head = f.read(24)
+    if head[:8] != b'\x89PNG\r\n\x1a\n':
+        raise IOError
+    return struct.unpack('>II', head[16:24])
+
+
+def load_image(name):
+    global images_loaded
+    try:
+        w, h = _image_size(name)
+    except (OSError, ValueError, struct.error):
+        print('cannot load %s' % name)
+        raise IOError
+    images_loaded += 1
+    return Image(w, h)
+
+
+def load_font(name, size=20):
+    if not os.path.isfile(name):
+        print('cannot load %s' % name)
+        raise IOError
+    return Font(name, size)
+
+
+def open_canvas(w=1280, h=736, sync=False, full=False):
+    global canvas_width, canvas_height
+    canvas_width, canvas_height = w, h
+
+
+def close_canvas():
+    pass
+
+
+def get_canvas_width():
+    return canvas_width
+
+
+def get_canvas_height():
+    return canvas_height
+
+
+def clear_canvas():
+    pass
+
+
+def clear_canvas_now():
+    pass
+
+
+def update_canvas():
+    """한 프레임 끝: 프레임 번호를 올리고 frame_limit에 도달하면 종료 요청"""
+    global frame
+    frame += 1
+    if frame_limit is not None and frame >= frame_limit:
+        _script.setdefault(frame, []).append(Event(SDL_CONSTANTS['SDL_QUIT']))
+        # SDL_QUIT을 처리하지 않는 모드(배낭, 로고 등)에서도 멈추도록 직접 종료
+        game_framework = sys.modules.get('game_framework')
+        if game_framework is not None:
+            game_framework.quit()
+
+
+def draw_rectangle(lx, by, rx, ty, r=255, g=0, b=0, a=255, filled=False):
+    global draw_calls
+    draw_calls += 1
+
+
+def hide_cursor():
+    pass
+
+
+def show_cursor():
+    pass
+
+
+def hide_lattice():
+    pass
+
+
+def show_lattice():
+    pass
+
+
+def delay(sec):
+    pass
+
+
+def get_time():
+    if dt is not None:
+        return frame * dt
+    return time.perf_counter() - _start_time
+
+
+def get_events():
+    """현재 프레임까지 예약된 스크립트 입력을 돌려줌"""
+    events = []
+    for f in sorted(k for k in _script if k <= frame):
+        events.extend(_script.pop(f))
+    return events
+
+
+def push_event(evt_type, at_frame=None, **attrs):
+    """at_frame(기본: 다음 프레임)에 입력 이벤트 하나 예약"""
+    at = frame if at_frame is None else at_frame
+    _script.setdefault(at, []).append(Event(evt_type, **attrs))
+
+
+def press_key(key, at_frame=None, hold_frames=1):
+    """키를 at_frame에 누르고 hold_frames 뒤에 뗌"""
+    at = frame if at_frame is None else at_frame
+    push_event(SDL_CONSTANTS['SDL_KEYDOWN'], at, key=key)
+    push_event(SDL_CONSTANTS['SDL_KEYUP'], at + hold_frames, key=key)
+
+
+def clock():
+    """game_framework.clock 대체용 가상 시계"""
+    return get_time()
+
+
+def clear_events():
+    _script.clear()
+
+
+def reset(frames=None, step=None):
+    """프레임 번호/통계 초기화 (frames: 종료할 프레임 수, step: 가상 시계 간격). 예약된 입력은 유지"""
+    global frame, draw_calls, images_loaded, frame_limit, dt, _start_time
+    frame = 0
+    draw_calls = 0
+    images_loaded = 0
+    frame_limit = frames
+    dt = step
+    _start_time = time.perf_counter()
+
+
+def _fallback_sdl2():
+    module = types.ModuleType('sdl2')
+    module.__dict__.update(SDL_CONSTANTS)
+
+    def missing(name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        def unavailable(*args, **kwargs):
+            raise RuntimeError(f"headless 모드에서는 {name}을 사용할 수 없습니다.")
+        return unavailable
+    module.__getattr__ = missing
+    return module
+
+
+def install():
+    """sys.modules의 pico2d를 이 모듈로 교체 (게임 모듈 import 전에 호출)"""
+    global installed
+    if installed:
+        return
+    if 'pico2d' in sys.modules and sys.modules['pico2d'] is not sys.modules[__name__]:
+        print("경고: pico2d가 이미 import 되어 있습니다. headless.install()을 먼저 호출하세요.")
+
+    try:
+        import sdl2
+        constants = {name: getattr(sdl2, name) for name in dir(sdl2)
+                     if name.startswith(('SDL_', 'SDLK_')) and isinstance(getattr(sdl2, name), int)}
+    except Exception:
+        # SDL 라이브러리가 없는 CI 환경: 상수만 가진 sdl2 모듈로 대체
+        sys.modules['sdl2'] = _fallback_sdl2()
+        constants = SDL_CONSTANTS
+    # pico2d는 from sdl2 import * 를 하므로 from pico2d import * 로 상수를 쓰는 코드를 위해 같이 노출
+    globals().update(constants)
+
+    sys.modules['pico2d'] = sys.modules[__name__]
+    installed = True
+
+
+def run(mode, frames=600, step=1.0 / 60, fixed_timestep=None):
+    """mode를 frames 프레임 동안 제한 없는 속도로 실행 (step=None이면 실제 경과 시간 사용)"""
+    install()
+    import game_framework
+    import main_chracter
+
+    open_canvas(main_chracter.SCREEN_W, main_chracter.SCREEN_H)
+    reset(frames, step)
+    game_framework.target_fps = 0
+    game_framework.low_power_fps = 0
+    game_framework.clock = clock if step is not None else time.perf_counter
+    if fixed_timestep is not None:
+        game_framework.fixed_timestep = fixed_timestep
+
+    start = time.perf_counter()
+    game_framework.run(mode)
+    elapsed = time.perf_counter() - start
+    return frame, elapsed
+
+
+if __name__ == '__main__':
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description='창 없이 모드를 실행')
+    parser.add_argument('mode', nargs='?', default='dungeon_mode', help='시작 모드 모듈 이름')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--dt', type=float, default=1.0 / 60, help='가상 시계 간격 (0이면 실제 시간)')
+    args = parser.parse_args()
+
+    install()
+    start_mode = importlib.import_module(args.mode)
+    frames, elapsed = run(start_mode, args.frames, args.dt or None)
+    print(f"headless: {args.mode} {frames}프레임, {elapsed:.2f}초 ({frames / max(elapsed, 1e-9):.0f} FPS), "
+          f"그리기 호출 {draw_calls}회")
@@ -1,16 +1,21 @@
 from pico2d import *
+from resource_manager import load_image, load_font
 from sdl2 import SDL_KEYDOWN, SDLK_ESCAPE, SDLK_u
 import random
 
 import game_framework
 import game_world
+import profiler
 
 import main_chracter
 
 SCREEN_W, SCREEN_H = main_chracter.SCREEN_W, main_chracter.SCREEN_H
 
+low_power = True  # 배낭 화면은 정적이므로 game_framework가 낮은 FPS로 돌림
+
 backpack_image = None
 loot_images = []  # LOOT 폴더의 이미지들
+count_font = None  # 아이템 개수 텍스트 폰트 (배낭 배율에 맞는 크기로 init에서 한 번만 로드)
 
 # 배낭 데이터 (전역)
 inventory_items = {}
@@ -19,16 +24,24 @@ inventory_items = {}
 INVENTORY_SLOTS = 6  # 배낭 슬롯 개수
 SLOT_SIZE = 48  # 각 슬롯 크기 (픽셀)
 SLOT_SPACING = 8  # 슬롯 간격
+COUNT_FONT_PATH = 'UI/use_font/MaruBuri-Bold.ttf'
 
 
 def init():
-    global backpack_image, loot_images, inventory_items
+    global backpack_image, loot_images, inventory_items, count_font
     try:
         backpack_image = load_image('UI/backpack_in.png')
     except Exception as e:
         print(f"배낭 이미지 로드 오류: {e}")
         backpack_image = None
 
+    count_font = None
+    if backpack_image:
+        try:
+            count_font = load_font(COUNT_FONT_PATH, int(18 * backpack_scale()))
+        except Exception as e:
+            print(f"배낭 폰트 로드 오류: {e}")
+
     # LOOT 폴더의 이미지들 로드
     loot_images = []
     for i in range(1, 5):
@@ -43,10 +56,11 @@ def init():
 
 
 def finish():
-    global backpack_image, loot_images, inventory_items
+    global backpack_image, loot_images, inventory_items, count_font
     if backpack_image:
         del backpack_image
     loot_images = []
+    count_font = None
     inventory_items = {}
 
 
@@ -75,6 +89,13 @@ def get_inventory_items():
     return inventory_items.copy()
 
 
+def backpack_scale():
+    # 배낭 이미지를 화면의 90% 안에 맞추는 배율
+    scale_w = (SCREEN_W * 0.9) / backpack_image.w
+    scale_h = (SCREEN_H * 0.9) / backpack_image.h
+    return min(scale_w, scale_h)
+
+
 def draw():
     clear_canvas()
     game_world.render()
@@ -89,9 +110,7 @@ def draw():
         img_h = backpack_image.h
 
         # 스케일 계산
-        scale_w = (SCREEN_W * 0.9) / img_w
-        scale_h = (SCREEN_H * 0.9) / img_h
-        scale = min(scale_w, scale_h)
+        scale = backpack_scale()
 
         draw_w = int(img_w * scale)
         draw_h = int(img_h * scale)
@@ -134,10 +153,9 @@ def draw():
                         print(f"✗ LOOT 이미지 그리기 오류: {e}")
 
                     # 개수 텍스트 (우측 하단)
-                    if quantity > 0:
+                    if quantity > 0 and count_font:
                         try:
-                            font = load_font(None, int(18 * scale))
-                            font.draw(
+                            count_font.draw(
                                 int(icon_x + icon_size // 2 - 15),
                                 int(icon_y - icon_size // 2 + 8),
                                 str(quantity),
@@ -153,6 +171,7 @@ def draw():
         else:
             print(f"[배낭] LOOT 이미지 로드 실패")
 
+    profiler.draw_overlay()
     update_canvas()
 
 
@@ -1,9 +1,11 @@
 from pico2d import *
+from resource_manager import load_image
 import game_framework
 import title_mode  # 다음 모드인 title_mode를 임포트합니다.
 import main_chracter
 
 image = None
+low_power = True  # 정적인 화면이므로 game_framework가 낮은 FPS로 돌림
 logo_start_time = 0.0
 
 
@@ -1,8 +1,14 @@
-from pico2d import load_image, draw_rectangle
+import render_queue
+from render_queue import draw_rectangle
+from resource_manager import load_image
+import functools
 import math
 import random
 
 class Loot:
+    world_kind = 'loot'  # game_world 종류 인덱스 (game_world.objects_of('loot'))
+    queued_draw = True  # draw()가 render_queue로 그리기 명령을 기록함 (game_world.render 참고)
+
     # LOOT 이미지 경로 (4개 이미지 중 랜덤)
     LOOT_IMAGES = [
         'LOOT/loot1.png',
@@ -61,13 +67,18 @@ class Loot:
                 return True
         return False  # 아직 제거되지 않음
 
+    @functools.cached_property
+    def depth_offset(self):
+        # 그리기 순서(game_world.sort_depth)용 y -> 발 위치 (draw와 같은 0.8 배율의 아래쪽)
+        return -self.sprite_h * 0.4
+
     def draw(self):
         if self.image:
 
             scale = 0.8
             draw_w = int(self.sprite_w * scale)
             draw_h = int(self.sprite_h * scale)
-            self.image.draw(self.x, self.y, draw_w, draw_h)
+            render_queue.draw(self.image, self.x, self.y, draw_w, draw_h)
 
 
     def check_collection(self, player_x, player_y):
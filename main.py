@@ -1,12 +1,22 @@
 from pico2d import *
 import game_framework
+import profiler
 #import play_mode
 import shop_mode as start_mode
 
 # 스크린 크기는 main_chracter 모듈에서 가져옴
 import main_chracter
 
-open_canvas(main_chracter.SCREEN_W, main_chracter.SCREEN_H,sync=True)
+# 프레임 구간 측정: enabled=True면 종료 시 profile_log.csv/json 저장, show_overlay=True면 화면에 p50/p95/p99 표시
+profiler.enabled = False
+profiler.show_overlay = False
+
+# vsync: True면 화면 주사율에 맞춰 기다림. vsync를 못 쓰는 환경에서는 False로 두고 game_framework의 프레임 제한을 씀
+VSYNC = True
+if not VSYNC:
+    game_framework.target_fps = 60
+
+open_canvas(main_chracter.SCREEN_W, main_chracter.SCREEN_H,sync=VSYNC)
 # game_framework를 실행하고 시작 모드를 지정
 game_framework.run(start_mode)
 close_canvas()
\ No newline at end of file
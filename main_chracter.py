@@ -1,5 +1,9 @@
 import time
-from pico2d import load_image, draw_rectangle
+from pico2d import load_image
+import collision_mask
+import game_framework
+import render_queue
+from render_queue import draw_rectangle
 from sdl2 import SDLK_a, SDL_KEYDOWN, SDL_KEYUP, SDLK_UP, SDLK_DOWN, SDLK_LEFT, SDLK_RIGHT, SDLK_SPACE, SDLK_x
 
 from state_machine import StateMachine
@@ -18,6 +22,9 @@ from character_constants import (
 # Idle, Walk, Roll, Attack 클래스 정의 모두 삭제하고 player_states 모듈로 이동
 
 class Main_character:
+    world_kind = 'player'  # game_world 종류 인덱스 (game_world.objects_of('player'))
+    queued_draw = True  # draw()가 render_queue로 그리기 명령을 기록함 (game_world.render 참고)
+
     def __init__(self):
         # 1. 컴포넌트(로더) 생성
         self.loader = player_loader.PlayerLoader()
@@ -26,6 +33,7 @@ class Main_character:
         # 2. 위치/상태
         self.x = SCREEN_W // 2
         self.y = SCREEN_H // 2
+        self.prev_x, self.prev_y = self.x, self.y  # 직전 고정 간격 update의 위치 (draw 보간용)
         self.dir = 'DOWN'  # 기본 캐릭터는 DOWN
         self.frame = 0
 
@@ -118,6 +126,34 @@ class Main_character:
             }
         )
 
+    def reset_on_mode_enter(self):
+        """모드 진입 시 위치와 입력 같은 일시 상태만 초기화 (체력, 돈, 공격력, 변신 여부는 유지)"""
+        self.x = SCREEN_W // 2
+        self.y = SCREEN_H // 2
+        self.prev_x, self.prev_y = self.x, self.y
+        self.frame = 0
+        self.key_map = {'UP': False, 'DOWN': False, 'LEFT': False, 'RIGHT': False}
+        self.frame_time_acc = 0.0
+        self.roll_moved = 0.0
+        self.next_attack_request = False
+        self.attack_hit_pending = False
+        self.transform_hurt_animation_playing = False
+
+        # 진행 중이던 구르기/공격 상태는 끝내고 현재 캐릭터의 IDLE 상태로 시작
+        idle = self.TRANSFORM_IDLE if self.is_transformed else self.IDLE
+        self.state_machine.cur_state.exit(None)
+        self.state_machine.cur_state = idle
+        idle.enter(None)
+
+    @property
+    def draw_x(self):
+        # 그릴 위치: 고정 간격 update 사이에서는 직전 위치와 현재 위치를 보간 (game_framework.alpha)
+        return game_framework.lerp(self.prev_x, self.x)
+
+    @property
+    def draw_y(self):
+        return game_framework.lerp(self.prev_y, self.y)
+
     def toggle_transform(self):
        # 변신 상태 토글
         if self.is_transformed:
@@ -205,33 +241,35 @@ class Main_character:
             img_height = image.h
 
             # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-            draw_y = self.y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
+            x, y = self.draw_x, self.draw_y
+            draw_y = y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
 
             # 왼쪽 방향이면 이미지 좌우 반전
             if self.dir == 'LEFT':
-                image.clip_composite_draw(
+                render_queue.clip_composite_draw(image,
                     x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                    0, 'h', self.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                    0, 'h', x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
                 )
             else:  # RIGHT
-                image.clip_draw(
+                render_queue.clip_draw(image,
                     x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                    self.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                    x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
                 )
 
             # 디버그: 실제 충돌 범위 표시 (변신 캐릭터)
             draw_rectangle(
-                self.x - TRANSFORM_COLLISION_W // 2,
-                self.y - TRANSFORM_COLLISION_H // 2,
-                self.x + TRANSFORM_COLLISION_W // 2,
-                self.y + TRANSFORM_COLLISION_H // 2
+                x - TRANSFORM_COLLISION_W // 2,
+                y - TRANSFORM_COLLISION_H // 2,
+                x + TRANSFORM_COLLISION_W // 2,
+                y + TRANSFORM_COLLISION_H // 2
             )
             # 발 위치 표시 (노란색 작은 점)
-            draw_rectangle(self.x - 2, self.y - 2, self.x + 2, self.y + 2)
+            draw_rectangle(x - 2, y - 2, x + 2, y + 2)
             return
 
         try:
             self.state_machine.draw()
+            x, y = self.draw_x, self.draw_y
 
             # 공격 범위 표시 (빨간 박스)
             if self.show_attack_bb:
@@ -245,22 +283,22 @@ class Main_character:
             if self.is_transformed:
                 # 변신 상태일 때는 변신 캐릭터 충돌 범위
                 draw_rectangle(
-                    self.x - TRANSFORM_COLLISION_W // 2,
-                    self.y - TRANSFORM_COLLISION_H // 2,
-                    self.x + TRANSFORM_COLLISION_W // 2,
-                    self.y + TRANSFORM_COLLISION_H // 2
+                    x - TRANSFORM_COLLISION_W // 2,
+                    y - TRANSFORM_COLLISION_H // 2,
+                    x + TRANSFORM_COLLISION_W // 2,
+                    y + TRANSFORM_COLLISION_H // 2
                 )
             else:
                 # 기본 상태일 때는 기본 캐릭터 충돌 범위
                 draw_rectangle(
-                    self.x - CHARACTER_COLLISION_W // 2,
-                    self.y - CHARACTER_COLLISION_H // 2,
-                    self.x + CHARACTER_COLLISION_W // 2,
-                    self.y + CHARACTER_COLLISION_H // 2
+                    x - CHARACTER_COLLISION_W // 2,
+                    y - CHARACTER_COLLISION_H // 2,
+                    x + CHARACTER_COLLISION_W // 2,
+                    y + CHARACTER_COLLISION_H // 2
                 )
 
             # 발 위치 표시 (노란색 작은 점)
-            draw_rectangle(self.x - 2, self.y - 2, self.x + 2, self.y + 2)
+            draw_rectangle(x - 2, y - 2, x + 2, y + 2)
         except Exception:
             pass
 
@@ -324,6 +362,19 @@ class Main_character:
             elif key == SDLK_RIGHT:
                 self.key_map['RIGHT'] = False
 
+    def get_attack_mask(self):
+        # 기본 캐릭터 공격: 지금 그려지는 공격 프레임의 픽셀 마스크 (get_bb 범위 안에서만 판정, combat_system)
+        # 변신 캐릭터는 마스크 없이 get_bb 사각형 그대로
+        if self.is_transformed or self.state_machine.cur_state is not self.ATTACK:
+            return None
+        attack = self.ATTACK
+        frames = self.loader.attack_frames[attack.stage][self.dir]
+        left = (int(attack.frame) % frames) * SPRITE_W
+        bottom = self.loader.attack_y_offsets[attack.stage][self.dir]
+        mask = collision_mask.frame_mask(self.loader.attack_paths[attack.stage][self.dir], left, bottom, SPRITE_W, SPRITE_H)
+        # Attack.draw와 같은 위치 (발 기준)
+        return collision_mask.place(mask, self.x, self.y + (SPRITE_H // 2) - player_loader.FOOT_OFFSET_Y)
+
     # 캐릭터의 공격범위 만들기
     def get_bb(self):
 
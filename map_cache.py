@@ -0,0 +1,162 @@
+# map_cache.py
+# Tiled JSON 맵을 바이너리로 컴파일해서 JSON 옆에 저장해 두고, 다음 로드부터는 mmap으로 바로 읽는다
+#
+# 파일 구조 (리틀 엔디언):
+#   헤더   : 매직, 버전, JSON mtime_ns, JSON 크기, JSON sha1, 메타데이터 길이
+#   메타   : 레이어 배열을 뺀 맵 속성 전부와 레이어 목록 (JSON 텍스트)
+#   데이터 : 타일 레이어 = uint16/uint32 배열, 오브젝트 = float64 (x, y, width, height) 배열
+# 오브젝트의 나머지 속성(id, name, type, properties 등)과 다른 종류의 레이어(imagelayer, group 등)는 메타에 그대로 들어간다.
+# JSON의 mtime/크기가 달라지면 sha1로 한 번 더 비교하고, 내용이 바뀌었으면 다시 컴파일한다.
+# 캐시는 읽기 전용으로 열기 때문에 읽기 전용 설치본에서도 쓸 수 있다 (헤더 갱신/재컴파일은 가능할 때만).
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+CACHE_EXT = '.tmc'
+MAGIC = b'TMC1'
+VERSION = 2
+HEADER = struct.Struct('<4sHHqq20sI')
+ALIGN = 8
+
+# 배열로 따로 저장하는 오브젝트 속성 (나머지 속성은 메타의 object_fields에 보관)
+OBJECT_GEOMETRY = ('x', 'y', 'width', 'height')
+
+
+def cache_path_for(json_path):
+    return os.path.splitext(json_path)[0] + CACHE_EXT
+
+
+def load_map(json_path):
+    """json.load와 같은 형태의 맵 dict 반환 (tilelayer의 data는 list 대신 array, 오브젝트 좌표/크기는 float)"""
+    cache_path = cache_path_for(json_path)
+    stat = os.stat(json_path)
+
+    data = _read_cache(cache_path, json_path, stat)
+    if data is not None:
+        return data
+
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    map_data = json.loads(raw)
+    try:
+        _write_cache(cache_path, map_data, stat, hashlib.sha1(raw).digest())
+    except OSError as e:
+        print(f"맵 캐시를 저장할 수 없습니다 ({cache_path}): {e}")
+    return map_data
+
+
+def _read_cache(cache_path, json_path, stat):
+    try:
+        f = open(cache_path, 'rb')
+    except OSError:
+        return None
+
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        with mm:
+            if len(mm) < HEADER.size:
+                return None
+            magic, version, _, mtime_ns, size, digest, meta_len = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION:
+                return None
+
+            if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                # 체크아웃 등으로 시간만 바뀐 경우: 내용 해시가 같으면 캐시를 그대로 사용
+                with open(json_path, 'rb') as jf:
+                    if hashlib.sha1(jf.read()).digest() != digest:
+                        return None
+                _refresh_header(cache_path, stat, digest, meta_len)
+
+            meta = json.loads(bytes(mm[HEADER.size:HEADER.size + meta_len]).decode('utf-8'))
+            for layer in meta['layers']:
+                if 'typecode' in layer:
+                    layer['data'] = _read_array(mm, layer.pop('typecode'), layer.pop('offset'), layer.pop('count'))
+                elif 'object_fields' in layer:
+                    values = _read_array(mm, 'd', layer.pop('offset'), layer.pop('count') * 4)
+                    fields = layer.pop('object_fields')
+                    layer['objects'] = [
+                        dict(fields[i // 4], x=values[i], y=values[i + 1], width=values[i + 2], height=values[i + 3])
+                        for i in range(0, len(values), 4)
+                    ]
+            return meta
+
+
+def _refresh_header(cache_path, stat, digest, meta_len):
+    """JSON mtime/크기가 바뀌었지만 내용은 같을 때 헤더만 새로 씀 (다음 로드에서 해시 비교 생략). 쓸 수 없으면 그냥 둠"""
+    try:
+        with open(cache_path, 'r+b') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, stat.st_mtime_ns, stat.st_size, digest, meta_len))
+    except OSError:
+        pass
+
+
+def _read_array(mm, typecode, offset, count):
+    values = array(typecode)
+    values.frombytes(mm[offset:offset + count * values.itemsize])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _write_cache(cache_path, map_data, stat, digest):
+    meta = {key: value for key, value in map_data.items() if key != 'layers'}
+    meta['layers'] = []
+
+    # 데이터 블록은 메타 길이가 정해진 뒤에야 위치가 확정되므로 먼저 배열만 만들어 둔다
+    blocks = []
+    for layer in map_data['layers']:
+        tiles = layer.get('data')
+        if layer['type'] == 'tilelayer' and isinstance(tiles, list):
+            entry = {key: value for key, value in layer.items() if key != 'data'}
+            typecode = 'H' if max(tiles, default=0) <= 0xFFFF else 'I'
+            values = array(typecode, tiles)
+            entry['typecode'] = typecode
+            entry['count'] = len(values)
+        elif layer['type'] == 'objectgroup':
+            entry = {key: value for key, value in layer.items() if key != 'objects'}
+            values = array('d')
+            entry['object_fields'] = []
+            for obj in layer.get('objects', []):
+                values.extend(obj.get(key, 0) for key in OBJECT_GEOMETRY)
+                entry['object_fields'].append({key: value for key, value in obj.items() if key not in OBJECT_GEOMETRY})
+            entry['count'] = len(values) // 4
+        else:
+            # 다른 레이어(imagelayer, group, base64/청크 타일 레이어 등)는 메타에 그대로 저장
+            meta['layers'].append(layer)
+            continue
+        if sys.byteorder != 'little':
+            values.byteswap()
+        meta['layers'].append(entry)
+        blocks.append((entry, values))
+
+    # 메타 안의 offset 숫자 길이가 바뀌어도 안전하도록 길이가 안정될 때까지 반복
+    meta_len = 0
+    while True:
+        offset = _align(HEADER.size + meta_len)
+        for entry, values in blocks:
+            entry['offset'] = offset
+            offset = _align(offset + len(values) * values.itemsize)
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        if len(meta_bytes) == meta_len:
+            break
+        meta_len = len(meta_bytes)
+
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, stat.st_mtime_ns, stat.st_size, digest, meta_len))
+        f.write(meta_bytes)
+        for entry, values in blocks:
+            f.write(b'\0' * (entry['offset'] - f.tell()))
+            values.tofile(f)
+    os.replace(tmp_path, cache_path)
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
@@ -0,0 +1,342 @@
+# monster_system.py
+# 몬스터 일괄 시뮬레이션 (NumPy struct-of-arrays)
+# 위치, 방향, 속도, 순찰 범위, 시야/공격 범위, 공격 쿨타임, 애니메이션 상태/프레임/누적 시간은 이 모듈의 배열 한 칸(slot)에만 있다.
+# Monster는 만들어질 때 slot을 받고, x/y/dir/speed/alive와 Animator의 state/frame/acc는 그 slot을 바로 읽고 쓰는 프로퍼티다 (객체에는 복사본이 없음).
+# 추적/순찰 이동, 범위 판정, 프레임 진행 규칙은 이 모듈에만 있고, 몬스터 수와 상관없이 배열 연산 몇 번으로 처리한다.
+# 배열 연산은 넘겨받은 slot 번호 배열 위에서만 하므로 비용은 진행하는 몬스터 수에 비례한다 (Animator.update의 한 마리 진행은 스칼라 경로).
+# 상태가 바뀌는 몬스터(공격 발동, 애니메이션 끝 등)와 공격 판정만 파이썬에서 하나씩 처리한다.
+# 길찾기 격자(pathfinding.nav)가 있으면 추적 중인 몬스터는 웨이포인트를 얻기 위해 한 마리씩 파이썬 루프를 돈다 (SimpleAI.chase_target).
+# Monster 객체가 사라지면(참조가 모두 없어지면) slot은 반납되어 다음에 만들어지는 몬스터가 다시 쓴다.
+# 공격 쿨타임은 벽시계가 아니라 update()에 넘긴 dt를 더한 시뮬레이션 시각(now)으로 잰다 (headless/고정 간격 실행에서도 같은 결과).
+#   monster_system.update(game_world.objects_of('monster'), dt, player)
+import math
+import operator
+import weakref
+
+import numpy as np
+
+import pathfinding
+
+# 상태 이름 <-> 코드 (처음 보는 상태는 뒤에 추가)
+STATE_CODES = {'idle': 0, 'attack': 1, 'death': 2, 'damaged': 3}
+STATE_NAMES = ['idle', 'attack', 'death', 'damaged']
+IDLE, ATTACK, DEATH, DAMAGED = 0, 1, 2, 3
+
+MIN_CAPACITY = 64  # 처음 만드는 배열 길이 (모자라면 두 배씩 늘림)
+
+_FLOAT_FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'speed', 'dir', 'patrol_origin', 'patrol_width', 'sight2', 'attack2',
+                 'cooldown', 'last_attack', 'acc', 'frame_time')
+_INT_FIELDS = ('state', 'frame', 'frames')
+# individual: update를 재정의한 몬스터 (배열로 처리할 수 없어서 그 update를 호출)
+# post_update: post_update를 재정의한 몬스터 (상태 연쇄 전환 등)
+# loaded: ai/combat 설정(순찰 범위, 시야, 쿨타임 등)을 배열로 옮겼는지 (처음 진행할 때 한 번)
+_BOOL_FIELDS = ('alive', 'death_done', 'individual', 'post_update', 'loaded')
+
+_a = {}  # 배열 이름 -> ndarray (길이 = _capacity)
+_capacity = 0
+_owners = []  # slot -> 그 slot을 쓰는 Monster의 weakref (비어 있으면 None)
+_free = []  # 비어 있는 slot (pop하면 가장 작은 번호부터)
+_slot_getter = operator.attrgetter('slot')
+now = 0.0  # 시뮬레이션 시각 (update()에 넘긴 dt의 합, 공격 쿨타임 기준)
+
+
+def state_code(state):
+    code = STATE_CODES.get(state)
+    if code is None:
+        code = STATE_CODES[state] = len(STATE_NAMES)
+        STATE_NAMES.append(state)
+    return code
+
+
+def field(name, cast=float, slot_attr='slot'):
+    """배열 name의 slot 칸을 읽고 쓰는 프로퍼티 (Monster.x 등)
+    객체의 slot_attr가 None인 동안(몬스터에 붙기 전의 Animator)은 객체의 '_' + name 속성에 둠"""
+    private = '_' + name
+
+    def get(self):
+        slot = getattr(self, slot_attr)
+        if slot is None:
+            return getattr(self, private)
+        return cast(_a[name][slot])
+
+    def set(self, value):
+        slot = getattr(self, slot_attr)
+        if slot is None:
+            setattr(self, private, value)
+        else:
+            _a[name][slot] = value
+
+    return property(get, set)
+
+
+def allocate(monster):
+    """Monster.__init__에서 호출: 비어 있는 slot을 하나 주고, 객체가 사라지면 반납되게 함"""
+    import Monster as monster_module
+    base = monster_module.Monster
+    if not _free:
+        _grow()
+    slot = _free.pop()
+    _owners[slot] = weakref.ref(monster)
+    weakref.finalize(monster, _release, slot)
+    for name in _FLOAT_FIELDS + _INT_FIELDS + _BOOL_FIELDS:
+        _a[name][slot] = 0
+    _a['frame_time'][slot] = 0.1
+    _a['frames'][slot] = 1
+    _a['individual'][slot] = type(monster).update is not base.update
+    _a['post_update'][slot] = type(monster).post_update is not base.post_update
+    return slot
+
+
+def _grow():
+    global _capacity
+    capacity = max(MIN_CAPACITY, _capacity * 2)
+    for names, dtype in ((_FLOAT_FIELDS, np.float64), (_INT_FIELDS, np.int64), (_BOOL_FIELDS, bool)):
+        for name in names:
+            column = np.zeros(capacity, dtype=dtype)
+            if _capacity:
+                column[:_capacity] = _a[name]
+            _a[name] = column
+    _owners.extend([None] * (capacity - _capacity))
+    _free.extend(range(capacity - 1, _capacity - 1, -1))  # 비었을 때만 늘리므로 새 slot만 들어감
+    _capacity = capacity
+
+
+def _release(slot):
+    _owners[slot] = None
+    _free.append(slot)
+
+
+def bind(slot, animator):
+    """animator의 상태를 slot 배열로 옮기고, 이후로는 배열을 직접 읽고 쓰게 함 (Monster.animator 설정 시)"""
+    state, frame, acc, death_done = animator.state, animator.frame, animator.acc, animator.death_done
+    animator.batch_slot = slot
+    animator.state = state
+    animator.frame = frame
+    animator.acc = acc
+    animator.death_done = death_done
+
+
+def unbind(animator):
+    """bind의 반대: 배열의 값을 animator 객체로 다시 옮김 (몬스터의 animator를 바꿀 때 이전 것)"""
+    state, frame, acc, death_done = animator.state, animator.frame, animator.acc, animator.death_done
+    animator.batch_slot = None
+    animator.state = state
+    animator.frame = frame
+    animator.acc = acc
+    animator.death_done = death_done
+
+
+def state_name(slot):
+    return STATE_NAMES[_a['state'][slot]]
+
+
+def set_state(slot, state, frames, frame_time):
+    """slot의 애니메이션 상태 코드와 그 상태의 프레임 수/프레임 시간"""
+    _a['state'][slot] = state_code(state)
+    _a['frames'][slot] = frames
+    _a['frame_time'][slot] = frame_time
+
+
+def save_previous():
+    """모든 slot의 현재 위치를 prev_x/prev_y로 (game_framework가 고정 간격 update 직전에 호출, draw 보간용)"""
+    if _capacity:
+        np.copyto(_a['prev_x'], _a['x'])
+        np.copyto(_a['prev_y'], _a['y'])
+
+
+def update(monsters, dt, player=None, frozen=False):
+    """monsters(Monster 리스트)를 한 프레임 진행"""
+    global now
+    now += dt
+    if not monsters:
+        return
+    slots = np.fromiter(map(_slot_getter, monsters), dtype=np.intp, count=len(monsters))
+    individual = _a['individual'][slots]
+    if individual.any():
+        for slot in slots[individual].tolist():
+            _owners[slot]().update(dt, frozen=frozen, player=player)
+        slots = slots[~individual]
+    step(slots, dt, player, frozen)
+
+
+def step(slots, dt, player=None, frozen=False):
+    """slot 번호 배열(또는 리스트)의 몬스터를 한 프레임 진행 (Monster.update는 자기 slot 하나로 호출)
+    배열 연산은 slots 길이에 비례 (전체 배열 길이와 무관)"""
+    if not len(slots):
+        return
+    slots = np.unique(np.asarray(slots, dtype=np.intp))  # slot 순서로 처리 (공격/상태 전환 순서가 목록 순서와 무관하도록)
+    fresh = slots[~_a['loaded'][slots]]
+    if len(fresh):
+        _load(fresh.tolist())
+    _step(slots, dt, player, frozen)
+
+
+def _load(slots):
+    """ai/combat 설정을 배열로 (하위 클래스가 __init__에서 ai/combat을 정한 뒤 처음 진행할 때 한 번)"""
+    a = _a
+    for slot in slots:
+        monster = _owners[slot]()
+        ai = monster.ai
+        combat = monster.combat
+        a['patrol_origin'][slot] = getattr(ai, 'patrol_origin_x', 0.0)
+        a['patrol_width'][slot] = getattr(ai, 'patrol_width', 0.0)
+        a['sight2'][slot] = getattr(ai, 'sight_range', 0.0) ** 2
+        a['attack2'][slot] = combat.attack_range ** 2
+        a['cooldown'][slot] = combat.cooldown
+        a['last_attack'][slot] = combat.last_attack_time
+        a['loaded'][slot] = True
+
+
+def _step(slots, dt, player, frozen):
+    a = _a
+    x, y, direction = a['x'], a['y'], a['dir']
+    state = a['state']
+
+    alive = a['alive'][slots]
+    # frozen이면 살아 있는 몬스터는 아무것도 하지 않음 (death 애니메이션만 진행)
+    active = slots[~alive] if frozen else slots
+    thinking = slots[alive & (state[slots] != ATTACK)] if not frozen else slots[:0]
+
+    chased = np.zeros(len(thinking), dtype=bool)  # thinking 기준
+    if player is not None and len(thinking):
+        dx = player.x - x[thinking]
+        dy = player.y - y[thinking]
+        dist2 = dx * dx + dy * dy
+        in_attack = dist2 <= a['attack2'][thinking]
+        in_sight = ~in_attack & (dist2 <= a['sight2'][thinking])
+
+        # 공격 범위 안: 쿨타임이 끝났으면 공격 시작 (상태 전환은 드물어서 하나씩 처리)
+        fire = np.flatnonzero(in_attack)
+        if len(fire):
+            fire = fire[now - a['last_attack'][thinking[fire]] >= a['cooldown'][thinking[fire]]]
+            for slot, slot_dx in zip(thinking[fire].tolist(), dx[fire].tolist()):
+                monster = _owners[slot]()
+                combat = monster.combat
+                combat.last_attack_time = now
+                combat.attack_target = player
+                combat.hit_done = False
+                a['last_attack'][slot] = now
+                monster.animator.set_state('attack')
+                direction[slot] = 1.0 if slot_dx >= 0 else -1.0
+            chased[fire] = True
+
+        # 시야 안: 플레이어 쪽으로 이동
+        if in_sight.any():
+            seen = thinking[in_sight]
+            dx = dx[in_sight]
+            dy = dy[in_sight]
+            if pathfinding.nav is not None:
+                # 길찾기 웨이포인트 쪽으로 (추적 중인 몬스터만 하나씩, SimpleAI.chase_target)
+                goal = pathfinding.nav.cell_of(player.x, player.y)
+                chasers = [_owners[slot]() for slot in seen.tolist()]
+                targets = np.array([monster.ai.chase_target(monster, player, goal) for monster in chasers],
+                                   dtype=np.float64).reshape(-1, 2)
+                dx = targets[:, 0] - x[seen]
+                dy = targets[:, 1] - y[seen]
+            dist = np.sqrt(dx * dx + dy * dy)
+            dist[dist == 0] = 1.0
+            speed = a['speed'][seen]
+            vx = dx / dist * speed
+            vy = dy / dist * speed
+            x[seen] += vx * dt
+            y[seen] += vy * dt
+            direction[seen] = np.where(vx >= 0, 1.0, -1.0)
+            chased |= in_sight
+            for slot in seen[state[seen] != IDLE].tolist():
+                _owners[slot]().animator.set_state('idle')
+
+    # 추적하지 않는 몬스터는 순찰 범위 안에서 좌우 이동
+    patrol = thinking[~chased]
+    patrol = patrol[(a['patrol_width'][patrol] > 0) & (a['speed'][patrol] != 0)]
+    if len(patrol):
+        px = x[patrol] + a['speed'][patrol] * direction[patrol] * dt
+        pdir = direction[patrol]
+        half = a['patrol_width'][patrol] / 2
+        left = a['patrol_origin'][patrol] - half
+        right = a['patrol_origin'][patrol] + half
+        below = px < left
+        above = px > right
+        px[below] = left[below]
+        pdir[below] = 1.0
+        px[above] = right[above]
+        pdir[above] = -1.0
+        x[patrol] = px
+        direction[patrol] = pdir
+
+    _advance_frames(dt, active)
+
+    # 공격 판정: 공격 중인 몬스터만 (이번 프레임 직전/현재 프레임 사이에 hit_frame이 있으면)
+    for slot in active[state[active] == ATTACK].tolist():
+        monster = _owners[slot]()
+        new = int(a['frame'][slot])
+        monster.combat.apply_hit_if_needed(max(0, new - 1), new, monster)
+
+    for slot in slots[a['post_update'][slots]].tolist():
+        _owners[slot]().post_update()
+
+
+def advance(slot, dt):
+    """slot 하나의 애니메이션만 진행 (Animator.update). _advance_frames와 같은 규칙을 배열 없이 스칼라로"""
+    a = _a
+    if a['death_done'][slot]:
+        return
+    acc = float(a['acc'][slot]) + dt
+    frame_time = float(a['frame_time'][slot])
+    steps = math.floor(acc / frame_time)
+    if steps <= 0:
+        a['acc'][slot] = acc
+        return
+    state, frame, frames = int(a['state'][slot]), int(a['frame'][slot]), int(a['frames'][slot])
+    ending = state in (ATTACK, DAMAGED, DEATH) and frame + steps >= frames
+    used = frames - frame if ending else steps
+    a['acc'][slot] = acc - used * frame_time
+    frame += used
+    a['frame'][slot] = frame if ending else frame % max(frames, 1)
+    if ending:
+        _finish(slot)
+
+
+def _advance_frames(dt, slots):
+    """누적 시간만큼 프레임 진행, 한 번 재생 상태(attack/damaged)는 끝나면 idle, death는 마지막 프레임에서 멈춤"""
+    a = _a
+    state, frame, frames = a['state'], a['frame'], a['frames']
+    acc, frame_time = a['acc'], a['frame_time']
+
+    running = slots[~a['death_done'][slots]]
+    if not len(running):
+        return
+    acc[running] += dt
+    steps = np.floor(acc[running] / frame_time[running]).astype(np.int64)
+    moving = steps > 0
+    if not moving.any():
+        return
+    running = running[moving]
+    steps = steps[moving]
+
+    current, count = frame[running], frames[running]
+    run_state = state[running]
+    one_shot = (run_state == ATTACK) | (run_state == DAMAGED)
+    ending = (one_shot | (run_state == DEATH)) & (current + steps >= count)
+    # 끝나는 상태는 마지막 프레임까지 필요한 만큼만 시간을 씀
+    used = np.where(ending, count - current, steps)
+    acc[running] -= used * frame_time[running]
+    current = current + used
+    looping = ~ending
+    current[looping] %= np.maximum(count[looping], 1)
+    frame[running] = current
+
+    for slot in running[ending].tolist():
+        _finish(slot)
+
+
+def _finish(slot):
+    """한 번 재생 상태가 끝난 slot: death는 마지막 프레임에서 멈추고, attack/damaged는 idle로 (남은 누적 시간은 유지)"""
+    a = _a
+    if a['state'][slot] == DEATH:
+        a['frame'][slot] = a['frames'][slot] - 1
+        a['death_done'][slot] = True
+    else:
+        animator = _owners[slot]().animator
+        a['frame'][slot] = 0
+        set_state(slot, 'idle', int(animator.frames_map.get('idle', 1)),
+                  float(animator.frame_time_map.get('idle', 0.1)))
@@ -0,0 +1,273 @@
+# pathfinding.py
+# 몬스터 추적용 길찾기
+# 맵의 Collisions 박스로 만든 내비게이션 격자(NavGrid) 위에서 A*(이진 힙, 8방향, 벽 모서리 가로지르기 금지)로 경로를 찾고,
+# 시야가 뚫린 칸은 건너뛰도록 줄인 웨이포인트 리스트를 (시작 칸, 목표 칸)별로 캐시한다.
+# 캐시에 없는 경로는 요청 큐에 넣고 process()가 프레임마다 REQUESTS_PER_FRAME개까지만 계산한다 (추적 몬스터가 많아도 한 프레임에 몰리지 않도록).
+# 플레이어가 움직이면 예전 목표 칸 요청은 쓸모가 없어지므로 최근 요청부터 계산하고, 오래된 요청은 MAX_PENDING을 넘으면 버린다.
+# 경로가 나오기 전까지 몬스터는 기존처럼 플레이어에게 직선으로 다가간다 (SimpleAI.chase_target).
+#   pathfinding.set_nav(tiled_map.build_nav_grid(collision_boxes))   # 맵 로드 시
+#   pathfinding.process()                                              # 프레임마다 몬스터 업데이트 전에
+#   waypoints = pathfinding.get_path(start_cell, goal_cell)            # 캐시에 있으면 리스트, 없으면 None (요청만 등록)
+import heapq
+import math
+import time
+from collections import OrderedDict, deque
+
+NAV_CELL_SIZE = 20  # 내비게이션 격자 한 칸 (화면 픽셀)
+CLEARANCE = 12  # 벽에서 이만큼 떨어진 칸만 지나감 (몬스터 몸통 여유)
+REQUESTS_PER_FRAME = 4  # 한 프레임에 새로 계산하는 최대 경로 수
+BUDGET_MS = 2.0  # 한 프레임에 길찾기에 쓰는 시간 (넘으면 남은 요청은 다음 프레임으로)
+MAX_EXPANSIONS = 4000  # 경로 하나에 펼치는 최대 노드 수 (막힌 목표에서 격자 전체를 뒤지지 않도록)
+CACHE_SIZE = 512  # 캐시할 경로 수 (오래 안 쓴 것부터 버림)
+MAX_PENDING = 64  # 대기 요청 수 상한
+RETRY_FRAMES = 8  # 캐시에 없어서 요청한 몬스터가 다시 물어보기까지 기다리는 프레임 수 (그동안은 직선 추적)
+
+SQRT2 = math.sqrt(2.0)
+# (dx, dy, 비용)
+NEIGHBORS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+nav = None  # 현재 맵의 NavGrid (없으면 몬스터는 직선 추적)
+
+_cache = OrderedDict()  # (시작 칸, 목표 칸) -> 웨이포인트 [(x, y), ...] (빈 리스트 = 경로 없음)
+_pending = deque()  # 계산을 기다리는 (시작 칸, 목표 칸)
+_pending_keys = set()
+stats = {'computed': 0, 'cache_hits': 0, 'requests': 0}
+
+
+class NavGrid:
+    """(left, bottom, right, top) 충돌 박스를 cell_size 칸으로 나눈 통행 가능 격자"""
+
+    def __init__(self, boxes, bounds, cell_size=NAV_CELL_SIZE, clearance=CLEARANCE):
+        self.left, self.bottom, right, top = bounds
+        self.cell_size = max(1.0, float(cell_size))
+        self.cols = max(1, int(math.ceil((right - self.left) / self.cell_size)))
+        self.rows = max(1, int(math.ceil((top - self.bottom) / self.cell_size)))
+        self.blocked = bytearray(self.cols * self.rows)  # 칸 인덱스 = row * cols + col
+
+        # 벽 박스를 clearance만큼 넓혀서 겹치는 칸을 막음
+        for b_left, b_bottom, b_right, b_top in boxes:
+            c0, r0 = self.cell_of(b_left - clearance, b_bottom - clearance)
+            c1, r1 = self.cell_of(b_right + clearance, b_top + clearance)
+            for row in range(r0, r1 + 1):
+                for col in range(c0, c1 + 1):
+                    self.blocked[row * self.cols + col] = 1
+        self._label_regions()
+
+    def _label_regions(self):
+        """서로 이어진 통행 가능 칸마다 같은 번호 (8방향, find_path와 같은 이동 규칙)
+        갈 수 없는 목표를 A*로 격자 전체를 뒤져 보기 전에 바로 걸러내기 위함"""
+        cols, rows = self.cols, self.rows
+        blocked = self.blocked
+        self.region = [0] * (cols * rows)  # 0 = 막힌 칸
+        label = 0
+        for seed in range(cols * rows):
+            if blocked[seed] or self.region[seed]:
+                continue
+            label += 1
+            self.region[seed] = label
+            stack = [seed]
+            while stack:
+                row, col = divmod(stack.pop(), cols)
+                for dc, dr, _ in NEIGHBORS:
+                    nc, nr = col + dc, row + dr
+                    if not (0 <= nc < cols and 0 <= nr < rows):
+                        continue
+                    n_index = nr * cols + nc
+                    if blocked[n_index] or self.region[n_index]:
+                        continue
+                    if dc and dr and (blocked[row * cols + nc] or blocked[nr * cols + col]):
+                        continue
+                    self.region[n_index] = label
+                    stack.append(n_index)
+
+    def _regions_of(self, cell):
+        """칸이 속한 영역 번호들 (막힌 칸이면 붙어 있는 통행 가능 칸들의 영역)"""
+        col, row = cell
+        label = self.region[row * self.cols + col]
+        if label:
+            return {label}
+        labels = set()
+        for dc, dr, _ in NEIGHBORS:
+            if self.walkable(col + dc, row + dr):
+                labels.add(self.region[(row + dr) * self.cols + col + dc])
+        return labels
+
+    def reachable(self, start, goal):
+        """start 칸에서 goal 칸까지 이어져 있는지 (시작/목표가 막힌 칸이면 바로 옆 칸 기준)"""
+        return start == goal or not self._regions_of(start).isdisjoint(self._regions_of(goal))
+
+    def cell_of(self, x, y):
+        """좌표가 속한 칸 (격자 밖이면 가장자리 칸)"""
+        col = int((x - self.left) // self.cell_size)
+        row = int((y - self.bottom) // self.cell_size)
+        if col < 0:
+            col = 0
+        elif col >= self.cols:
+            col = self.cols - 1
+        if row < 0:
+            row = 0
+        elif row >= self.rows:
+            row = self.rows - 1
+        return col, row
+
+    def center(self, cell):
+        return (self.left + (cell[0] + 0.5) * self.cell_size,
+                self.bottom + (cell[1] + 0.5) * self.cell_size)
+
+    def walkable(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows and not self.blocked[row * self.cols + col]
+
+    def line_clear(self, a, b):
+        """칸 a 중심에서 칸 b 중심까지 직선이 막힌 칸을 지나지 않는지 (지나는 칸을 모두 검사하는 격자 순회)"""
+        (c0, r0), (c1, r1) = a, b
+        dc = abs(c1 - c0)
+        dr = abs(r1 - r0)
+        step_c = 1 if c1 > c0 else -1
+        step_r = 1 if r1 > r0 else -1
+        col, row = c0, r0
+        error = dc - dr
+        dc2, dr2 = dc * 2, dr * 2
+        while col != c1 or row != r1:
+            if error > 0:
+                col += step_c
+                error -= dr2
+            elif error < 0:
+                row += step_r
+                error += dc2
+            else:
+                # 칸 모서리를 정확히 지나감: 양옆 칸이 모두 열려 있어야 통과
+                if not (self.walkable(col + step_c, row) and self.walkable(col, row + step_r)):
+                    return False
+                col += step_c
+                row += step_r
+                error += dc2 - dr2
+            if not self.walkable(col, row):
+                return False
+        return True
+
+    def find_path(self, start, goal):
+        """start 칸에서 goal 칸까지의 칸 리스트 (start 제외, goal 포함), 경로가 없으면 None
+        시작/목표 칸이 막혀 있어도 그 칸에서는 출발/도착할 수 있음 (벽에 붙은 몬스터/플레이어)"""
+        if start == goal:
+            return []
+        if not self.reachable(start, goal):
+            return None
+        cols = self.cols
+        blocked = self.blocked
+        goal_c, goal_r = goal
+        goal_index = goal_r * cols + goal_c
+        start_index = start[1] * cols + start[0]
+
+        came_from = {start_index: -1}
+        cost = {start_index: 0.0}
+        heap = [(0.0, 0.0, start_index)]
+        expansions = 0
+        while heap:
+            _, g, index = heapq.heappop(heap)
+            if index == goal_index:
+                break
+            if g > cost[index]:
+                continue  # 이미 더 짧은 경로로 처리한 칸
+            expansions += 1
+            if expansions > MAX_EXPANSIONS:
+                return None
+            row, col = divmod(index, cols)
+            for dc, dr, step in NEIGHBORS:
+                nc = col + dc
+                nr = row + dr
+                if not (0 <= nc < cols and 0 <= nr < self.rows):
+                    continue
+                n_index = nr * cols + nc
+                if blocked[n_index] and n_index != goal_index:
+                    continue
+                # 대각선 이동은 양옆 칸이 모두 열려 있을 때만 (벽 모서리 가로지르기 금지)
+                if dc and dr and (blocked[row * cols + nc] or blocked[nr * cols + col]):
+                    continue
+                n_cost = g + step
+                if n_cost < cost.get(n_index, math.inf):
+                    cost[n_index] = n_cost
+                    came_from[n_index] = index
+                    # 8방향 격자 거리(octile) 휴리스틱
+                    hx = abs(goal_c - nc)
+                    hy = abs(goal_r - nr)
+                    h = (hx + hy) + (SQRT2 - 2.0) * min(hx, hy)
+                    heapq.heappush(heap, (n_cost + h, n_cost, n_index))
+        else:
+            return None
+        if goal_index not in came_from:
+            return None
+
+        cells = []
+        index = goal_index
+        while index != start_index:
+            row, col = divmod(index, cols)
+            cells.append((col, row))
+            index = came_from[index]
+        cells.reverse()
+        return cells
+
+    def waypoints(self, start, goal):
+        """find_path 결과에서 직선으로 갈 수 있는 중간 칸을 건너뛴 웨이포인트 좌표 리스트 (경로 없으면 None)"""
+        cells = self.find_path(start, goal)
+        if cells is None:
+            return None
+        points = []
+        anchor = start
+        for i, cell in enumerate(cells):
+            following = cells[i + 1] if i + 1 < len(cells) else None
+            if following is not None and self.line_clear(anchor, following):
+                continue
+            points.append(self.center(cell))
+            anchor = cell
+        return points
+
+
+def set_nav(grid):
+    """맵이 바뀔 때 호출 (None이면 길찾기 끔). 이전 맵의 경로 캐시/요청은 버림"""
+    global nav
+    nav = grid
+    _cache.clear()
+    _pending.clear()
+    _pending_keys.clear()
+
+
+def get_path(start, goal):
+    """(start 칸 -> goal 칸) 웨이포인트 리스트, 캐시에 없으면 계산 요청만 하고 None"""
+    key = (start, goal)
+    path = _cache.get(key)
+    if path is not None:
+        _cache.move_to_end(key)
+        stats['cache_hits'] += 1
+        return path
+    if key not in _pending_keys:
+        _pending_keys.add(key)
+        _pending.append(key)
+        stats['requests'] += 1
+        if len(_pending) > MAX_PENDING:
+            _pending_keys.discard(_pending.popleft())
+    return None
+
+
+def process(budget=REQUESTS_PER_FRAME, budget_ms=BUDGET_MS):
+    """대기 중인 경로를 최대 budget개, budget_ms 안에서 계산해서 캐시에 넣음 (프레임마다 한 번, 최소 한 개)"""
+    if nav is None:
+        return 0
+    done = 0
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    while _pending and done < budget and (done == 0 or time.perf_counter() < deadline):
+        key = _pending.pop()  # 최근 요청부터
+        _pending_keys.discard(key)
+        if key in _cache:
+            continue
+        points = nav.waypoints(*key)
+        _cache[key] = points if points is not None else []
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        done += 1
+    stats['computed'] += done
+    return done
+
+
+def pending():
+    return len(_pending)
@@ -1,9 +1,13 @@
-from pico2d import load_image
+import collision_mask
+from resource_manager import load_image
+import sprite_metadata
 
 SPRITE_W, SPRITE_H = 96, 80
 # 기본 캐릭터의 발 오프셋 (스프라이트 바닥에서 실제 발까지의 거리)
 # 실제 캐릭터는 스프라이트 하단 부분에만 그려져 있음
-FOOT_OFFSET_Y = 30  # 실제 발은 스프라이트 중앙보다 훨씬 아래에 위치
+# 발 위치(가장 아래 불투명 픽셀)는 sprite_metadata.json에서 읽고, 충돌 박스에 맞춘 보정값만 더함
+FOOT_ADJUST_Y = 8
+FOOT_OFFSET_Y = sprite_metadata.foot_offset('or_character/IDLE/idle_down.png', SPRITE_W, default=22) + FOOT_ADJUST_Y
 
 
 class PlayerLoader:
@@ -23,12 +27,19 @@ class PlayerLoader:
             'RIGHT': load_image('or_character/RUN/run_right.png'),
         }
 
+        # 공격 시트 경로는 충돌 마스크(collision_mask)에서도 사용
+        self.attack_paths = {
+            1: {d: f'or_character/ATTACK 1/attack1_{d.lower()}.png' for d in ('DOWN', 'UP', 'LEFT', 'RIGHT')},
+            2: {d: f'or_character/ATTACK 2/attack2_{d.lower()}.png' for d in ('DOWN', 'UP', 'LEFT', 'RIGHT')}
+        }
         self.attack_images = {
-            1: {d: load_image(f'or_character/ATTACK 1/attack1_{d.lower()}.png') for d in
-                ('DOWN', 'UP', 'LEFT', 'RIGHT')},
-            2: {d: load_image(f'or_character/ATTACK 2/attack2_{d.lower()}.png') for d in
-                ('DOWN', 'UP', 'LEFT', 'RIGHT')}
+            stage: {d: load_image(path) for d, path in paths.items()} for stage, paths in self.attack_paths.items()
         }
+        # 공격 프레임 충돌 마스크는 로드할 때 한 번 읽어 둠 (Main_character.get_attack_mask)
+        for stage, paths in self.attack_paths.items():
+            for d, path in paths.items():
+                image = self.attack_images[stage][d]
+                collision_mask.load(path, sprite_metadata.horizontal(max(1, image.w // SPRITE_W)), (image.w, image.h))
 
         # 2. 프레임 수
         self.idle_frames = {d: 8 for d in ('DOWN', 'UP', 'LEFT', 'RIGHT')}
@@ -1,5 +1,6 @@
 import time
 from pico2d import load_image
+import render_queue
 from player_loader import FOOT_OFFSET_Y
 
 # 실제 충돌 범위 import (순환 import 방지를 위해 character_constants에서 가져옴)
@@ -46,11 +47,11 @@ class Idle:
         x_offset = frame_idx * SPRITE_W
         y_offset = loader.idle_y_offsets[self.character.dir]
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (SPRITE_H // 2) - FOOT_OFFSET_Y
-        image.clip_draw(
+        draw_y = self.character.draw_y + (SPRITE_H // 2) - FOOT_OFFSET_Y
+        render_queue.clip_draw(image,
             x_offset, y_offset,
             SPRITE_W, SPRITE_H,
-            self.character.x,
+            self.character.draw_x,
             draw_y,
         )
 
@@ -105,11 +106,11 @@ class Walk:
         x_offset = frame_idx * SPRITE_W
         y_offset = loader.run_y_offsets[self.character.dir]
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (SPRITE_H // 2) - FOOT_OFFSET_Y
-        image.clip_draw(
+        draw_y = self.character.draw_y + (SPRITE_H // 2) - FOOT_OFFSET_Y
+        render_queue.clip_draw(image,
             x_offset, y_offset,
             SPRITE_W, SPRITE_H,
-            self.character.x,
+            self.character.draw_x,
             draw_y,
         )
 
@@ -175,11 +176,11 @@ class Roll:
         x_offset = frame_idx * SPRITE_W
         y_offset = loader.run_y_offsets[self.character.dir]
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (SPRITE_H // 2) - FOOT_OFFSET_Y
-        image.clip_draw(
+        draw_y = self.character.draw_y + (SPRITE_H // 2) - FOOT_OFFSET_Y
+        render_queue.clip_draw(image,
             x_offset, y_offset,
             SPRITE_W, SPRITE_H,
-            self.character.x,
+            self.character.draw_x,
             draw_y,
         )
 
@@ -269,9 +270,9 @@ class Attack:
         x_offset = frame_idx * SPRITE_W
         y_offset = loader.attack_y_offsets[self.stage][self.character.dir]
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (SPRITE_H // 2) - FOOT_OFFSET_Y
-        img.clip_draw(
+        draw_y = self.character.draw_y + (SPRITE_H // 2) - FOOT_OFFSET_Y
+        render_queue.clip_draw(img,
             x_offset, y_offset,
             SPRITE_W, SPRITE_H,
-            self.character.x, draw_y
+            self.character.draw_x, draw_y
         )
\ No newline at end of file
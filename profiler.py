@@ -0,0 +1,128 @@
+# profiler.py
+# 프레임별 구간 시간 측정
+# game_framework가 매 프레임 handle_events/update/draw를 재고, 각 모드는 section('이름')으로 세부 구간을 잰다.
+# 최근 HISTORY 프레임을 링 버퍼에 보관해서 p50/p95/p99를 화면에 표시하고, 종료 시 CSV/JSON으로 저장한다.
+import csv
+import json
+import time
+from collections import deque
+
+enabled = False  # True일 때만 측정 (False면 section()은 아무 일도 하지 않음)
+show_overlay = False  # True면 draw_overlay()가 화면 왼쪽 아래에 통계를 그림
+HISTORY = 600  # 링 버퍼에 보관할 프레임 수
+OVERLAY_REFRESH = 0.5  # 오버레이 숫자 갱신 간격 (초)
+DUMP_PATH = 'profile_log'  # 종료 시 profile_log.csv / profile_log.json 저장
+
+frames = deque(maxlen=HISTORY)  # 프레임별 {구간 이름: 초}
+section_names = []  # 처음 측정된 순서대로 구간 이름
+_current = {}
+_overlay_lines = []
+_overlay_time = 0.0
+_font = None
+
+
+class _Section:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _current[self.name] = _current.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NoSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SECTION = _NoSection()
+
+
+def section(name):
+    """with profiler.section('이름'): ... 형태로 구간 시간을 현재 프레임에 누적"""
+    if not enabled:
+        return _NO_SECTION
+    if name not in section_names:
+        section_names.append(name)
+    return _Section(name)
+
+
+def begin_frame():
+    global _current
+    _current = {}
+
+
+def end_frame(frame_seconds):
+    """현재 프레임 측정값을 링 버퍼에 추가 ('frame'은 프레임 전체 시간)"""
+    if not enabled:
+        return
+    _current['frame'] = frame_seconds
+    frames.append(_current)
+
+
+def percentiles(name, points=(50, 95, 99)):
+    """최근 프레임들에서 구간 name의 백분위 시간(초) 튜플"""
+    values = sorted(f[name] for f in frames if name in f)
+    if not values:
+        return tuple(0.0 for _ in points)
+    last = len(values) - 1
+    return tuple(values[min(last, int(round(p / 100.0 * last)))] for p in points)
+
+
+def summary():
+    """구간별 {p50, p95, p99, mean, max, count} (밀리초)"""
+    result = {}
+    for name in ['frame'] + section_names:
+        values = [f[name] for f in frames if name in f]
+        if not values:
+            continue
+        p50, p95, p99 = percentiles(name)
+        result[name] = {
+            'p50': p50 * 1000, 'p95': p95 * 1000, 'p99': p99 * 1000,
+            'mean': sum(values) / len(values) * 1000, 'max': max(values) * 1000,
+            'count': len(values),
+        }
+    return result
+
+
+def draw_overlay():
+    """모드의 draw()에서 update_canvas() 직전에 호출"""
+    global _overlay_time, _overlay_lines, _font
+    if not (enabled and show_overlay) or not frames:
+        return
+    now = time.perf_counter()
+    if now - _overlay_time >= OVERLAY_REFRESH:
+        _overlay_time = now
+        _overlay_lines = [f"{name}: p50 {s['p50']:.2f} / p95 {s['p95']:.2f} / p99 {s['p99']:.2f} ms"
+                          for name, s in summary().items()]
+    if _font is None:
+        from resource_manager import load_font  # 측정을 안 쓸 때는 폰트를 로드하지 않음
+        try:
+            _font = load_font('UI/use_font/MaruBuri-Regular.ttf', 14)
+        except Exception:
+            return
+    for i, line in enumerate(reversed(_overlay_lines)):
+        _font.draw(10, 14 + i * 18, line, (255, 255, 0))
+
+
+def dump(path=DUMP_PATH):
+    """링 버퍼의 프레임별 값은 CSV로, 구간별 통계는 JSON으로 저장"""
+    if not frames:
+        return
+    columns = ['frame'] + section_names
+    with open(path + '.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['index'] + [name + '_ms' for name in columns])
+        for index, frame in enumerate(frames):
+            writer.writerow([index] + [f"{frame.get(name, 0.0) * 1000:.4f}" for name in columns])
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'frames': len(frames), 'sections': summary()}, f, ensure_ascii=False, indent=2)
+    print(f"프로파일 저장: {path}.csv, {path}.json")
@@ -0,0 +1,104 @@
+# render_queue.py
+# 그리기 명령 큐
+# game_world.render() 동안에는 객체가 바로 그리지 않고 (텍스처, 소스 사각형, 화면 사각형, 뒤집기, 레이어, 정렬 키) 기록을
+# 미리 할당한 버퍼에 쌓고, flush()에서 (레이어, 정렬 키, 텍스처) 순서로 정렬해서 한꺼번에 그린다.
+# 같은 텍스처(아틀라스 페이지 포함) 명령이 연달아 나가므로 SDL 내부 배칭이 잘 되고, y 정렬/컬링도 여기서 처리할 수 있다.
+# 겹쳐 그려지는 순서가 중요한 레이어(game_world의 발 y 정렬 레이어)는 by_texture=False로 기록해서 텍스처로 묶지 않고 기록 순서대로 그린다.
+# 기록 중이 아닐 때(game_world.render 밖, 카메라 모드 등)는 각 함수가 바로 그린다.
+#   render_queue.clip_draw(image, ...)  ==  image.clip_draw(...)
+import pico2d
+
+CAPACITY = 4096  # 처음 할당할 명령 수 (넘치면 두 배로 늘림)
+
+recording = False
+layer = 0  # 지금 기록 중인 객체의 레이어 (game_world.render가 설정)
+key = 0  # 레이어 안에서의 정렬 키 (작을수록 먼저 = 아래에 그려짐)
+by_texture = True  # 같은 (레이어, 정렬 키) 안에서 텍스처별로 묶을지 (False면 기록 순서)
+
+_NO_TEXTURE = 1 << 64  # 사각형/함수 명령: 같은 키 안에서 텍스처 명령보다 뒤에 (디버그 박스가 스프라이트 위에 그려지도록)
+
+_buffer = [None] * CAPACITY  # (layer, key, 텍스처 id, 순번, 그리기 함수, 인자)
+_count = 0
+
+
+def begin():
+    """기록 시작 (이전 프레임 명령은 버림)"""
+    global recording, _count, layer, key, by_texture
+    recording = True
+    _count = 0
+    layer = key = 0
+    by_texture = True
+
+
+def order(new_layer, new_key, new_by_texture=True):
+    """이후에 기록하는 명령의 레이어/정렬 키 설정 (new_by_texture=False면 텍스처로 묶지 않음)"""
+    global layer, key, by_texture
+    layer = new_layer
+    key = new_key
+    by_texture = new_by_texture
+
+
+def _push(texture, fn, args):
+    global _count
+    if _count == len(_buffer):
+        _buffer.extend([None] * len(_buffer))
+    # 아틀라스 이미지는 페이지 텍스처 기준으로 묶음. 순번은 모두 달라서 정렬이 함수/인자까지 비교하지 않음
+    if not by_texture:
+        texture_id = 0
+    else:
+        texture_id = _NO_TEXTURE if texture is None else id(getattr(texture, 'page', texture))
+    _buffer[_count] = (layer, key, texture_id, _count, fn, args)
+    _count += 1
+
+
+def flush():
+    """쌓인 명령을 정렬해서 그리고 기록 종료"""
+    global recording, _count
+    recording = False
+    commands = _buffer[:_count]
+    commands.sort()
+    for command in commands:
+        command[4](*command[5])
+    _count = 0
+    return len(commands)
+
+
+def pending():
+    return _count
+
+
+def draw(image, x, y, w=None, h=None):
+    if recording:
+        _push(image, image.draw, (x, y, w, h))
+    else:
+        image.draw(x, y, w, h)
+
+
+def clip_draw(image, left, bottom, width, height, x, y, w=None, h=None):
+    if recording:
+        _push(image, image.clip_draw, (left, bottom, width, height, x, y, w, h))
+    else:
+        image.clip_draw(left, bottom, width, height, x, y, w, h)
+
+
+def clip_composite_draw(image, left, bottom, width, height, rad, flip, x, y, w=None, h=None):
+    if recording:
+        _push(image, image.clip_composite_draw, (left, bottom, width, height, rad, flip, x, y, w, h))
+    else:
+        image.clip_composite_draw(left, bottom, width, height, rad, flip, x, y, w, h)
+
+
+def draw_rectangle(x1, y1, x2, y2, r=255, g=0, b=0, a=255, filled=False):
+    args = (x1, y1, x2, y2, r, g, b, a, filled)
+    if recording:
+        _push(None, pico2d.draw_rectangle, args)
+    else:
+        pico2d.draw_rectangle(*args)
+
+
+def call(fn, *args):
+    """큐를 쓰지 않는 객체의 draw 등 임의의 그리기 함수를 순서대로 끼워 넣음"""
+    if recording:
+        _push(None, fn, args)
+    else:
+        fn(*args)
@@ -0,0 +1,104 @@
+# resource_manager.py
+# 이미지/폰트 공용 캐시
+# 같은 경로(폰트는 경로+크기)는 한 번만 로드해서 모든 객체가 같은 핸들을 공유한다.
+# 참조는 모드(scope) 단위로 센다: 모드가 처음 요청할 때 +1, 모드가 끝나면 -1.
+# 참조가 0이 된 리소스는 바로 버리지 않고 LRU 순서로 남겨 두었다가 예산을 넘으면 오래된 것부터 해제한다.
+# atlas/atlas.json이 있으면 아틀라스에 들어 있는 PNG는 아틀라스 페이지의 일부 영역(atlas.AtlasImage)으로 돌려준다.
+from collections import OrderedDict
+import pico2d
+import atlas
+
+# 참조가 없는 리소스를 남겨 둘 최대 용량 (이미지 w*h*4 바이트 기준 추정치)
+MAX_IDLE_BYTES = 64 * 1024 * 1024
+# 폰트 하나의 추정 용량 (크기를 알 수 없으므로 FreeType face + 글리프 캐시 정도로 잡은 고정값)
+FONT_BYTES = 1024 * 1024
+
+GLOBAL_SCOPE = 'global'
+
+_entries = OrderedDict()  # key -> [resource, refcount], 오래 안 쓴 것부터 앞쪽
+_scopes = {}  # scope -> set(key)
+current_scope = GLOBAL_SCOPE
+
+
+def load_image(path):
+    """pico2d.load_image와 같은 사용법, 같은 경로면 이미 로드한 Image를 돌려줌"""
+    sprite = atlas.lookup(path)
+    if sprite is None:
+        return _acquire(('image', path), lambda: pico2d.load_image(path))
+
+    # 아틀라스 페이지도 같은 scope로 참조를 잡아서, 페이지를 쓰는 스프라이트가 있는 동안 해제되지 않게 함
+    page_path, left, bottom, w, h = sprite
+    page = _acquire(('image', page_path), lambda: pico2d.load_image(page_path))
+    image = _acquire(('image', path), lambda: atlas.AtlasImage(page, left, bottom, w, h))
+    if image.page is not page:
+        # 페이지가 해제됐다가 다시 로드된 경우 새 페이지를 가리키도록 교체
+        image.page = page
+    return image
+
+
+def load_font(path, size=20):
+    """pico2d.load_font와 같은 사용법, 같은 경로/크기면 이미 로드한 Font를 돌려줌"""
+    return _acquire(('font', path, size), lambda: pico2d.load_font(path, size))
+
+
+def _acquire(key, loader):
+    entry = _entries.get(key)
+    if entry is None:
+        # 로드 실패 예외는 기존 pico2d 호출과 똑같이 호출한 쪽으로 전달
+        entry = [loader(), 0]
+        _entries[key] = entry
+    else:
+        _entries.move_to_end(key)
+
+    keys = _scopes.setdefault(current_scope, set())
+    if key not in keys:
+        keys.add(key)
+        entry[1] += 1
+    return entry[0]
+
+
+def set_scope(scope):
+    """이후 로드되는 리소스의 참조를 scope(보통 모드 이름) 앞으로 기록"""
+    global current_scope
+    current_scope = scope
+
+
+def release_scope(scope):
+    """scope가 잡고 있던 참조를 모두 놓고, 예산을 넘는 유휴 리소스 해제"""
+    for key in _scopes.pop(scope, ()):
+        entry = _entries.get(key)
+        if entry is not None:
+            entry[1] -= 1
+    trim()
+
+
+def trim(budget=MAX_IDLE_BYTES):
+    """참조가 0인 리소스의 추정 용량이 budget 이하가 될 때까지 오래된 것부터 해제"""
+    idle = [(key, _size_of(key, entry[0])) for key, entry in _entries.items() if entry[1] <= 0]
+    total = sum(size for _, size in idle)
+    for key, size in idle:
+        if total <= budget:
+            break
+        del _entries[key]
+        total -= size
+
+
+def clear():
+    """모든 리소스와 참조 정보 삭제"""
+    _entries.clear()
+    _scopes.clear()
+
+
+def stats():
+    """(캐시된 리소스 수, 참조 중인 리소스 수, 추정 용량 바이트)"""
+    in_use = sum(1 for entry in _entries.values() if entry[1] > 0)
+    total = sum(_size_of(key, entry[0]) for key, entry in _entries.items())
+    return len(_entries), in_use, total
+
+
+def _size_of(key, resource):
+    if key[0] == 'font':
+        return FONT_BYTES
+    if isinstance(resource, atlas.AtlasImage):
+        return 0  # 용량은 아틀라스 페이지 쪽에서 계산
+    return int(getattr(resource, 'w', 0)) * int(getattr(resource, 'h', 0)) * 4
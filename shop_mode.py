@@ -1,9 +1,11 @@
 from pico2d import *
 import pico2d as _pico2d # set_color를 사용하기 위해 유지
+from resource_manager import load_image
 from sdl2 import SDL_QUIT, SDL_KEYDOWN, SDLK_ESCAPE, SDLK_u, SDLK_RETURN
 
 import game_framework
 import game_world
+import profiler
 
 from main_chracter import Main_character
 from tiled_map import TiledMap
@@ -17,21 +19,23 @@ tiled_map: TiledMap = None
 ui = None
 npc_water = None
 collision_boxes = []  # 충돌 영역 (레이어 1: Collisions)
+collision_grid = None  # 충돌 박스 공간 격자 (맵 로드 시 생성)
 
 # 상점 진입 위치 저장 변수 (마을에서 왔는지 다른 곳에서 왔는지)
 came_from_village = True
 
 def init():
-    global player, tiled_map, collision_boxes, ui, npc_water
+    global player, tiled_map, collision_boxes, collision_grid, ui, npc_water
 
     # 1. 타일드 맵 로드
     tiled_map = TiledMap('map/shop.json')
 
     # 2. 충돌 영역 설정 (레이어 1)
     collision_boxes = tiled_map.get_collision_boxes()
+    collision_grid = tiled_map.build_collision_grid(collision_boxes)
 
-    # 3. 플레이어 생성 및 초기 위치 설정 (상점 입구 위치: 하단 중앙보다 약간 오른쪽)
-    player = Main_character()
+    # 3. 세션 플레이어를 빌려와서 초기 위치 설정 (상점 입구 위치: 하단 중앙보다 약간 오른쪽)
+    player = game_framework.borrow_player()
     player.x = 630
     player.y = 10
 
@@ -73,8 +77,9 @@ def init():
 def finish():
     # 상점 나가면 UI 포함 모든 객체 제거
     game_world.clear()
-    global collision_boxes, ui
+    global collision_boxes, collision_grid, ui
     collision_boxes = []
+    collision_grid = None
     ui = None
 
 def handle_events():
@@ -107,13 +112,10 @@ def check_collision(x, y, player):
         collision_w = CHARACTER_COLLISION_W // 2
         collision_h = CHARACTER_COLLISION_H // 2
 
-    for box in collision_boxes:
-        left, bottom, right, top = box
-        # 플레이어의 사각형 충돌 감지 (실제 캐릭터 크기 사용)
-        if left - collision_w < x < right + collision_w and \
-           bottom - collision_h < y < top + collision_h:
-            return True
-    return False
+    # 플레이어 주변 격자 칸의 박스만 검사 (실제 캐릭터 크기 사용)
+    if collision_grid is None:
+        return False
+    return collision_grid.hits_aabb(x - collision_w, y - collision_h, x + collision_w, y + collision_h)
 
 def update(dt):
     # 이전 위치 저장
@@ -154,6 +156,7 @@ def draw():
         draw_rectangle(left, bottom, right, top)
 
 
+    profiler.draw_overlay()
     update_canvas()
 
 def pause(): pass
@@ -0,0 +1,130 @@
+# spatial_grid.py
+# 맵 충돌 박스용 균일 격자(spatial hash)
+# 맵을 로드할 때 한 번만 만들고, 점/사각형/선분 질의 시 주변 칸의 박스만 검사한다
+import math
+
+
+class SpatialGrid:
+    """(left, bottom, right, top) 박스들을 cell_size 크기의 칸에 나눠 담는 정적 격자"""
+
+    def __init__(self, boxes, cell_size):
+        self.boxes = list(boxes)
+        self.cell_size = max(1.0, float(cell_size))
+        self.cells = {}  # (cx, cy) -> [박스 인덱스, ...]
+
+        for index, (left, bottom, right, top) in enumerate(self.boxes):
+            cx0, cy0 = self._cell(left, bottom)
+            cx1, cy1 = self._cell(right, top)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(index)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _candidates(self, left, bottom, right, top):
+        """사각형이 걸치는 칸들에 들어 있는 박스 인덱스 (중복 제거)"""
+        cx0, cy0 = self._cell(left, bottom)
+        cx1, cy1 = self._cell(right, top)
+        seen = set()
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for index in bucket:
+                        if index not in seen:
+                            seen.add(index)
+                            yield index
+
+    def query_point(self, x, y):
+        """점을 포함하는 박스 리스트"""
+        bucket = self.cells.get(self._cell(x, y), ())
+        result = []
+        for index in bucket:
+            left, bottom, right, top = self.boxes[index]
+            if left <= x <= right and bottom <= y <= top:
+                result.append(self.boxes[index])
+        return result
+
+    def query_aabb(self, left, bottom, right, top):
+        """사각형과 겹치는(경계만 닿는 경우 제외) 박스 리스트"""
+        result = []
+        for index in self._candidates(left, bottom, right, top):
+            b_left, b_bottom, b_right, b_top = self.boxes[index]
+            if b_left < right and left < b_right and b_bottom < top and bottom < b_top:
+                result.append(self.boxes[index])
+        return result
+
+    def hits_aabb(self, left, bottom, right, top):
+        """사각형과 겹치는 박스가 하나라도 있으면 True (충돌 판정용, 찾는 즉시 종료)"""
+        for index in self._candidates(left, bottom, right, top):
+            b_left, b_bottom, b_right, b_top = self.boxes[index]
+            if b_left < right and left < b_right and b_bottom < top and bottom < b_top:
+                return True
+        return False
+
+    def query_segment(self, x1, y1, x2, y2):
+        """선분 (x1,y1)-(x2,y2)이 지나가는 박스 리스트 (시작점에서 가까운 순)"""
+        dx = x2 - x1
+        dy = y2 - y1
+        hits = {}
+
+        # 선분이 지나가는 칸만 순서대로 방문 (Amanatides-Woo 격자 순회)
+        cx, cy = self._cell(x1, y1)
+        end_cx, end_cy = self._cell(x2, y2)
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        size = self.cell_size
+        if dx != 0:
+            next_x = (cx + (1 if dx > 0 else 0)) * size
+            t_max_x = (next_x - x1) / dx
+            t_delta_x = size / abs(dx)
+        else:
+            t_max_x = t_delta_x = float('inf')
+        if dy != 0:
+            next_y = (cy + (1 if dy > 0 else 0)) * size
+            t_max_y = (next_y - y1) / dy
+            t_delta_y = size / abs(dy)
+        else:
+            t_max_y = t_delta_y = float('inf')
+
+        while True:
+            for index in self.cells.get((cx, cy), ()):
+                if index not in hits:
+                    t = self._segment_box_t(x1, y1, dx, dy, self.boxes[index])
+                    if t is not None:
+                        hits[index] = t
+            if (cx, cy) == (end_cx, end_cy) or (t_max_x > 1.0 and t_max_y > 1.0):
+                break
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+
+        return [self.boxes[index] for index in sorted(hits, key=hits.get)]
+
+    @staticmethod
+    def _segment_box_t(x1, y1, dx, dy, box):
+        """선분이 박스에 들어가는 시점 t(0~1), 만나지 않으면 None (slab 방식)"""
+        left, bottom, right, top = box
+        t_enter, t_exit = 0.0, 1.0
+        for start, delta, low, high in ((x1, dx, left, right), (y1, dy, bottom, top)):
+            if delta == 0:
+                if start < low or start > high:
+                    return None
+                continue
+            t0 = (low - start) / delta
+            t1 = (high - start) / delta
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_enter = max(t_enter, t0)
+            t_exit = min(t_exit, t1)
+            if t_enter > t_exit:
+                return None
+        return t_enter
@@ -0,0 +1,379 @@
+# sprite_metadata.py
+# 스프라이트 시트 메타데이터 (프레임 사각형, 투명 영역을 잘라낸 bbox, 무게중심, 충돌 마스크, 프레임 높이 자동 감지 결과)
+# 픽셀 분석(PIL/NumPy)은 빌드 단계에서 한 번만 하고 sprite_metadata.json에 저장해 둔다.
+#   python sprite_metadata.py          -> MS/, or_character/, NPC/ 시트를 분석해서 sprite_metadata.json 다시 생성
+#   python sprite_metadata.py --check  -> 저장된 파일이 최신인지 확인 (다르면 종료 코드 1)
+#   (NPC/처럼 체크아웃에 없는 시트는 분석하지 않고 저장된 항목을 그대로 옮겨서, 있든 없든 --check 결과가 같음)
+# 실행 중에는 JSON만 읽는다. 파일에 없거나 이미지 크기가 바뀐 시트만 PIL로 그 자리에서 계산한다 (PIL이 없으면 None).
+#
+# 좌표 규칙
+#   rects     : [left, top, w, h]        시트 안의 프레임 위치 (PIL처럼 위쪽 원점)
+#   bboxes    : [left, bottom, right, top] 프레임 안의 불투명 영역 (Pico2D처럼 아래쪽 원점), 비어 있으면 프레임 전체
+#   centroids : [x, y]                     불투명 픽셀의 평균 위치 (아래쪽 원점)
+#   masks     : 프레임마다 알파 >= ALPHA_THRESHOLD 픽셀의 비트마스크를 이어 붙여 zlib 압축 후 base64로 쓴 문자열
+#               (프레임 하나 = PIL '1' 모드 tobytes: 위쪽 줄부터, 줄마다 바이트 경계까지 채움)
+#               충돌 판정에 쓰는 시트(collision_mask.load가 요청한 분할 방식)에만 있음
+import base64
+import json
+import os
+import sys
+import zlib
+
+METADATA_PATH = 'sprite_metadata.json'
+VERSION = 2
+ALPHA_THRESHOLD = 1  # 이 값 이상인 알파를 불투명으로 봄 (bbox의 getbbox와 같은 기준)
+
+# 빌드 시 디렉터리를 훑을 때 쓰는 프레임 크기 (가장 긴 경로 접두사 우선)
+FRAME_SIZES = {
+    'or_character': (96, 80),
+    'or_character/change_ch': (144, 144),
+}
+# NPC 시트의 가로 프레임 수 (shop_mode / village_mode 설정과 같음)
+NPC_FRAMES = {
+    'NPC/NPC_water.png': 6,
+    'NPC/NPC_fairy.png': 2,
+    'NPC/NPC_item.png': 2,
+}
+
+_data = None
+_warned = False
+
+
+def horizontal(count):
+    """가로로 count개를 같은 폭으로 나눈 프레임"""
+    return f'h{int(count)}'
+
+
+def vertical(count):
+    """세로로 count개를 같은 높이로 나눈 프레임"""
+    return f'v{int(count)}'
+
+
+def grid(cols, rows):
+    """cols x rows 격자 (위 행부터, 행 안에서는 왼쪽부터)"""
+    return f'g{int(cols)}x{int(rows)}'
+
+
+def rows(frame_h):
+    """높이 frame_h인 프레임을 위에서부터 세로로 쌓은 시트"""
+    return f'r{int(frame_h)}'
+
+
+def _load():
+    global _data
+    if _data is None:
+        try:
+            with open(METADATA_PATH, encoding='utf-8') as f:
+                _data = json.load(f)
+            if _data.get('version') != VERSION:
+                _data = {'version': VERSION, 'sheets': {}}
+        except (OSError, ValueError):
+            _data = {'version': VERSION, 'sheets': {}}
+    return _data
+
+
+def _sheet(path, size):
+    """path의 메타데이터 항목 (size가 다르면 이미지가 바뀐 것이므로 비움)"""
+    sheets = _load()['sheets']
+    entry = sheets.get(path)
+    if entry is None or (size is not None and tuple(entry['size']) != tuple(size)):
+        entry = None
+    return entry
+
+
+def _missing(path):
+    global _warned
+    if not _warned:
+        _warned = True
+        print(f"sprite_metadata: {path} 메타데이터가 없거나 오래됨 -> 'python sprite_metadata.py'로 다시 생성하세요.")
+
+
+def frames(path, slicing, size=None):
+    """시트를 slicing 방식으로 나눈 {'rects', 'bboxes', 'centroids'} (size: 로드한 이미지 (w, h), 검증용)
+    계산할 수 없으면 None"""
+    entry = _sheet(path, size)
+    if entry is not None and slicing in entry['slices']:
+        return entry['slices'][slicing]
+
+    pil = _open(path)
+    if pil is None:
+        return None
+    _missing(path)
+    entry = _entry_for(path, pil)
+    entry['slices'][slicing] = _analyze(pil, slicing)
+    return entry['slices'][slicing]
+
+
+def masks(path, slicing, size=None):
+    """frames()와 같은 순서의 프레임별 마스크 바이트 리스트 (계산할 수 없으면 None)"""
+    meta = frames(path, slicing, size)
+    if meta is None:
+        return None
+    if 'masks' not in meta:
+        pil = _open(path)
+        if pil is None:
+            return None
+        _missing(path)
+        meta['masks'] = _pack_masks(pil, meta['rects'])
+    data = zlib.decompress(base64.b64decode(meta['masks']))
+    result = []
+    offset = 0
+    for _, _, fw, fh in meta['rects']:
+        length = (fw + 7) // 8 * fh
+        result.append(data[offset:offset + length])
+        offset += length
+    return result
+
+
+def detected_frame_height(path, expected_total, size=None):
+    """세로로 쌓인 시트에서 빈 줄 간격으로 감지한 프레임 높이 (감지 실패 시 None)"""
+    key = str(int(expected_total))
+    entry = _sheet(path, size)
+    if entry is not None and key in entry['detect']:
+        return entry['detect'][key]
+
+    pil = _open(path)
+    if pil is None:
+        return None
+    _missing(path)
+    entry = _entry_for(path, pil)
+    entry['detect'][key] = _detect_frame_height(pil, int(expected_total))
+    return entry['detect'][key]
+
+
+def foot_offset(path, frame_w, default):
+    """가로 시트의 프레임 바닥에서 가장 아래 불투명 픽셀(발)까지의 거리 (프레임 중앙값)"""
+    entry = _sheet(path, None)
+    if entry is not None:
+        width = entry['size'][0]
+    else:
+        pil = _open(path)
+        if pil is None:
+            return default
+        width = pil.size[0]
+    meta = frames(path, horizontal(max(1, width // frame_w)), None)
+    if not meta:
+        return default
+    bottoms = sorted(bbox[1] for bbox in meta['bboxes'])
+    return bottoms[len(bottoms) // 2]
+
+
+def _entry_for(path, pil):
+    sheets = _load()['sheets']
+    entry = sheets.get(path)
+    if entry is None or tuple(entry['size']) != pil.size:
+        entry = {'size': list(pil.size), 'slices': {}, 'detect': {}}
+        sheets[path] = entry
+    return entry
+
+
+def _open(path):
+    try:
+        from PIL import Image
+        return Image.open(path).convert('RGBA')
+    except Exception:
+        return None
+
+
+def _slice_rects(slicing, w, h):
+    kind, value = slicing[0], slicing[1:]
+    if kind == 'h':
+        count = max(1, int(value))
+        fw = max(1, w // count)
+        return [(i * fw, 0, fw, h) for i in range(count)]
+    if kind == 'v':
+        count = max(1, int(value))
+        fh = max(1, h // count)
+        return [(0, i * fh, w, fh) for i in range(count)]
+    if kind == 'g':
+        cols, num_rows = (max(1, int(v)) for v in value.split('x'))
+        fw = max(1, w // cols)
+        fh = max(1, h // num_rows)
+        return [(col * fw, row * fh, fw, fh) for row in range(num_rows) for col in range(cols)]
+    if kind == 'r':
+        fh = max(1, int(value))
+        return [(0, i * fh, w, fh) for i in range(max(1, h // fh))]
+    raise ValueError(f"알 수 없는 slicing: {slicing}")
+
+
+def _analyze(pil, slicing):
+    try:
+        import numpy as np
+        alpha = np.array(pil)[:, :, 3]
+    except ImportError:
+        alpha = None
+
+    rects, bboxes, centroids = [], [], []
+    for left, top, fw, fh in _slice_rects(slicing, *pil.size):
+        rects.append([left, top, fw, fh])
+        bbox = pil.crop((left, top, left + fw, top + fh)).getbbox()
+        if bbox is None:
+            bboxes.append([0, 0, fw, fh])
+        else:
+            l, u, r, d = bbox
+            bboxes.append([l, fh - d, r, fh - u])
+
+        # 무게중심: 불투명 픽셀 위치의 평균 (NumPy가 없으면 bbox 중심)
+        cx, cy = (bboxes[-1][0] + bboxes[-1][2]) / 2, (bboxes[-1][1] + bboxes[-1][3]) / 2
+        if alpha is not None:
+            ys, xs = np.nonzero(alpha[top:top + fh, left:left + fw])
+            if len(xs) > 0:
+                cx = float(xs.mean()) + 0.5
+                cy = fh - (float(ys.mean()) + 0.5)
+        centroids.append([round(cx, 2), round(cy, 2)])
+    return {'rects': rects, 'bboxes': bboxes, 'centroids': centroids}
+
+
+def _pack_masks(pil, rects):
+    alpha = pil.getchannel('A').point(lambda a: 255 if a >= ALPHA_THRESHOLD else 0, '1')
+    data = b''.join(alpha.crop((left, top, left + fw, top + fh)).tobytes() for left, top, fw, fh in rects)
+    return base64.b64encode(zlib.compress(data, 9)).decode('ascii')
+
+
+def _detect_frame_height(pil, expected_total):
+    """세로로 쌓인 프레임 사이의 빈 줄로 프레임 높이를 추정 (Animator의 기존 감지 방식)"""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    H = pil.size[1]
+    alpha = np.array(pil)[:, :, 3]
+    rows_visible = np.where(alpha.any(axis=1))[0]
+    if len(rows_visible) == 0:
+        return None
+
+    # 보이는 블록의 시작 줄 모으기
+    starts = []
+    prev = None
+    for r in rows_visible:
+        if prev is None or r != prev + 1:
+            starts.append(int(r))
+        prev = r
+    if len(starts) > 1:
+        dists = [starts[i + 1] - starts[i] for i in range(len(starts) - 1)]
+        # 한두 픽셀짜리 잡티 간격은 제외
+        dists_filtered = [int(d) for d in dists if int(d) > 5]
+        if dists_filtered:
+            try:
+                from statistics import mode
+                return int(mode(dists_filtered))
+            except Exception:
+                dists_filtered.sort()
+                return int(dists_filtered[len(dists_filtered) // 2])
+        return int(max(1, min(dists)))
+
+    # 블록이 하나뿐이면 연속 구간 길이로 추정
+    segs = []
+    prev = int(rows_visible[0])
+    seg_start = prev
+    for r in rows_visible[1:]:
+        if r == prev + 1:
+            prev = int(r)
+        else:
+            segs.append(prev - seg_start + 1)
+            seg_start = prev = int(r)
+    segs.append(prev - seg_start + 1)
+    return int(segs[0]) if segs else max(1, H // expected_total)
+
+
+def _frame_size_for(path):
+    best = None
+    for prefix, size in FRAME_SIZES.items():
+        if path.startswith(prefix + '/') and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, size)
+    return best[1] if best else None
+
+
+def build():
+    """게임이 요청하는 시트를 전부 분석해서 새 메타데이터 dict 반환"""
+    global _data, _warned
+    import contextlib
+    import io
+    import headless
+    headless.install()  # 몬스터 생성에 필요한 load_image를 창 없이 사용
+    previous = _load()['sheets']  # 이 체크아웃에 없는 시트는 기존 항목을 그대로 유지
+    _data = {'version': VERSION, 'sheets': {}}
+    _warned = True  # 빌드 중에는 '메타데이터 없음' 안내를 띄우지 않음
+
+    # 몬스터: 각 종류를 실제로 만들어서 Animator가 요청하는 시트/분할 방식을 그대로 기록
+    import Monster
+    pending = list(Monster.Monster.__subclasses__())
+    with contextlib.redirect_stdout(io.StringIO()):
+        while pending:
+            cls = pending.pop(0)
+            pending.extend(cls.__subclasses__())
+            cls()
+
+    # 플레이어 공격 시트 마스크: PlayerLoader가 요청하는 분할 방식 그대로
+    import player_loader
+    player_loader.PlayerLoader()
+
+    # 플레이어/변신 캐릭터: 가로 시트 (프레임 크기는 FRAME_SIZES)
+    for root, _, files in os.walk('or_character'):
+        for name in sorted(files):
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(root, name).replace(os.sep, '/')
+            frame_size = _frame_size_for(path)
+            pil = _open(path)
+            if frame_size is None or pil is None:
+                continue
+            frames(path, horizontal(max(1, pil.size[0] // frame_size[0])), pil.size)
+
+    for path, count in NPC_FRAMES.items():
+        if os.path.exists(path):
+            frames(path, horizontal(count))
+        elif path in previous:
+            _data['sheets'][path] = previous[path]
+            print(f"  파일 없음, 기존 항목 유지: {path}")
+        else:
+            print(f"  건너뜀 (파일 없음): {path}")
+
+    data = _data
+    data['sheets'] = dict(sorted(data['sheets'].items()))
+    return data
+
+
+def _dumps(data):
+    # 시트 하나당 한 줄씩 써서 diff를 읽기 쉽게 유지
+    lines = ['{', f'  "version": {data["version"]},', '  "sheets": {']
+    items = list(data['sheets'].items())
+    for i, (path, entry) in enumerate(items):
+        comma = ',' if i < len(items) - 1 else ''
+        lines.append(f'    {json.dumps(path, ensure_ascii=False)}: {json.dumps(entry, ensure_ascii=False, separators=(",", ":"))}{comma}')
+    lines.append('  }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='스프라이트 메타데이터 생성')
+    parser.add_argument('--check', action='store_true', help='저장된 파일이 최신인지만 확인')
+    parser.add_argument('--output', default=METADATA_PATH)
+    args = parser.parse_args(argv)
+
+    text = _dumps(build())
+
+    if args.check:
+        try:
+            with open(args.output, encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != text:
+            print(f"{args.output}가 최신이 아닙니다. 'python sprite_metadata.py'를 실행하세요.")
+            return 1
+        print(f"{args.output} 최신 상태")
+        return 0
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"저장: {args.output} (시트 {len(_data['sheets'])}개)")
+    return 0
+
+
+if __name__ == '__main__':
+    # 게임 모듈(Monster 등)이 import 하는 sprite_metadata와 같은 모듈 객체에 기록되도록 import 해서 실행
+    import sprite_metadata
+    sys.exit(sprite_metadata.main())
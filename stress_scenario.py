@@ -0,0 +1,166 @@
+# stress_scenario.py
+# dungeon_mode에 수백~수천 마리의 몬스터와 전리품을 고정 시드로 배치해서 규모별 프레임 비용을 재는 시나리오
+#   python stress_scenario.py                          -> 100, 250, 500, 1000, 2000마리 순서로 측정
+#   python stress_scenario.py --counts 1000 5000 --frames 60 --output stress.json
+# headless 백엔드에서 실행되며, profiler 구간(monster update, collision, TiledMap.draw 등)도 같이 보고한다.
+import headless
+headless.install()  # 게임 모듈이 pico2d를 import 하기 전에 교체해야 함
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import time
+
+import profiler
+
+SEED = 2024
+MONSTER_TYPES = ('Green_MS', 'Red_MS', 'Trash_Monster')
+COUNTS = (100, 250, 500, 1000, 2000)
+FRAMES = 120
+LOOT_RATIO = 0.25  # 몬스터 수 대비 처음부터 떨어져 있는 전리품 비율
+KILL_RATE = 0.002  # 프레임마다 살아 있는 몬스터 중 이 비율만큼 처치 (죽음 애니메이션/전리품 생성 경로 측정)
+SPAWN_MARGIN = 50  # 화면 가장자리에서 띄울 거리
+DT = 1.0 / 60
+
+
+def _spawn_point(rng, width, height, collision_grid, attempts=20):
+    """충돌 박스와 겹치지 않는 랜덤 위치 (못 찾으면 마지막 후보를 그대로 사용)"""
+    for _ in range(attempts):
+        x = rng.uniform(SPAWN_MARGIN, width - SPAWN_MARGIN)
+        y = rng.uniform(SPAWN_MARGIN, height - SPAWN_MARGIN)
+        if collision_grid is None or not collision_grid.hits_aabb(x - 25, y - 25, x + 25, y + 25):
+            break
+    return x, y
+
+
+def populate_dungeon(count, seed=SEED, loot_ratio=0.0):
+    """던전에 count마리의 몬스터(종류 섞어서)와 count*loot_ratio개의 전리품을 seed 고정 랜덤 위치로 배치
+    기존 몬스터/전리품은 제거한다. dungeon_mode.init() 이후에 호출"""
+    import dungeon_mode
+    import game_world
+    import Monster
+    from loot import Loot
+
+    rng = random.Random(seed)
+    random.seed(seed)  # Loot 이미지 선택 등 게임 코드가 쓰는 전역 random도 고정
+    for obj in game_world.objects_of('monster') + game_world.objects_of('loot'):
+        game_world.remove_object(obj)
+    game_world.flush_removals()
+
+    width, height = dungeon_mode.SCREEN_WIDTH, dungeon_mode.SCREEN_HEIGHT
+    grid = dungeon_mode.collision_grid
+    for _ in range(count):
+        monster_class = getattr(Monster, rng.choice(MONSTER_TYPES))
+        monster = monster_class(*_spawn_point(rng, width, height, grid))
+        game_world.add_object(monster, 1)
+
+    for _ in range(int(count * loot_ratio)):
+        loot = Loot(*_spawn_point(rng, width, height, grid), 'coin', rng.randint(1, 5))
+        game_world.add_object(loot, 1)
+    return game_world.objects_of('monster')
+
+
+def run_scenario(count, frames=FRAMES, seed=SEED, kill_rate=KILL_RATE):
+    """count마리 시나리오를 frames 프레임 실행하고 프레임별 update/draw 비용 통계 반환"""
+    import dungeon_mode
+    import game_framework
+    import game_world
+    import resource_manager
+
+    game_framework.stack = [dungeon_mode]
+    resource_manager.set_scope(dungeon_mode.__name__)
+    dungeon_mode.init()
+    populate_dungeon(count, seed, LOOT_RATIO)
+    loot_start = game_world.count('loot')
+    rng = random.Random(seed + 1)
+
+    profiler.frames.clear()
+    update_ms = []
+    draw_ms = []
+    killed = 0
+    for _ in range(frames):
+        # 마지막 몬스터까지 처치하면 다음 맵으로 넘어가므로 절반까지만 처치
+        alive = [m for m in game_world.objects_of('monster') if m.alive]
+        for monster in rng.sample(alive, min(len(alive), int(len(alive) * kill_rate + rng.random()))):
+            if killed < count // 2:
+                monster.take_damage(monster.hp)
+                killed += 1
+
+        profiler.begin_frame()
+        start = time.perf_counter()
+        with profiler.section('update'):
+            dungeon_mode.update(DT)
+        middle = time.perf_counter()
+        with profiler.section('draw'):
+            dungeon_mode.draw()
+        end = time.perf_counter()
+        profiler.end_frame(end - start)
+        update_ms.append((middle - start) * 1000)
+        draw_ms.append((end - middle) * 1000)
+
+    result = {
+        'monsters': count,
+        'loots_start': loot_start,
+        'loots_end': game_world.count('loot'),
+        'killed': killed,
+        'frames': frames,
+        'update_ms': _stats(update_ms),
+        'draw_ms': _stats(draw_ms),
+        'sections': profiler.summary(),
+    }
+
+    dungeon_mode.finish()
+    resource_manager.release_scope(dungeon_mode.__name__)
+    game_framework.stack = []
+    return result
+
+
+def _stats(values):
+    ordered = sorted(values)
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='dungeon_mode 대규모 개체 스트레스 시나리오 (headless)')
+    parser.add_argument('--counts', type=int, nargs='*', default=list(COUNTS), help='몬스터 수 목록')
+    parser.add_argument('--frames', type=int, default=FRAMES)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--kill-rate', type=float, default=KILL_RATE)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    import main_chracter
+    headless.open_canvas(main_chracter.SCREEN_W, main_chracter.SCREEN_H)
+    headless.reset()
+    profiler.enabled = True
+
+    print(f"{'몬스터':>8} {'전리품':>6} {'update p50':>11} {'p95':>8} {'draw p50':>10} {'p95':>8} {'몬스터':>8} {'충돌':>7}  (ms)")
+    results = []
+    for count in args.counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_scenario(count, args.frames, args.seed, args.kill_rate)
+        results.append(result)
+        sections = result['sections']
+        monster_p50 = sections.get('monster update', {}).get('p50', 0.0)
+        collision_p50 = sections.get('collision', {}).get('p50', 0.0)
+        print(f"{count:>8} {result['loots_start']:>6} {result['update_ms']['p50']:>11.2f} {result['update_ms']['p95']:>8.2f} "
+              f"{result['draw_ms']['p50']:>10.2f} {result['draw_ms']['p95']:>8.2f} {monster_p50:>8.2f} {collision_p50:>7.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'frames': args.frames, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,52 @@
 # tiled_map.py
-import json
 import os
-from pico2d import load_image, get_canvas_width, get_canvas_height
+import ctypes
+import math
+from array import array
+import pico2d
+from pico2d import get_canvas_width, get_canvas_height, Image
+from resource_manager import load_image
+from spatial_grid import SpatialGrid
+import map_cache
+import pathfinding
+import profiler
+from sdl2 import (
+    SDL_CreateTexture, SDL_SetRenderTarget, SDL_SetTextureBlendMode,
+    SDL_SetRenderDrawColor, SDL_RenderClear, SDL_RenderCopy, SDL_RenderCopyEx, SDL_Rect,
+    SDL_PIXELFORMAT_RGBA8888, SDL_TEXTUREACCESS_TARGET, SDL_BLENDMODE_BLEND,
+    SDL_FLIP_NONE, SDL_FLIP_HORIZONTAL
+)
+
+# 정적 레이어를 미리 합성할 텍스처 한 장의 최대 크기 (픽셀)
+# GPU 텍스처 크기 제한을 넘지 않도록 큰 맵은 여러 청크 텍스처로 나눠서 굽는다
+BAKE_CHUNK_PX = 1024
+
+# 카메라 렌더링용 청크 크기 (타일 개수). 카메라 사각형과 겹치는 청크만 순회한다
+CHUNK_TILES = 16
+
+# Tiled GID의 위쪽 비트는 뒤집기 플래그 (가로 0x80000000, 세로 0x40000000, 대각선 0x20000000, 육각 회전 0x10000000)
+GID_MASK = 0x0FFFFFFF
+FLIP_SHIFT = 29
+# 플래그 3비트(가로, 세로, 대각선) -> (시계 방향 회전 각도, 가로 뒤집기)
+# Tiled는 대각선 뒤집기를 먼저 하고 가로/세로를 뒤집는데, SDL_RenderCopyEx는 뒤집은 뒤 회전하므로 같은 결과가 나오는 조합으로 바꿔 둠
+TILE_FLIPS = (
+    (0, False),  # 없음
+    (270, True),  # 대각선
+    (180, True),  # 세로
+    (270, False),  # 세로 + 대각선
+    (0, True),  # 가로
+    (90, False),  # 가로 + 대각선
+    (180, False),  # 가로 + 세로
+    (90, True),  # 가로 + 세로 + 대각선
+)
+# 같은 변환을 pico2d clip_composite_draw 인자(라디안, 반시계 방향이 양수)로 바꾼 것
+TILE_FLIP_ARGS = tuple((-math.radians(angle), 'h' if flip_h else '') for angle, flip_h in TILE_FLIPS)
 
 
 class TiledMap:
     def __init__(self, json_path, use_camera=False):
-        # 1. JSON 맵 파일 로드
-        with open(json_path) as f:
-            self.map_data = json.load(f)
+        # 1. 맵 파일 로드 (컴파일된 바이너리 캐시가 최신이면 JSON 파싱 생략)
+        self.map_data = map_cache.load_map(json_path)
 
         # 2. 기본 맵 속성 저장
         self.tile_width = self.map_data['tilewidth']
@@ -82,61 +120,256 @@ class TiledMap:
             if layer['type'] == 'tilelayer':
                 self.layers_data.append(layer['data'])
 
+        # 5. GID -> 소스 좌표 조회 테이블과 레이어별 목적지 배열 (로드 시 한 번만 계산)
+        self._build_tile_lut(tileset_info)
+        self._build_layer_tiles()
+
+        # 6. 청크 그리드와 청크별 draw 리스트 미리 계산 (draw_with_camera에서 사용)
+        self._build_chunks()
+
+        # 7. 정적 타일 레이어를 로드 시 한 번만 텍스처로 합성 (실패하면 None -> 타일 단위 렌더링)
+        self.baked_layers = self._bake_layers()
+
+    def _build_tile_lut(self, tileset_info):
+        """타일셋의 소스 좌표(Pico2D 기준 left, bottom)를 GID로 바로 찾을 수 있게 배열로 만든다"""
+        tw, th = self.tile_width, self.tile_height
+        first_gid = tileset_info.get('firstgid', 1)
+        tile_count = tileset_info.get('tilecount') or self.tileset_cols * (self.tileset_image.h // th)
+
+        # 타일셋 범위 밖의 GID(다른 타일셋 등)는 -1로 표시하고 그리지 않음 (뒤집기 플래그는 조회 전에 떼어 냄)
+        lut_size = first_gid + tile_count
+        self.tile_src_x = array('i', [-1]) * lut_size
+        self.tile_src_y = array('i', [-1]) * lut_size
+        for local_id in range(tile_count):
+            gid = first_gid + local_id
+            self.tile_src_x[gid] = (local_id % self.tileset_cols) * tw
+            self.tile_src_y[gid] = self.tileset_image.h - (local_id // self.tileset_cols) * th - th
+
+    def _build_layer_tiles(self):
+        """레이어별로 비어 있지 않은 타일의 GID, 뒤집기 플래그, 월드 중심 좌표를 array로 저장"""
+        tw, th = self.tile_width, self.tile_height
+        lut_size = len(self.tile_src_x)
+        self.layer_tiles = []  # [(gids, flips, dest_x, dest_y), ...]
+        for layer_data in self.layers_data:
+            gids = array('I')
+            flips = array('B')
+            dest_x = array('i')
+            dest_y = array('i')
+            for map_index, raw_gid in enumerate(layer_data):
+                tile_id = raw_gid & GID_MASK
+                if tile_id == 0 or tile_id >= lut_size or self.tile_src_x[tile_id] < 0:
+                    continue
+                # Tiled는 위쪽 행이 0번이므로 Pico2D(아래쪽 원점) 행 번호로 뒤집음
+                row, col = divmod(map_index, self.map_width_tiles)
+                y = self.map_height_tiles - 1 - row
+                gids.append(tile_id)
+                flips.append(raw_gid >> FLIP_SHIFT)
+                dest_x.append(col * tw + tw // 2)
+                dest_y.append(y * th + th // 2)
+            self.layer_tiles.append((gids, flips, dest_x, dest_y))
+
+    def _build_chunks(self):
+        """맵을 CHUNK_TILES x CHUNK_TILES 청크로 나누고 청크별 경계와 타일 draw 리스트를 만든다"""
+        self.chunk_w_px = CHUNK_TILES * self.tile_width
+        self.chunk_h_px = CHUNK_TILES * self.tile_height
+        self.chunk_cols = (self.map_width_tiles + CHUNK_TILES - 1) // CHUNK_TILES
+        self.chunk_rows = (self.map_height_tiles + CHUNK_TILES - 1) // CHUNK_TILES
+
+        # 청크 경계 (left, bottom, right, top) - 월드(Pico2D) 좌표, [row][col]
+        self.chunk_bounds = []
+        for cy in range(self.chunk_rows):
+            row = []
+            for cx in range(self.chunk_cols):
+                left = cx * self.chunk_w_px
+                bottom = cy * self.chunk_h_px
+                right = min(left + self.chunk_w_px, self.map_width_px)
+                top = min(bottom + self.chunk_h_px, self.map_height_px)
+                row.append((left, bottom, right, top))
+            self.chunk_bounds.append(row)
+
+        # 레이어별 청크 draw 리스트: [layer][row][col] -> [(src_x, src_y, world_x, world_y, flip), ...]
+        # flip은 TILE_FLIPS 인덱스 (0이면 뒤집기 없음)
+        # 대각선 뒤집기 타일은 가로/세로가 바뀌어 칸 왼쪽 아래에 맞춰 그려지므로(Tiled와 같음), 회전 중심을 그만큼 옮겨 둠
+        src_x_lut, src_y_lut = self.tile_src_x, self.tile_src_y
+        diagonal_dx = (self.tile_height - self.tile_width) // 2
+        diagonal_dy = (self.tile_width - self.tile_height) // 2
+        self.layer_chunks = []
+        for gids, flips, dest_x, dest_y in self.layer_tiles:
+            chunks = [[[] for _ in range(self.chunk_cols)] for _ in range(self.chunk_rows)]
+            for tile_id, flip, world_x, world_y in zip(gids, flips, dest_x, dest_y):
+                chunk = chunks[world_y // self.chunk_h_px][world_x // self.chunk_w_px]
+                if flip & 1:
+                    chunk.append((src_x_lut[tile_id], src_y_lut[tile_id],
+                                  world_x + diagonal_dx, world_y + diagonal_dy, flip))
+                else:
+                    chunk.append((src_x_lut[tile_id], src_y_lut[tile_id], world_x, world_y, flip))
+            self.layer_chunks.append(chunks)
+
+    def _bake_layers(self):
+        """각 타일 레이어를 청크 텍스처로 미리 합성해서 [(image, left, bottom, w, h), ...] 리스트로 반환"""
+        try:
+            renderer = pico2d.pico2d.renderer
+        except AttributeError:
+            return None
+        if not renderer:
+            return None
+
+        # 합성 텍스처 한 장이 카메라 청크 몇 개를 덮을지 (청크 경계에 맞춰서 자름)
+        block_cols = max(1, BAKE_CHUNK_PX // self.chunk_w_px)
+        block_rows = max(1, BAKE_CHUNK_PX // self.chunk_h_px)
+
+        baked = []
+        try:
+            for chunks in self.layer_chunks:
+                for row0 in range(0, self.chunk_rows, block_rows):
+                    for col0 in range(0, self.chunk_cols, block_cols):
+                        row1 = min(row0 + block_rows, self.chunk_rows) - 1
+                        col1 = min(col0 + block_cols, self.chunk_cols) - 1
+                        left, bottom = self.chunk_bounds[row0][col0][:2]
+                        right, top = self.chunk_bounds[row1][col1][2:]
+                        # 위쪽 청크부터 (Tiled처럼 아래 줄 타일이 위 줄 타일을 덮도록)
+                        tiles = [tile for cy in range(row1, row0 - 1, -1)
+                                 for cx in range(col0, col1 + 1)
+                                 for tile in chunks[cy][cx]]
+                        if not tiles:
+                            continue  # 빈 청크는 그리지 않음
+                        image = self._bake_chunk(renderer, tiles, left, top, right - left, top - bottom)
+                        baked.append((image, left, bottom, right - left, top - bottom))
+        finally:
+            SDL_SetRenderTarget(renderer, None)
+
+        print(f"타일 레이어 합성 완료: 레이어 {len(self.layers_data)}개 -> 텍스처 {len(baked)}장")
+        return baked
+
+    def _bake_chunk(self, renderer, tiles, left, top, w, h):
+        """draw 리스트의 타일들을 (left, top) 기준 w x h 렌더 타깃 텍스처 하나에 그려서 Image로 반환"""
+        tw, th = self.tile_width, self.tile_height
+
+        # pico2d Image.clip_image와 같은 방식으로 렌더 타깃 텍스처 생성
+        texture = SDL_CreateTexture(renderer, SDL_PIXELFORMAT_RGBA8888, SDL_TEXTUREACCESS_TARGET, w, h)
+        if not texture:
+            raise IOError("타일 레이어 합성용 텍스처를 만들 수 없습니다.")
+        SDL_SetTextureBlendMode(texture, SDL_BLENDMODE_BLEND)
+        SDL_SetRenderTarget(renderer, texture)
+        SDL_SetRenderDrawColor(renderer, 0, 0, 0, 0)
+        SDL_RenderClear(renderer)
+
+        # 텍스처 안에서는 SDL 좌표계(위쪽 원점)를 사용
+        image_h = self.tileset_image.h
+        for src_x, src_y, world_x, world_y, flip in tiles:
+            src_rect = SDL_Rect(src_x, image_h - src_y - th, tw, th)
+            dest_rect = SDL_Rect(world_x - tw // 2 - left, top - (world_y - th // 2) - th, tw, th)
+            if flip:
+                angle, flip_h = TILE_FLIPS[flip]
+                SDL_RenderCopyEx(renderer, self.tileset_image.texture, ctypes.byref(src_rect), ctypes.byref(dest_rect),
+                                 angle, None, SDL_FLIP_HORIZONTAL if flip_h else SDL_FLIP_NONE)
+            else:
+                SDL_RenderCopy(renderer, self.tileset_image.texture, ctypes.byref(src_rect), ctypes.byref(dest_rect))
+
+        SDL_SetRenderTarget(renderer, None)
+        return Image(texture)
+
     def draw(self):
         """기본 draw 메서드 (카메라 미사용 시 - 화면에 맞게 스케일링)"""
-        for layer_data in self.layers_data:
-            for y in range(self.map_height_tiles):
-                for x in range(self.map_width_tiles):
-                    map_index = (self.map_height_tiles - 1 - y) * self.map_width_tiles + x
-                    tile_id = layer_data[map_index]
-                    if tile_id == 0: continue
-                    src_x = ((tile_id - 1) % self.tileset_cols) * self.tile_width
-                    src_y = ((tile_id - 1) // self.tileset_cols) * self.tile_height
-                    src_y = self.tileset_image.h - src_y - self.tile_height
-
-                    dest_x = (x * self.tile_width + self.tile_width // 2) * self.scale + self.offset_x
-                    dest_y = (y * self.tile_height + self.tile_height // 2) * self.scale + self.offset_y
-
-                    self.tileset_image.clip_draw(
-                        src_x, src_y, self.tile_width, self.tile_height,
-                        dest_x, dest_y,
-                        self.tile_width * self.scale, self.tile_height * self.scale
-                    )
+        with profiler.section('TiledMap.draw'):
+            self._draw_scaled()
+
+    def _draw_scaled(self):
+        if self.baked_layers is not None:
+            # 미리 합성한 청크 텍스처를 청크당 한 번씩만 그림
+            for image, left, bottom, w, h in self.baked_layers:
+                # 청크 경계에 틈이 생기지 않도록 양 끝 좌표를 각각 반올림
+                dest_left = round(left * self.scale + self.offset_x)
+                dest_bottom = round(bottom * self.scale + self.offset_y)
+                dest_right = round((left + w) * self.scale + self.offset_x)
+                dest_top = round((bottom + h) * self.scale + self.offset_y)
+                image.draw_to_origin(dest_left, dest_bottom, dest_right - dest_left, dest_top - dest_bottom)
+            return
+
+        # 합성 실패 시: 청크 draw 리스트를 그대로 스케일링해서 타일 단위로 그림
+        tw, th = self.tile_width, self.tile_height
+        dest_w = tw * self.scale
+        dest_h = th * self.scale
+        image = self.tileset_image
+        for chunks in self.layer_chunks:
+            for chunk_row in reversed(chunks):
+                for tiles in chunk_row:
+                    for src_x, src_y, world_x, world_y, flip in tiles:
+                        x = world_x * self.scale + self.offset_x
+                        y = world_y * self.scale + self.offset_y
+                        if flip:
+                            rad, flip_str = TILE_FLIP_ARGS[flip]
+                            image.clip_composite_draw(src_x, src_y, tw, th, rad, flip_str, x, y, dest_w, dest_h)
+                        else:
+                            image.clip_draw(src_x, src_y, tw, th, x, y, dest_w, dest_h)
 
     def draw_with_camera(self, camera_x, camera_y):
         """카메라 기준으로 렌더링"""
+        with profiler.section('TiledMap.draw'):
+            self._draw_camera(camera_x, camera_y)
+
+    def _draw_camera(self, camera_x, camera_y):
         # 카메라 오프셋 계산 (플레이어를 화면 중앙에 배치)
         cam_offset_x = self.screen_w // 2 - camera_x
         cam_offset_y = self.screen_h // 2 - camera_y
 
-        for layer_data in self.layers_data:
-            for y in range(self.map_height_tiles):
-                for x in range(self.map_width_tiles):
-                    map_index = (self.map_height_tiles - 1 - y) * self.map_width_tiles + x
-                    tile_id = layer_data[map_index]
-                    if tile_id == 0: continue
-
-                    src_x = ((tile_id - 1) % self.tileset_cols) * self.tile_width
-                    src_y = ((tile_id - 1) // self.tileset_cols) * self.tile_height
-                    src_y = self.tileset_image.h - src_y - self.tile_height
-
-                    # 월드 좌표를 화면 좌표로 변환 (카메라 적용)
-                    world_x = x * self.tile_width + self.tile_width // 2
-                    world_y = y * self.tile_height + self.tile_height // 2
-
-                    screen_x = world_x + cam_offset_x
-                    screen_y = world_y + cam_offset_y
-
-                    # 화면 밖의 타일은 그리지 않음 (최적화)
-                    if (screen_x + self.tile_width // 2 < 0 or screen_x - self.tile_width // 2 > self.screen_w or
-                        screen_y + self.tile_height // 2 < 0 or screen_y - self.tile_height // 2 > self.screen_h):
+        # 화면에 보이는 월드 영역
+        view_left = -cam_offset_x
+        view_bottom = -cam_offset_y
+        view_right = view_left + self.screen_w
+        view_top = view_bottom + self.screen_h
+
+        # 카메라 사각형과 겹치는 청크 범위만 계산 (맵 크기와 무관하게 화면 크기에 비례)
+        col_start = max(0, int(view_left // self.chunk_w_px))
+        col_end = min(self.chunk_cols - 1, int(view_right // self.chunk_w_px))
+        row_start = max(0, int(view_bottom // self.chunk_h_px))
+        row_end = min(self.chunk_rows - 1, int(view_top // self.chunk_h_px))
+        if col_start > col_end or row_start > row_end:
+            return
+
+        if self.baked_layers is not None:
+            # 합성한 청크 텍스처 중 화면과 겹치는 부분만 잘라서 그림 (청크 텍스처 한 장당 한 번)
+            # 타일 단위로 그릴 때 pico2d가 좌표를 int()로 자르는 것과 같은 픽셀에 오도록 오프셋을 정수로 맞춤
+            # (가로는 내림, 세로는 SDL 좌표가 위아래로 뒤집히므로 올림)
+            offset_x = math.floor(cam_offset_x)
+            offset_y = math.ceil(cam_offset_y)
+            clip_left = -offset_x
+            clip_bottom = -offset_y
+            clip_right = clip_left + self.screen_w
+            clip_top = clip_bottom + self.screen_h
+            for image, left, bottom, w, h in self.baked_layers:
+                src_left = max(left, clip_left)
+                src_bottom = max(bottom, clip_bottom)
+                src_right = min(left + w, clip_right)
+                src_top = min(bottom + h, clip_top)
+                if src_right <= src_left or src_top <= src_bottom:
+                    continue
+                image.clip_draw_to_origin(
+                    src_left - left, src_bottom - bottom, src_right - src_left, src_top - src_bottom,
+                    src_left + offset_x, src_bottom + offset_y
+                )
+            return
+
+        # 합성 실패 시: 보이는 청크의 타일을 하나씩 그림
+        tw, th = self.tile_width, self.tile_height
+        image = self.tileset_image
+        for chunks in self.layer_chunks:
+            for cy in range(row_end, row_start - 1, -1):
+                chunk_row = chunks[cy]
+                bounds_row = self.chunk_bounds[cy]
+                for cx in range(col_start, col_end + 1):
+                    left, bottom, right, top = bounds_row[cx]
+                    if right < view_left or left > view_right or top < view_bottom or bottom > view_top:
                         continue
-
-                    self.tileset_image.clip_draw(
-                        src_x, src_y, self.tile_width, self.tile_height,
-                        screen_x, screen_y,
-                        self.tile_width, self.tile_height
-                    )
+                    for src_x, src_y, world_x, world_y, flip in chunk_row[cx]:
+                        # 월드 좌표를 화면 좌표로 변환 (카메라 적용)
+                        x = world_x + cam_offset_x
+                        y = world_y + cam_offset_y
+                        if flip:
+                            rad, flip_str = TILE_FLIP_ARGS[flip]
+                            image.clip_composite_draw(src_x, src_y, tw, th, rad, flip_str, x, y, tw, th)
+                        else:
+                            image.clip_draw(src_x, src_y, tw, th, x, y, tw, th)
 
     def get_collision_boxes(self):
         """Collisions 레이어(objectgroup)에서 충돌 박스 추출"""
@@ -176,5 +409,18 @@ class TiledMap:
 
         return boxes
 
+    def build_collision_grid(self, boxes):
+        """충돌 박스들을 타일 크기(화면 스케일 적용) 칸으로 나눈 SpatialGrid 생성"""
+        cell_size = max(self.tile_width, self.tile_height) * (1.0 if self.use_camera else self.scale)
+        return SpatialGrid(boxes, cell_size)
+
+    def build_nav_grid(self, boxes, cell_size=None):
+        """몬스터 길찾기용 NavGrid 생성 (충돌 박스와 같은 좌표계, 맵 전체 영역)"""
+        scale = 1.0 if self.use_camera else self.scale
+        offset_x = 0 if self.use_camera else self.offset_x
+        offset_y = 0 if self.use_camera else self.offset_y
+        bounds = (offset_x, offset_y, offset_x + self.map_width_px * scale, offset_y + self.map_height_px * scale)
+        return pathfinding.NavGrid(boxes, bounds, cell_size or pathfinding.NAV_CELL_SIZE)
+
     def update(self, dt):
         pass
\ No newline at end of file
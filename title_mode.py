@@ -1,4 +1,5 @@
 from pico2d import *
+from resource_manager import load_image
 from sdl2 import SDL_KEYDOWN, SDLK_ESCAPE, SDLK_SPACE, SDLK_k
 
 import game_framework
@@ -7,6 +8,7 @@ import main_chracter
 import shop_mode
 
 image = None
+low_power = True  # 정적인 화면이므로 game_framework가 낮은 FPS로 돌림
 
 def init():
     global image
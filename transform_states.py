@@ -1,5 +1,6 @@
 import time
 from pico2d import load_image
+import render_queue
 from transform_loader import TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H, TRANSFORM_FOOT_OFFSET_Y
 
 # 실제 충돌 범위 import (순환 import 방지를 위해 character_constants에서 가져옴)
@@ -48,18 +49,18 @@ class TransformIdle:
         img_height = image.h
 
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
+        draw_y = self.character.draw_y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
 
         # 왼쪽 방향이면 이미지 좌우 반전
         if self.character.dir == 'LEFT':
-            image.clip_composite_draw(
+            render_queue.clip_composite_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                0, 'h', self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                0, 'h', self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
         else:  # RIGHT
-            image.clip_draw(
+            render_queue.clip_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
 
 
@@ -119,18 +120,18 @@ class TransformWalk:
         img_height = image.h
 
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
+        draw_y = self.character.draw_y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
 
         # 왼쪽 방향이면 이미지 좌우 반전
         if self.character.dir == 'LEFT':
-            image.clip_composite_draw(
+            render_queue.clip_composite_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                0, 'h', self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                0, 'h', self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
         else:  # RIGHT
-            image.clip_draw(
+            render_queue.clip_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
 
 
@@ -194,18 +195,18 @@ class TransformRoll:
         img_height = image.h
 
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
+        draw_y = self.character.draw_y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
 
         # 왼쪽 방향이면 이미지 좌우 반전
         if self.character.dir == 'LEFT':
-            image.clip_composite_draw(
+            render_queue.clip_composite_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                0, 'h', self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                0, 'h', self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
         else:  # RIGHT
-            image.clip_draw(
+            render_queue.clip_draw(image,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
 
 
@@ -316,16 +317,16 @@ class TransformAttack:
         img_height = img.h
 
         # 발(실제 발 위치)을 원점으로 하기 위해 y 좌표 조정
-        draw_y = self.character.y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
+        draw_y = self.character.draw_y + (TRANSFORM_SPRITE_H // 2) - TRANSFORM_FOOT_OFFSET_Y
 
         # 왼쪽 방향이면 이미지 좌우 반전
         if self.character.dir == 'LEFT':
-            img.clip_composite_draw(
+            render_queue.clip_composite_draw(img,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                0, 'h', self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                0, 'h', self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
         else:  # RIGHT
-            img.clip_draw(
+            render_queue.clip_draw(img,
                 x_offset, 0, TRANSFORM_SPRITE_W, img_height,
-                self.character.x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
+                self.character.draw_x, draw_y, TRANSFORM_SPRITE_W, TRANSFORM_SPRITE_H
             )
@@ -1,8 +1,10 @@
 from pico2d import *
+from resource_manager import load_image, load_font
 from sdl2 import SDL_QUIT, SDL_KEYDOWN, SDL_KEYUP, SDLK_ESCAPE, SDLK_u, SDLK_RETURN
 
 import game_framework
 import game_world
+import profiler
 
 from main_chracter import Main_character
 from tiled_map import TiledMap
@@ -19,6 +21,7 @@ player: Main_character = None
 tiled_map: TiledMap = None
 ui = None
 collision_boxes = []  # 충돌 영역
+collision_grid = None  # 충돌 박스 공간 격자 (맵 로드 시 생성)
 npc = None
 npc_item: NPC = None
 
@@ -39,7 +42,7 @@ player_at_shop_exit = False  # 플레이어가 상점 출구 영역에 있는지
 came_from_shop = False
 
 def init():
-    global player, tiled_map, collision_boxes, ui, exit_zone_dungeon, exit_zone_shop, dialogue_box_image, dialogue_font, came_from_shop
+    global player, tiled_map, collision_boxes, collision_grid, ui, exit_zone_dungeon, exit_zone_shop, dialogue_box_image, dialogue_font, came_from_shop
     global npc, npc_item
 
     # 다이얼로그 이미지와 폰트 로드
@@ -51,9 +54,10 @@ def init():
 
     # 2. 충돌 영역 설정
     collision_boxes = tiled_map.get_collision_boxes()
+    collision_grid = tiled_map.build_collision_grid(collision_boxes)
 
-    # 3. 플레이어 생성 및 초기 위치 설정
-    player = Main_character()
+    # 3. 세션 플레이어를 빌려와서 초기 위치 설정
+    player = game_framework.borrow_player()
 
     # NPC 생성
     # 요정
@@ -171,8 +175,9 @@ def init():
 def finish():
     # Village 나가면 UI 포함 모든 객체 제거
     game_world.clear()
-    global collision_boxes, ui
+    global collision_boxes, collision_grid, ui
     collision_boxes = []
+    collision_grid = None
     ui = None
     global npc
     npc = None
@@ -238,13 +243,10 @@ def check_collision(x, y, player):
         collision_w = CHARACTER_COLLISION_W // 2
         collision_h = CHARACTER_COLLISION_H // 2
 
-    for box in collision_boxes:
-        left, bottom, right, top = box
-        # 플레이어의 사각형 충돌 감지
-        if left - collision_w < x < right + collision_w and \
-           bottom - collision_h < y < top + collision_h:
-            return True
-    return False
+    # 플레이어 주변 격자 칸의 박스만 검사 (실제 캐릭터 크기 사용)
+    if collision_grid is None:
+        return False
+    return collision_grid.hits_aabb(x - collision_w, y - collision_h, x + collision_w, y + collision_h)
 
 def check_exit_zone(player_x, player_y, exit_zone):
     """플레이어가 출구 영역에 들어갔는지 확인"""
@@ -370,6 +372,7 @@ def draw():
         dialogue_font.draw(SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 50,
                            "네(Enter)    아니요(ESC)", (15, 15, 15))
 
+    profiler.draw_overlay()
     update_canvas()
 
 def pause(): pass